@@ -0,0 +1,143 @@
+"""Bulk export endpoints."""
+
+import os
+import tempfile
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse, StreamingResponse
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
+
+from app.core.database import get_db
+from app.services.export import (
+    EXPORT_MEDIA_TYPES,
+    ExportFormat,
+    measurement_export_query,
+    stream_measurements,
+)
+from app.services.parquet_export import (
+    ParquetUnavailableError,
+    export_sessions_to_parquet_file,
+)
+from app.services.users import get_user_id
+
+router = APIRouter()
+
+
+@router.get(
+    "/measurements",
+    summary="Export measurements",
+    description=(
+        "Stream measurements as NDJSON or CSV, for one user or all users, "
+        "optionally restricted to a time range"
+    ),
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()},
+        }
+    },
+)
+async def export_measurements(
+    export_format: ExportFormat = Query("ndjson", alias="format", description="Output format"),
+    email: str | None = Query(None, description="Only export this user's measurements"),
+    since: datetime | None = Query(None, description="Only export measurements taken from then"),
+    until: datetime | None = Query(None, description="Only export measurements taken before then"),
+    db: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    """
+    Export measurements.
+
+    The response is streamed from a server-side cursor, so exports of any
+    size run in constant memory.
+
+    Args:
+        export_format: ``ndjson`` or ``csv``
+        email: User to export, or None for all users
+        since: Start of the time range (inclusive)
+        until: End of the time range (exclusive)
+        db: Database session
+
+    Returns:
+        StreamingResponse with one line per measurement
+
+    Raises:
+        HTTPException: If the user does not exist
+    """
+    user_id = None
+    if email is not None:
+        user_id = await get_user_id(db, email)
+        if user_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"User {email} not found",
+            )
+
+    query = measurement_export_query(user_id=user_id, since=since, until=until)
+    return StreamingResponse(
+        stream_measurements(query, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="measurements.{export_format}"',
+        },
+    )
+
+
+@router.get(
+    "/sessions.parquet",
+    summary="Export sessions as Parquet",
+    description=(
+        "Download analysis sessions joined with their measurements as one Parquet file, "
+        "optionally only those updated since a watermark"
+    ),
+    response_class=FileResponse,
+    responses={status.HTTP_200_OK: {"content": {"application/vnd.apache.parquet": {}}}},
+)
+async def export_sessions_parquet(
+    since: datetime | None = Query(None, description="Watermark of the previous export"),
+    until: datetime | None = Query(None, description="Only export sessions updated until then"),
+    db: AsyncSession = Depends(get_db),
+) -> FileResponse:
+    """
+    Export sessions as Parquet.
+
+    The file is written to a temporary file in record batches, from a worker
+    thread, and removed once sent. Its ``X-Export-Watermark`` header, the
+    upper bound of the export, is the ``since`` value for the next
+    incremental export; sessions updated since are exported again then.
+
+    Args:
+        since: Only export sessions updated after this time
+        until: Only export sessions updated at or before this time
+        db: Database session
+
+    Returns:
+        FileResponse with the Parquet file
+
+    Raises:
+        HTTPException: If pyarrow is not installed
+    """
+    fd, path = tempfile.mkstemp(suffix=".parquet")
+    try:
+        with os.fdopen(fd, "wb") as sink:
+            result = await export_sessions_to_parquet_file(db, sink, since=since, until=until)
+    except ParquetUnavailableError as e:
+        os.unlink(path)
+        logger.error(f"Parquet export unavailable: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Parquet exports are not available on this server",
+        ) from e
+    except Exception:
+        os.unlink(path)
+        raise
+
+    return FileResponse(
+        path,
+        media_type="application/vnd.apache.parquet",
+        filename="sessions.parquet",
+        headers={"X-Export-Watermark": result.watermark.isoformat()},
+        background=BackgroundTask(os.unlink, path),
+    )
@@ -1,11 +1,41 @@
 """GraphQL endpoint configuration."""
 
+from fastapi import Response, status
 from strawberry.fastapi import GraphQLRouter
+from strawberry.http import GraphQLHTTPResponse
 
+from app.core.server_timing import serialization
 from app.graphql.schema import schema
 
+
+class BodyVisionGraphQLRouter(GraphQLRouter):
+    """
+    GraphQL router letting resolvers answer conditional requests with 304,
+    and accounting response encoding in Server-Timing.
+    """
+
+    def encode_json(self, data: object) -> str:
+        with serialization():
+            return super().encode_json(data)
+
+    def create_response(
+        self,
+        response_data: GraphQLHTTPResponse | list[GraphQLHTTPResponse],
+        sub_response: Response,
+    ) -> Response:
+        if sub_response.status_code == status.HTTP_304_NOT_MODIFIED:
+            response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+            response.headers.raw.extend(
+                (name, value)
+                for name, value in sub_response.headers.raw
+                if name != b"content-length"
+            )
+            return response
+        return super().create_response(response_data, sub_response)
+
+
 # Create GraphQL router with GraphiQL enabled in development
-graphql_router = GraphQLRouter(
+graphql_router = BodyVisionGraphQLRouter(
     schema,
     graphiql=True,  # Enable GraphiQL UI
     path="/graphql",
@@ -0,0 +1,56 @@
+"""Endpoints serving stored images and meshes."""
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.models.storage import StoredObjectRecord
+from app.services.storage import get_storage
+
+router = APIRouter()
+
+# Objects are addressed by their content, so they never change; they hold
+# body images, so only the client may cache them
+OBJECT_MAX_AGE_SECONDS = 31536000
+
+
+@router.get(
+    "/{key}",
+    response_class=Response,
+    summary="Get a stored object",
+    description="Serve an uploaded image or a mesh by the SHA-256 of its content",
+)
+async def get_object(
+    key: str = Path(..., pattern="^[0-9a-f]{64}$", description="SHA-256 of the object"),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """
+    Serve a stored object.
+
+    Local objects are sent from the file, with sendfile where the server
+    supports it; objects in Supabase are redirected to a signed URL so they
+    do not transit through the API.
+
+    Args:
+        key: SHA-256 of the object
+        db: Database session
+
+    Returns:
+        The object, or a redirect to it
+
+    Raises:
+        HTTPException: If no object has this key
+    """
+    record = await db.get(StoredObjectRecord, key)
+    # Unreferenced objects may already be deleted from storage
+    if record is None or record.refcount <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Object {key} not found",
+        )
+
+    response = get_storage().response(key, record.content_type)
+    if response.status_code == status.HTTP_200_OK:
+        response.headers["ETag"] = f'"{key}"'
+        response.headers["Cache-Control"] = f"private, max-age={OBJECT_MAX_AGE_SECONDS}"
+    return response
@@ -1,24 +1,62 @@
 """Prediction endpoint for body composition analysis."""
 
+import json
 import uuid
-from typing import Literal
-
-import dramatiq
-from fastapi import APIRouter, Depends, HTTPException, status
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import aclosing
+from typing import Any, Literal
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
 from loguru import logger
-from pydantic import BaseModel, Field, HttpUrl
-from sqlalchemy import select
+from pydantic import BaseModel, Field, HttpUrl, ValidationError
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.models import AnalysisSession, AnalysisStatus, Gender, Measurement, User
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, dialect_insert, get_db
+from app.models import AnalysisSession, AnalysisStatus, Gender
+from app.services.admission import admit_job
+from app.services.idempotency import (
+    IdempotencyKeyReusedError,
+    get_stored_response,
+    request_fingerprint,
+    store_response,
+)
+from app.services.job_control import JobNotCancellableError, cancel_job
+from app.services.job_events import iter_job_events, load_job_event, subscribe_job
+from app.services.job_queue import build_analysis_message, compute_deadline
+from app.services.outbox import notify_relay, stage_messages
+from app.services.rate_limit import client_identity, enforce_rate_limit
+from app.services.status_cache import (
+    cache_job_status,
+    etag_matches,
+    get_cached_job_status,
+    load_job_status,
+    status_cache_control,
+    status_etag,
+)
+from app.services.storage import get_storage
+from app.services.uploads import UploadError, receive_upload
+from app.services.users import (
+    bulk_upsert_users,
+    get_or_create_user_id,
+    user_id_cache,
+)
 
 router = APIRouter()
 
-# Define the task name for sending messages
-# The actual task implementation is in inference/app/tasks/body_analysis.py
-BODY_ANALYSIS_TASK = "process_body_analysis"
-
 
 class UserMetadata(BaseModel):
     """User metadata for body composition analysis."""
@@ -37,6 +75,24 @@ class PredictionRequest(BaseModel):
     side_image_url: HttpUrl = Field(..., description="URL to side view image")
     back_image_url: HttpUrl = Field(..., description="URL to back view image")
     user_metadata: UserMetadata = Field(..., description="User metadata")
+    deadline_seconds: int | None = Field(
+        None,
+        gt=0,
+        description="Seconds after which the job is dropped if not started (server default if omitted)",
+    )
+
+
+class UploadMetadata(UserMetadata):
+    """Form fields sent along with uploaded images."""
+
+    deadline_seconds: int | None = Field(
+        None,
+        gt=0,
+        description="Seconds after which the job is dropped if not started (server default if omitted)",
+    )
+
+
+UPLOAD_IMAGE_FIELDS = ("front_image", "side_image", "back_image")
 
 
 class PredictionResponse(BaseModel):
@@ -44,8 +100,26 @@ class PredictionResponse(BaseModel):
 
     job_id: str = Field(..., description="Job ID for tracking processing status")
     session_id: int = Field(..., description="Database session ID")
-    status: Literal["queued", "processing", "completed", "failed"] = "queued"
+    status: Literal["queued", "processing", "completed", "failed", "expired"] = "queued"
     message: str = "Job queued for processing"
+    deadline_at: str | None = Field(None, description="Time after which the job is dropped")
+
+
+class BatchPredictionRequest(BaseModel):
+    """Request model for submitting several predictions at once."""
+
+    items: list[PredictionRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.BATCH_MAX_ITEMS,
+        description="Prediction requests to queue",
+    )
+
+
+class BatchPredictionResponse(BaseModel):
+    """Response model for a batch submission, in request order."""
+
+    items: list[PredictionResponse]
 
 
 class MeasurementData(BaseModel):
@@ -60,6 +134,15 @@ class MeasurementData(BaseModel):
     confidence_score: float | None = None
 
 
+class CancellationResponse(BaseModel):
+    """Response for a job cancellation request."""
+
+    job_id: str
+    session_id: int
+    status: Literal["cancelled"] = "cancelled"
+    message: str = "Job cancelled"
+
+
 class JobStatusResponse(BaseModel):
     """Response for job status query."""
 
@@ -81,9 +164,18 @@ class JobStatusResponse(BaseModel):
     status_code=status.HTTP_202_ACCEPTED,
     summary="Start body composition analysis",
     description="Queue a new job for body composition analysis from three images",
+    dependencies=[Depends(admit_job)],
 )
 async def create_prediction(
-    request: PredictionRequest, db: AsyncSession = Depends(get_db)
+    request: PredictionRequest,
+    response: Response,
+    idempotency_key: str | None = Header(
+        None,
+        alias="Idempotency-Key",
+        max_length=255,
+        description="Client-generated key making retries of this request safe",
+    ),
+    db: AsyncSession = Depends(get_db),
 ) -> PredictionResponse:
     """
     Create a new prediction job.
@@ -91,40 +183,56 @@ async def create_prediction(
     This endpoint:
     1. Creates or retrieves user by email
     2. Creates an analysis session in the database
-    3. Queues a background job with Dramatiq
+    3. Stages a Dramatiq message in the job outbox, in the same transaction
     4. Returns job_id for tracking
 
+    Requests repeating the ``Idempotency-Key`` of an earlier request from the
+    same user return the original response instead of creating a new job.
+
     Args:
         request: Prediction request with image URLs and user metadata
+        response: Outgoing response, to flag replayed responses
+        idempotency_key: Optional client-generated idempotency key
         db: Database session
 
     Returns:
         PredictionResponse with job_id and session_id for tracking
 
     Raises:
-        HTTPException: If validation fails or queueing fails
+        HTTPException: If validation fails, the idempotency key was used for a
+            different request, or queueing fails
     """
+    email = request.user_metadata.email
+    await enforce_rate_limit("predict", {email: 1}, response)
+
+    fingerprint = None
+    if idempotency_key:
+        fingerprint = request_fingerprint(request)
+        try:
+            stored = await get_stored_response(email, idempotency_key, fingerprint)
+        except IdempotencyKeyReusedError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=str(e),
+            ) from e
+
+        if stored:
+            logger.info(f"Replaying job {stored['job_id']} for idempotency key")
+            response.headers["Idempotent-Replayed"] = "true"
+            return PredictionResponse(**stored)
+
     try:
-        # Get or create user
-        result = await db.execute(select(User).where(User.email == request.user_metadata.email))
-        user = result.scalar_one_or_none()
-
-        if not user:
-            logger.info(f"Creating new user: {request.user_metadata.email}")
-            user = User(
-                email=request.user_metadata.email,
-                full_name=None,  # Can be added later
-                is_active=True,
-            )
-            db.add(user)
-            await db.flush()  # Get user.id before creating session
+        # Get or create user (cached, single upsert on a miss)
+        user_id = await get_or_create_user_id(db, email)
 
         # Generate unique job ID
         job_id = str(uuid.uuid4())
+        deadline_at = compute_deadline(request.deadline_seconds)
 
-        # Create analysis session
-        session = AnalysisSession(
-            user_id=user.id,
+        # Create analysis session, returning only its ID instead of
+        # refreshing the whole row
+        insert_stmt = dialect_insert(db, AnalysisSession).values(
+            user_id=user_id,
             job_id=job_id,
             status=AnalysisStatus.QUEUED,
             front_image_url=str(request.front_image_url),
@@ -134,43 +242,327 @@ async def create_prediction(
             weight_kg=request.user_metadata.weight_kg,
             age=request.user_metadata.age,
             gender=Gender(request.user_metadata.gender),
+            deadline_at=deadline_at,
+            idempotency_key=idempotency_key,
+            idempotency_fingerprint=fingerprint,
         )
-        db.add(session)
+        if idempotency_key:
+            insert_stmt = insert_stmt.on_conflict_do_nothing(
+                index_elements=[AnalysisSession.user_id, AnalysisSession.idempotency_key]
+            )
+        result = await db.execute(insert_stmt.returning(AnalysisSession.id))
+        session_id = result.scalar_one_or_none()
+
+        if session_id is None:
+            # A concurrent retry, or one arriving after the Redis entry
+            # expired: return the job created by the original request
+            assert idempotency_key is not None
+            result = await db.execute(
+                select(
+                    AnalysisSession.id,
+                    AnalysisSession.job_id,
+                    AnalysisSession.deadline_at,
+                    AnalysisSession.idempotency_fingerprint,
+                ).where(
+                    AnalysisSession.user_id == user_id,
+                    AnalysisSession.idempotency_key == idempotency_key,
+                )
+            )
+            original = result.one()
+            # Sessions created before fingerprints were stored have none
+            if original.idempotency_fingerprint not in (None, fingerprint):
+                raise IdempotencyKeyReusedError(idempotency_key)
+            await db.commit()
+
+            logger.info(f"Replaying job {original.job_id} for idempotency key")
+            response.headers["Idempotent-Replayed"] = "true"
+            return PredictionResponse(
+                job_id=original.job_id,
+                session_id=original.id,
+                deadline_at=original.deadline_at.isoformat() if original.deadline_at else None,
+            )
+
+        # Stage the Dramatiq message in the same transaction; the outbox
+        # relay sends it to the broker once committed
+        message = build_analysis_message(session_id, job_id, deadline_at)
+        await stage_messages(db, [message])
         await db.commit()
-        await db.refresh(session)
+        notify_relay()
 
         logger.info(
-            f"Created analysis session {session.id} for user {user.email} "
+            f"Created analysis session {session_id} for user {email} "
             f"with job_id {job_id}"
         )
 
-        # Queue the Dramatiq task by sending a message to the broker
-        logger.info(f"Queueing Dramatiq task for session {session.id}")
-        broker = dramatiq.get_broker()
-        message = dramatiq.Message(
-            queue_name="default",
-            actor_name=BODY_ANALYSIS_TASK,
-            args=(session.id,),
-            kwargs={},
-            options={},
-        )
-        broker.enqueue(message)
-
-        return PredictionResponse(
+        prediction = PredictionResponse(
             job_id=job_id,
-            session_id=session.id,
+            session_id=session_id,
             status="queued",
             message="Job queued for processing",
+            deadline_at=deadline_at.isoformat(),
         )
 
+    except IdempotencyKeyReusedError as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e),
+        ) from e
+
     except Exception as e:
         logger.error(f"Failed to create prediction job: {e}")
         await db.rollback()
+        # The user may have been created by the rolled back transaction
+        user_id_cache.discard(email)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to queue prediction job: {str(e)}",
+        ) from e
+
+    if idempotency_key:
+        assert fingerprint is not None
+        await store_response(email, idempotency_key, fingerprint, prediction.model_dump())
+    return prediction
+
+
+@router.post(
+    "/batch",
+    response_model=BatchPredictionResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Start several body composition analyses",
+    description="Queue up to BATCH_MAX_ITEMS analysis jobs in one request",
+    dependencies=[Depends(admit_job)],
+)
+async def create_prediction_batch(
+    request: BatchPredictionRequest,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+) -> BatchPredictionResponse:
+    """
+    Create several prediction jobs at once.
+
+    This endpoint:
+    1. Creates missing users in one upsert and loads all user IDs
+    2. Inserts every analysis session in one statement
+    3. Stages every Dramatiq message in the job outbox, in the same transaction
+    4. Returns the job IDs in request order
+
+    The batch counts as one request against the rate limit of each of its
+    users.
+
+    Args:
+        request: Batch of prediction requests
+        response: Outgoing response, to add the rate limit headers to
+        db: Database session
+
+    Returns:
+        BatchPredictionResponse with one job per request item
+
+    Raises:
+        HTTPException: If a user exceeds their rate limit or queueing fails
+    """
+    emails = dict.fromkeys((item.user_metadata.email for item in request.items), 1)
+    await enforce_rate_limit("predict_batch", emails, response)
+
+    try:
+        user_ids = await bulk_upsert_users(db, (item.user_metadata.email for item in request.items))
+
+        rows: list[dict[str, Any]] = []
+        for item in request.items:
+            rows.append(
+                {
+                    "user_id": user_ids[item.user_metadata.email],
+                    "job_id": str(uuid.uuid4()),
+                    "status": AnalysisStatus.QUEUED,
+                    "front_image_url": str(item.front_image_url),
+                    "side_image_url": str(item.side_image_url),
+                    "back_image_url": str(item.back_image_url),
+                    "height_cm": item.user_metadata.height_cm,
+                    "weight_kg": item.user_metadata.weight_kg,
+                    "age": item.user_metadata.age,
+                    "gender": Gender(item.user_metadata.gender),
+                    "deadline_at": compute_deadline(item.deadline_seconds),
+                }
+            )
+
+        result = await db.execute(
+            insert(AnalysisSession).returning(
+                AnalysisSession.id, AnalysisSession.job_id, sort_by_parameter_order=True
+            ),
+            rows,
+        )
+        session_ids = {job_id: session_id for session_id, job_id in result.all()}
+
+        await stage_messages(
+            db,
+            [
+                build_analysis_message(session_ids[row["job_id"]], row["job_id"], row["deadline_at"])
+                for row in rows
+            ],
+        )
+        await db.commit()
+        notify_relay()
+
+        logger.info(f"Created {len(rows)} analysis sessions in batch")
+
+        return BatchPredictionResponse(
+            items=[
+                PredictionResponse(
+                    job_id=row["job_id"],
+                    session_id=session_ids[row["job_id"]],
+                    status="queued",
+                    message="Job queued for processing",
+                    deadline_at=row["deadline_at"].isoformat(),
+                )
+                for row in rows
+            ]
+        )
+
+    except Exception as e:
+        logger.error(f"Failed to create prediction batch: {e}")
+        await db.rollback()
+        for item in request.items:
+            user_id_cache.discard(item.user_metadata.email)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to queue prediction batch: {str(e)}",
+        ) from e
+
+
+@router.post(
+    "/upload",
+    response_model=PredictionResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Upload images and start a body composition analysis",
+    description="Stream the three images to object storage and queue an analysis job",
+    dependencies=[Depends(admit_job)],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "required": [*UPLOAD_IMAGE_FIELDS, *UserMetadata.model_fields],
+                        "properties": {
+                            **{
+                                field: {"type": "string", "format": "binary"}
+                                for field in UPLOAD_IMAGE_FIELDS
+                            },
+                            **UploadMetadata.model_json_schema()["properties"],
+                        },
+                    }
+                }
+            },
+        }
+    },
+)
+async def upload_prediction(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+) -> PredictionResponse:
+    """
+    Create a prediction job from uploaded images.
+
+    This endpoint:
+    1. Checks the rate limit of the client's address, then streams the
+       front, side and back images to object storage, hashing
+       them as they arrive instead of buffering whole files
+    2. Validates the user metadata sent as form fields
+    3. Creates the analysis session referencing the stored images and
+       stages its Dramatiq message in the job outbox
+    4. Returns job_id for tracking
+
+    Clients no longer upload images elsewhere first. Sessions reference the
+    images as storage URLs (``local://<sha256>`` with local storage), which
+    GraphQL returns as ``/api/objects/<sha256>`` paths.
+
+    Args:
+        request: Incoming request with a multipart/form-data body
+        response: Outgoing response, to add the rate limit headers to
+        db: Database session
+
+    Returns:
+        PredictionResponse with job_id and session_id for tracking
+
+    Raises:
+        HTTPException: If the upload is malformed, an image is too large or
+            of an unsupported type, the user exceeds their rate limit, or
+            queueing fails
+    """
+    # Turn floods away before storing anything; the user's own limit can
+    # only be checked once the form fields have been read
+    await enforce_rate_limit("predict_upload", {client_identity(request): 1}, response)
+
+    storage = get_storage()
+    try:
+        upload = await receive_upload(request, storage, UPLOAD_IMAGE_FIELDS)
+    except UploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail) from e
+
+    try:
+        metadata = UploadMetadata.model_validate(upload.fields)
+        await enforce_rate_limit("predict", {metadata.email: 1}, response)
+    except ValidationError as e:
+        await upload.discard()
+        raise RequestValidationError(e.errors()) from e
+    except HTTPException:
+        await upload.discard()
+        raise
+
+    try:
+        user_id = await get_or_create_user_id(db, metadata.email)
+        job_id = str(uuid.uuid4())
+        deadline_at = compute_deadline(metadata.deadline_seconds)
+
+        result = await db.execute(
+            insert(AnalysisSession)
+            .values(
+                user_id=user_id,
+                job_id=job_id,
+                status=AnalysisStatus.QUEUED,
+                front_image_url=storage.url(upload.files["front_image"].key),
+                side_image_url=storage.url(upload.files["side_image"].key),
+                back_image_url=storage.url(upload.files["back_image"].key),
+                height_cm=metadata.height_cm,
+                weight_kg=metadata.weight_kg,
+                age=metadata.age,
+                gender=Gender(metadata.gender),
+                deadline_at=deadline_at,
+            )
+            .returning(AnalysisSession.id)
+        )
+        session_id = result.scalar_one()
+
+        await stage_messages(db, [build_analysis_message(session_id, job_id, deadline_at)])
+        await db.commit()
+        notify_relay()
+
+        logger.info(
+            f"Created analysis session {session_id} for user {metadata.email} "
+            f"with job_id {job_id} from {sum(f.size for f in upload.files.values())} "
+            f"uploaded bytes"
+        )
+
+    except Exception as e:
+        logger.error(f"Failed to create prediction job from upload: {e}")
+        await db.rollback()
+        user_id_cache.discard(metadata.email)
+        await upload.discard()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to queue prediction job: {str(e)}",
         ) from e
 
+    return PredictionResponse(
+        job_id=job_id,
+        session_id=session_id,
+        status="queued",
+        message="Job queued for processing",
+        deadline_at=deadline_at.isoformat(),
+    )
+
 
 @router.get(
     "/{job_id}",
@@ -179,65 +571,52 @@ async def create_prediction(
     description="Retrieve the status and results of a prediction job",
 )
 async def get_prediction_status(
-    job_id: str, db: AsyncSession = Depends(get_db)
-) -> JobStatusResponse:
+    job_id: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+) -> JobStatusResponse | Response:
     """
     Get the status of a prediction job.
 
+    The status is read from the Redis status cache when possible, and
+    otherwise from the database with a single join, then cached.
+
+    Responses carry a strong ETag; requests whose ``If-None-Match`` matches
+    get an empty 304. Finished jobs never change, so their responses are
+    cacheable for ``JOB_RESULT_MAX_AGE_SECONDS``.
+
     Args:
         job_id: The job ID returned from the POST request
+        request: Incoming request, for its conditional headers
+        response: Outgoing response, for its caching headers
         db: Database session
 
     Returns:
-        Job status and results if available
+        Job status and results if available, or 304 Not Modified
 
     Raises:
         HTTPException: If job not found
     """
     try:
-        # Fetch session by job_id
-        result = await db.execute(
-            select(AnalysisSession).where(AnalysisSession.job_id == job_id)
-        )
-        session = result.scalar_one_or_none()
-
-        if not session:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Job {job_id} not found",
-            )
-
-        # Fetch measurement if exists
-        measurement = None
-        if session.status == AnalysisStatus.COMPLETED:
-            result = await db.execute(
-                select(Measurement).where(Measurement.session_id == session.id)
-            )
-            measurement_obj = result.scalar_one_or_none()
-
-            if measurement_obj:
-                measurement = MeasurementData(
-                    body_fat_percentage=measurement_obj.body_fat_percentage,
-                    body_volume_liters=measurement_obj.body_volume_liters,
-                    body_density_kg_per_liter=measurement_obj.body_density_kg_per_liter,
-                    lean_mass_kg=measurement_obj.lean_mass_kg,
-                    fat_mass_kg=measurement_obj.fat_mass_kg,
-                    mesh_url=measurement_obj.mesh_url,
-                    confidence_score=measurement_obj.confidence_score,
+        # Serve from the status cache, which workers write through
+        job_status = await get_cached_job_status(job_id)
+        if not job_status:
+            job_status = await load_job_status(db, job_id)
+            if not job_status:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Job {job_id} not found",
                 )
+            await cache_job_status(job_status, only_if_missing=True)
 
-        return JobStatusResponse(
-            job_id=session.job_id,
-            session_id=session.id,
-            status=session.status.value,
-            created_at=session.created_at.isoformat(),
-            started_at=session.started_at.isoformat() if session.started_at else None,
-            completed_at=session.completed_at.isoformat() if session.completed_at else None,
-            processing_time_seconds=session.processing_time_seconds,
-            model_used=session.model_used,
-            error_message=session.error_message,
-            measurements=measurement,
-        )
+        etag = status_etag(job_status)
+        headers = {"ETag": etag, "Cache-Control": status_cache_control(job_status)}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        response.headers.update(headers)
+        return JobStatusResponse(**job_status)
 
     except HTTPException:
         raise
@@ -247,3 +626,148 @@ async def get_prediction_status(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve job status",
         ) from e
+
+
+@router.delete(
+    "/{job_id}",
+    response_model=CancellationResponse,
+    summary="Cancel prediction job",
+    description="Cancel a queued or running prediction job",
+)
+async def cancel_prediction(
+    job_id: str, db: AsyncSession = Depends(get_db)
+) -> CancellationResponse:
+    """
+    Cancel a prediction job.
+
+    Queued jobs are skipped by workers without being processed; running
+    jobs abort at the next pipeline stage.
+
+    Args:
+        job_id: The job ID returned from the POST request
+        db: Database session
+
+    Returns:
+        Cancellation confirmation
+
+    Raises:
+        HTTPException: If job not found or already finished
+    """
+    try:
+        session = await cancel_job(db, job_id)
+    except JobNotCancellableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        ) from e
+    except Exception as e:
+        logger.error(f"Failed to cancel job {job_id}: {e}")
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to cancel job",
+        ) from e
+
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found",
+        )
+
+    return CancellationResponse(job_id=session.job_id, session_id=session.id)
+
+
+async def _open_job_stream(job_id: str) -> AsyncGenerator[dict[str, Any] | None, None] | None:
+    """
+    Subscribe to a job's status events and read its current status.
+
+    Returns:
+        Iterator over the job's status events, or None if the job does not exist
+    """
+    subscription = await subscribe_job(job_id)
+    try:
+        # Use a short-lived session: streams can stay open for minutes and
+        # must not hold a pooled connection meanwhile
+        async with AsyncSessionLocal() as db:
+            current = await load_job_event(db, job_id)
+    except Exception:
+        subscription.close()
+        raise
+
+    if current is None:
+        subscription.close()
+        return None
+    return iter_job_events(subscription, current)
+
+
+@router.get(
+    "/{job_id}/events",
+    summary="Stream prediction job status",
+    description="Server-Sent Events stream of status transitions, closed once the job finishes",
+    response_class=StreamingResponse,
+)
+async def stream_prediction_status(job_id: str) -> StreamingResponse:
+    """
+    Stream the status of a prediction job as Server-Sent Events.
+
+    The first event carries the current status; one event follows each
+    transition, and the stream ends after the terminal status.
+
+    Args:
+        job_id: The job ID returned from the POST request
+
+    Returns:
+        ``text/event-stream`` response of ``status`` events
+
+    Raises:
+        HTTPException: If job not found
+    """
+    events = await _open_job_stream(job_id)
+    if events is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found",
+        )
+
+    async def event_stream() -> AsyncIterator[str]:
+        async with aclosing(events):
+            async for event in events:
+                if event is None:
+                    yield ": keepalive\n\n"
+                else:
+                    yield f"event: status\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/{job_id}/ws")
+async def prediction_status_websocket(websocket: WebSocket, job_id: str) -> None:
+    """
+    Stream the status of a prediction job over a WebSocket.
+
+    Sends the current status, then one JSON message per transition, and
+    closes the connection after the terminal status.
+
+    Args:
+        websocket: WebSocket connection
+        job_id: The job ID returned from the POST request
+    """
+    events = await _open_job_stream(job_id)
+    if events is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Job not found")
+        return
+
+    async with aclosing(events):
+        await websocket.accept()
+        try:
+            async for event in events:
+                if event is not None:
+                    await websocket.send_json(event)
+        except WebSocketDisconnect:
+            return
+
+        await websocket.close()
@@ -0,0 +1,89 @@
+"""Analysis session listing endpoints."""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.endpoints.predict import JobStatusResponse
+from app.core.database import get_db
+from app.models import AnalysisStatus
+from app.services.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    InvalidCursorError,
+    fetch_session_page,
+)
+from app.services.status_cache import job_status
+from app.services.users import get_user_id
+
+router = APIRouter()
+
+
+class SessionListResponse(BaseModel):
+    """Page of a user's analysis sessions, newest first."""
+
+    items: list[JobStatusResponse]
+    next_cursor: str | None = Field(
+        None, description="Cursor of the next page, or null on the last page"
+    )
+
+
+@router.get(
+    "",
+    response_model=SessionListResponse,
+    summary="List analysis sessions",
+    description="List a user's analysis sessions, newest first, paginated by cursor",
+)
+async def list_sessions(
+    email: str = Query(..., description="Owner of the sessions"),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    session_status: AnalysisStatus | None = Query(
+        None, alias="status", description="Only list sessions with this status"
+    ),
+    db: AsyncSession = Depends(get_db),
+) -> SessionListResponse:
+    """
+    List a user's analysis sessions.
+
+    Pages continue after the cursor of the previous one instead of an
+    offset, so deep pages are as fast as the first and sessions created
+    while paging do not shift them.
+
+    Args:
+        email: User email
+        cursor: Cursor returned as ``next_cursor`` by the previous page
+        limit: Maximum number of sessions per page
+        session_status: Optional status filter
+        db: Database session
+
+    Returns:
+        SessionListResponse with the sessions and the next cursor
+
+    Raises:
+        HTTPException: If the user does not exist or the cursor is invalid
+    """
+    user_id = await get_user_id(db, email)
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User {email} not found",
+        )
+
+    try:
+        page = await fetch_session_page(
+            db, user_id, first=limit, after=cursor, status=session_status
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
+
+    return SessionListResponse(
+        items=[
+            JobStatusResponse(**job_status(session, page.measurements.get(session.id)))
+            for session in page.sessions
+        ],
+        next_cursor=page.end_cursor if page.has_next_page else None,
+    )
@@ -0,0 +1,46 @@
+"""System endpoints for operating the job infrastructure."""
+
+from fastapi import APIRouter, HTTPException, status
+from loguru import logger
+from pydantic import BaseModel, Field
+
+from app.services.queue_stats import redis_memory_report
+
+router = APIRouter()
+
+
+class RedisMemoryResponse(BaseModel):
+    """Redis memory usage report."""
+
+    used_memory_bytes: int
+    used_memory_peak_bytes: int
+    max_memory_bytes: int | None = Field(None, description="Configured maxmemory, if any")
+    fragmentation_ratio: float | None = None
+    queue_messages_bytes: int = Field(..., description="Memory held by queued job messages")
+    result_storage: str = Field(..., description="Configured job result storage policy")
+
+
+@router.get(
+    "/redis",
+    response_model=RedisMemoryResponse,
+    summary="Redis memory usage",
+    description="Report Redis memory usage and how much of it the job queue holds",
+)
+async def get_redis_memory() -> RedisMemoryResponse:
+    """
+    Report Redis memory usage.
+
+    Returns:
+        Memory figures from ``INFO memory`` and ``MEMORY USAGE``
+
+    Raises:
+        HTTPException: If Redis cannot be reached
+    """
+    try:
+        return RedisMemoryResponse(**await redis_memory_report())
+    except Exception as e:
+        logger.error(f"Failed to read Redis memory usage: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Redis is unavailable",
+        ) from e
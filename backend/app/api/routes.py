@@ -2,9 +2,13 @@
 
 from fastapi import APIRouter
 
-from app.api.endpoints import predict
+from app.api.endpoints import export, objects, predict, sessions, system
 
 api_router = APIRouter()
 
 # Include endpoint routers
 api_router.include_router(predict.router, prefix="/predict", tags=["predict"])
+api_router.include_router(sessions.router, prefix="/sessions", tags=["sessions"])
+api_router.include_router(export.router, prefix="/export", tags=["export"])
+api_router.include_router(objects.router, prefix="/objects", tags=["storage"])
+api_router.include_router(system.router, prefix="/system", tags=["system"])
@@ -0,0 +1,101 @@
+"""BodyVision command line interface."""
+
+import asyncio
+import importlib.util
+from datetime import datetime
+from pathlib import Path
+
+import typer
+import uvicorn
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.profiling import PROFILE_TOKEN_HEADER, create_profile_token
+from app.services.parquet_export import (
+    export_sessions_to_parquet,
+    read_watermark,
+    write_watermark,
+)
+
+app = typer.Typer(no_args_is_help=True)
+
+
+@app.callback()
+def main() -> None:
+    """BodyVision management commands."""
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+@app.command()
+def serve(
+    host: str = typer.Option(settings.HOST, help="Address to bind"),
+    port: int = typer.Option(settings.PORT, help="Port to bind"),
+    workers: int = typer.Option(settings.WORKERS, help="Number of worker processes"),
+    max_requests: int = typer.Option(
+        settings.SERVER_MAX_REQUESTS, help="Requests after which a worker is replaced (0 disables)"
+    ),
+) -> None:
+    """Run the API in production, with worker processes sharing one listening socket."""
+    # uvloop and httptools come with the 'server' extra; fall back to the
+    # pure Python implementations without them
+    loop = "uvloop" if _installed("uvloop") else "asyncio"
+    http = "httptools" if _installed("httptools") else "h11"
+
+    # Import the application once before forking workers, so that broken
+    # code or configuration fails here instead of in a crash loop
+    importlib.import_module("app.main")
+
+    typer.echo(f"Serving on {host}:{port} with {workers} workers (loop={loop}, http={http})")
+    uvicorn.run(
+        "app.main:app",
+        host=host,
+        port=port,
+        workers=workers,
+        loop=loop,
+        http=http,
+        # The supervisor replaces workers that exit after their last request
+        limit_max_requests=max_requests or None,
+        log_level=settings.LOG_LEVEL.lower(),
+    )
+
+
+@app.command("profile-token")
+def profile_token(
+    ttl_minutes: int = typer.Option(60, help="Minutes until the token expires"),
+) -> None:
+    """Print a token that makes the API profile requests sending it."""
+    token = create_profile_token(ttl_minutes * 60)
+    typer.echo(f"{PROFILE_TOKEN_HEADER}: {token}")
+
+
+@app.command("export-parquet")
+def export_parquet(
+    output_dir: Path = typer.Argument(..., help="Root directory of the Parquet dataset"),
+    since: datetime | None = typer.Option(
+        None, help="Only export sessions updated after this time (overrides --incremental)"
+    ),
+    until: datetime | None = typer.Option(None, help="Only export sessions updated until then"),
+    incremental: bool = typer.Option(
+        False, help="Resume from the watermark left in OUTPUT_DIR by the previous export"
+    ),
+) -> None:
+    """Export analysis sessions and measurements to Parquet, partitioned by month."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if since is None and incremental:
+        since = read_watermark(output_dir)
+        typer.echo(f"Resuming from watermark {since.isoformat() if since else '(none)'}")
+
+    async def run() -> None:
+        async with AsyncSessionLocal() as db:
+            result = await export_sessions_to_parquet(db, output_dir, since=since, until=until)
+        write_watermark(output_dir, result.watermark)
+        typer.echo(f"Exported {result.rows} sessions to {len(result.files)} files")
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    app()
@@ -1,5 +1,8 @@
 """Dramatiq broker configuration for background tasks."""
 
+import threading
+from typing import Any
+
 import dramatiq
 from dramatiq.brokers.redis import RedisBroker
 from dramatiq.results import Results
@@ -8,14 +11,52 @@ from loguru import logger
 
 from app.core.config import settings
 
-# Initialize Redis broker
-redis_broker = RedisBroker(url=settings.REDIS_URL)
+_broker: RedisBroker | None = None
+_broker_lock = threading.Lock()
+
+
+def get_broker() -> RedisBroker:
+    """
+    Get the Redis broker, creating it and setting it as Dramatiq's default
+    broker on first use.
+
+    The API only needs the broker once it enqueues a job, so creating it is
+    deferred until then. The outbox relay calls this from worker threads.
+    """
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = _create_broker()
+    return _broker
+
+
+def _create_broker() -> RedisBroker:
+    broker = RedisBroker(url=settings.REDIS_URL)
+
+    # Results live in the measurements table; optionally keep a compact
+    # status code in Redis for callers of Message.get_result
+    if settings.RESULT_STORAGE == "status":
+        result_backend = RedisBackend(url=settings.REDIS_URL)
+        broker.add_middleware(
+            Results(
+                backend=result_backend,
+                store_results=True,
+                result_ttl=settings.RESULT_TTL_SECONDS * 1000,
+            )
+        )
+
+    # Set as default broker
+    dramatiq.set_broker(broker)
 
-# Enable results backend for tracking job status
-result_backend = RedisBackend(url=settings.REDIS_URL)
-redis_broker.add_middleware(Results(backend=result_backend))
+    logger.info(
+        f"Dramatiq broker initialized with Redis at {settings.REDIS_URL} "
+        f"(result storage: {settings.RESULT_STORAGE})"
+    )
+    return broker
 
-# Set as default broker
-dramatiq.set_broker(redis_broker)
 
-logger.info(f"Dramatiq broker initialized with Redis at {settings.REDIS_URL}")
+def __getattr__(name: str) -> Any:
+    # Workers import ``redis_broker`` to register middleware before actors
+    if name == "redis_broker":
+        return get_broker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -26,6 +26,10 @@ class Settings(BaseSettings):
     HOST: str = "0.0.0.0"
     PORT: int = 8000
     WORKERS: int = 4
+    SERVER_MAX_REQUESTS: int = Field(
+        default=10000,
+        description="Requests after which an API worker process is replaced (0 disables)",
+    )
 
     # Database
     DATABASE_URL: str = Field(
@@ -34,6 +38,10 @@ class Settings(BaseSettings):
     )
     DATABASE_POOL_SIZE: int = 10
     DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_ECHO: bool = Field(
+        default=False,
+        description="Log every SQL statement (slows down requests and tests)",
+    )
 
     # Supabase
     SUPABASE_URL: str = Field(default="", description="Supabase project URL")
@@ -41,9 +49,241 @@ class Settings(BaseSettings):
     SUPABASE_SERVICE_ROLE_KEY: str = Field(default="", description="Supabase service role key")
     SUPABASE_STORAGE_BUCKET: str = "bodyvision-images"
 
+    # Object storage
+    STORAGE_BACKEND: Literal["local", "supabase"] = Field(
+        default="local",
+        description="Where uploaded images and meshes are stored",
+    )
+    STORAGE_DIR: str = Field(
+        default="storage",
+        description="Root directory of the local object storage, and of upload temporary files",
+    )
+    SUPABASE_SIGNED_URL_SECONDS: int = Field(
+        default=300,
+        description="Lifetime of the signed URLs objects stored in Supabase are served from",
+    )
+    UPLOAD_MAX_IMAGE_BYTES: int = Field(
+        default=20 * 1024 * 1024,
+        description="Largest image accepted by the upload endpoint",
+    )
+    UPLOAD_CHUNK_SIZE: int = Field(
+        default=1024 * 1024,
+        description="Bytes of an upload buffered in memory before each write to storage",
+    )
+
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
 
+    # Background Jobs
+    JOB_DEFAULT_DEADLINE_SECONDS: int = Field(
+        default=3600,
+        description="Deadline applied to analysis jobs when the client does not provide one",
+    )
+    JOB_MAX_DEADLINE_SECONDS: int = Field(
+        default=86400,
+        description="Upper bound accepted for client-provided job deadlines",
+    )
+    BATCH_MAX_ITEMS: int = Field(
+        default=100,
+        description="Maximum number of jobs accepted by one batch submission",
+    )
+    JOB_LEASE_SECONDS: int = Field(
+        default=60,
+        description="How long a worker owns a job without renewing its lease",
+    )
+    JOB_HEARTBEAT_INTERVAL_SECONDS: int = Field(
+        default=15,
+        description="How often workers renew the lease of a running job",
+    )
+    JOB_MAX_ATTEMPTS: int = Field(
+        default=3,
+        description="Attempts before a job whose lease keeps expiring is failed",
+    )
+    RESULT_STORAGE: Literal["db", "status"] = Field(
+        default="db",
+        description=(
+            "Where job results are kept: 'db' keeps them only in the measurements table, "
+            "'status' also stores a compact status code in the Dramatiq result backend"
+        ),
+    )
+    RESULT_TTL_SECONDS: int = Field(
+        default=300,
+        description="Lifetime of compact job status codes in Redis",
+    )
+    REAPER_ENABLED: bool = True
+    REAPER_INTERVAL_SECONDS: int = 30
+    REAPER_BATCH_SIZE: int = 100
+    JOB_EVENTS_KEEPALIVE_SECONDS: int = Field(
+        default=15,
+        description="Idle time after which job status streams send a keepalive",
+    )
+    JOB_EVENTS_QUEUE_SIZE: int = Field(
+        default=100,
+        description="Status events buffered per stream subscriber before the oldest are dropped",
+    )
+    STATUS_CACHE_TTL_SECONDS: int = Field(
+        default=300,
+        description="Lifetime of cached statuses of jobs that are still running",
+    )
+    STATUS_CACHE_TERMINAL_TTL_SECONDS: int = Field(
+        default=86400,
+        description="Lifetime of cached statuses of finished jobs",
+    )
+    JOB_RESULT_MAX_AGE_SECONDS: int = Field(
+        default=31536000,
+        description="Client cache lifetime of finished job statuses, which never change",
+    )
+    IDEMPOTENCY_TTL_SECONDS: int = Field(
+        default=86400,
+        description="How long responses to requests with an Idempotency-Key are replayed from Redis",
+    )
+    ADMISSION_CONTROL_ENABLED: bool = Field(
+        default=True,
+        description="Reject job submissions while the estimated queue wait is too long",
+    )
+    ADMISSION_MAX_WAIT_SECONDS: int = Field(
+        default=300,
+        description="Estimated time-to-start above which job submissions are rejected with 429",
+    )
+    ADMISSION_THROUGHPUT_WINDOW_SECONDS: int = Field(
+        default=300,
+        description="Window over which worker throughput is measured for admission control",
+    )
+    ADMISSION_MIN_THROUGHPUT: float = Field(
+        default=0.1,
+        description="Jobs per second assumed when workers have recently been idle",
+    )
+    OUTBOX_RELAY_ENABLED: bool = Field(
+        default=True,
+        description="Run the outbox relay in the API process (disable when running it as a sidecar)",
+    )
+    OUTBOX_POLL_INTERVAL_SECONDS: float = Field(
+        default=1.0,
+        description="How often the outbox relay polls for messages staged by other processes",
+    )
+    OUTBOX_BATCH_SIZE: int = Field(
+        default=500,
+        description="Maximum number of outbox messages relayed in one Redis round trip",
+    )
+
+    # Exports
+    EXPORT_BATCH_SIZE: int = Field(
+        default=1000,
+        description="Rows fetched per round trip from the server-side cursor of streaming exports",
+    )
+    EXPORT_WATERMARK_LAG_SECONDS: float = Field(
+        default=300.0,
+        ge=0,
+        description=(
+            "Age below which updates are left to the next incremental export, so sessions "
+            "committed late with an earlier updated_at are not skipped"
+        ),
+    )
+
+    # Request metrics
+    SERVER_TIMING_ENABLED: bool = Field(
+        default=True,
+        description="Report per-request database, Redis and serialization time in Server-Timing",
+    )
+    SLOW_REQUEST_THRESHOLD_MS: float = Field(
+        default=1000.0,
+        description="Requests slower than this are logged as warnings with their query counts",
+    )
+
+    # Request profiling
+    PROFILING_ENABLED: bool = Field(
+        default=False,
+        description="Install the request profiler (requires the 'profiling' extra)",
+    )
+    PROFILING_SAMPLE_RATE: float = Field(
+        default=0.0,
+        ge=0.0,
+        le=1.0,
+        description="Share of requests profiled without an X-Profile-Token header",
+    )
+    PROFILING_INTERVAL_SECONDS: float = Field(
+        default=0.001,
+        description="Sampling interval of the request profiler",
+    )
+    PROFILING_DIR: str = Field(
+        default="profiles",
+        description="Directory request profiles are written to",
+    )
+
+    # Readiness probe
+    READY_CACHE_SECONDS: float = Field(
+        default=2.0,
+        description="How long a readiness report is reused before the dependencies are probed again",
+    )
+    READY_PROBE_TIMEOUT_SECONDS: float = Field(
+        default=1.0,
+        description="Time after which a dependency probe counts as failed",
+    )
+    READY_MAX_DB_LATENCY_MS: float = Field(
+        default=250.0,
+        description="Database round trip above which the API reports itself not ready",
+    )
+    READY_MAX_REDIS_LATENCY_MS: float = Field(
+        default=100.0,
+        description="Redis ping above which the API reports itself not ready",
+    )
+
+    # Rate limiting
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMITS: dict[str, str] = Field(
+        default={
+            "predict": "30/minute",
+            "predict_batch": "5/minute",
+            "predict_upload": "30/minute",
+            "graphql": "300/minute",
+        },
+        description=(
+            "Token bucket per endpoint as '<requests>/<second|minute|hour|day>'; "
+            "the request count is also the allowed burst"
+        ),
+    )
+    RATE_LIMIT_TIERS: dict[str, float] = Field(
+        default={"free": 1.0, "pro": 5.0, "internal": 50.0},
+        description="Multiplier applied to the endpoint limits for each user tier, above 0",
+    )
+    RATE_LIMIT_USER_TIERS: dict[str, str] = Field(
+        default={},
+        description=(
+            "Tier of individual clients by email; others get RATE_LIMIT_DEFAULT_TIER. "
+            "Emails are not authenticated: anyone sending one gets, and uses up, its limits"
+        ),
+    )
+    RATE_LIMIT_DEFAULT_TIER: str = "free"
+    RATE_LIMIT_TRUSTED_PROXIES: list[str] = Field(
+        default=[],
+        description=(
+            "Addresses or networks of reverse proxies whose X-Forwarded-For header "
+            "identifies anonymous clients"
+        ),
+    )
+
+    # Worker memory profiling
+    WORKER_MEMORY_PROFILING: bool = Field(
+        default=False,
+        description="Log RSS per job and diff tracemalloc snapshots in workers",
+    )
+    WORKER_TRACEMALLOC_INTERVAL_JOBS: int = Field(
+        default=50,
+        description="Jobs between tracemalloc snapshots when profiling is enabled",
+    )
+    WORKER_TRACEMALLOC_TOP_N: int = 10
+    WORKER_MAX_RSS_MB: int = Field(
+        default=0,
+        description="RSS ceiling that triggers a worker restart (0 disables)",
+    )
+
+    # User lookup cache
+    USER_CACHE_MAX_SIZE: int = Field(
+        default=10000,
+        description="Maximum number of email to user ID entries cached per process",
+    )
+    USER_CACHE_TTL_SECONDS: int = 300
+
     # Body Model
     BODYVISION_MODEL: Literal["smplx", "star", "ghum"] = Field(
         default="smplx",
@@ -65,6 +305,14 @@ class Settings(BaseSettings):
     ENABLE_GPU: bool = False
     TORCH_DEVICE: Literal["cpu", "cuda", "mps"] = "cpu"
 
+    @field_validator("RATE_LIMIT_TIERS")
+    @classmethod
+    def _check_tier_multipliers(cls, tiers: dict[str, float]) -> dict[str, float]:
+        invalid = [tier for tier, multiplier in tiers.items() if not multiplier > 0]
+        if invalid:
+            raise ValueError(f"Tier multipliers must be above 0: {', '.join(invalid)}")
+        return tiers
+
     def get_allowed_origins(self) -> list[str]:
         """Parse CORS origins from comma-separated string."""
         return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",")]
@@ -1,11 +1,19 @@
 """Database connection and session management."""
 
 from collections.abc import AsyncGenerator
+from typing import Any
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import settings
+from app.core.server_timing import instrument_engine
 
 
 class Base(DeclarativeBase):
@@ -14,29 +22,52 @@ class Base(DeclarativeBase):
     pass
 
 
-# Create async engine
-db_url = settings.DATABASE_URL
-# Convert postgresql to asyncpg driver for async support
-if db_url.startswith("postgresql://"):
-    db_url = db_url.replace("postgresql://", "postgresql+asyncpg://")
-
-# For SQLite, we need different pool settings
-pool_kwargs = {}
-if not db_url.startswith("sqlite"):
-    pool_kwargs = {
-        "pool_size": settings.DATABASE_POOL_SIZE,
-        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
-    }
-
-engine = create_async_engine(
-    db_url,
-    echo=settings.DEBUG,
-    **pool_kwargs,
-)
+_engine: AsyncEngine | None = None
+
+
+def get_engine() -> AsyncEngine:
+    """
+    Get the async engine, creating it on first use.
+
+    Creating the engine loads the database driver, so it is deferred until
+    the application starts or a session is first opened.
+    """
+    global _engine
+    if _engine is None:
+        db_url = settings.DATABASE_URL
+        # Convert postgresql to asyncpg driver for async support
+        if db_url.startswith("postgresql://"):
+            db_url = db_url.replace("postgresql://", "postgresql+asyncpg://")
+
+        # For SQLite, we need different pool settings
+        pool_kwargs = {}
+        if not db_url.startswith("sqlite"):
+            pool_kwargs = {
+                "pool_size": settings.DATABASE_POOL_SIZE,
+                "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+            }
+
+        _engine = create_async_engine(
+            db_url,
+            echo=settings.DATABASE_ECHO,
+            **pool_kwargs,
+        )
+        if settings.SERVER_TIMING_ENABLED:
+            instrument_engine(_engine)
+    return _engine
+
+
+class LazySessionMaker(async_sessionmaker[AsyncSession]):
+    """Session factory binding itself to the engine when first called."""
+
+    def __call__(self, **local_kw: Any) -> AsyncSession:
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
 
 # Create async session factory
-AsyncSessionLocal = async_sessionmaker(
-    engine,
+AsyncSessionLocal = LazySessionMaker(
     class_=AsyncSession,
     expire_on_commit=False,
     autocommit=False,
@@ -44,6 +75,18 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
+def dialect_insert(db: AsyncSession, table: Any) -> Any:
+    """
+    Build an INSERT supporting ``ON CONFLICT`` for the session's dialect.
+
+    Both PostgreSQL and SQLite support ``ON CONFLICT``; SQLAlchemy exposes
+    it through dialect-specific ``insert`` constructs.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency for getting async database session.
@@ -0,0 +1,150 @@
+"""
+Opt-in statistical profiling of individual API requests.
+
+With ``PROFILING_ENABLED``, :class:`ProfilingMiddleware` runs pyinstrument
+for requests carrying a valid ``X-Profile-Token`` header, and for a random
+``PROFILING_SAMPLE_RATE`` share of the others. Each profile is written to
+``PROFILING_DIR`` in the speedscope format, which speedscope.app and other
+flamegraph viewers open, and its file name is returned in the
+``X-Profile-File`` response header. GraphQL profiles are named after the
+operation.
+
+Tokens are signed with ``SECRET_KEY`` and expire; mint one with
+``bodyvision profile-token``. Profiling refuses to start while ``SECRET_KEY``
+is left at its default, with which anyone could sign tokens. When profiling
+is disabled the middleware is not installed and pyinstrument is never
+imported.
+
+pyinstrument is an optional dependency (``pip install 'body-vision[profiling]'``).
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import random
+import re
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+PROFILE_TOKEN_HEADER = "X-Profile-Token"
+PROFILE_FILE_HEADER = "X-Profile-File"
+
+
+def _signature(expires_at: int) -> str:
+    return hmac.new(
+        settings.SECRET_KEY.encode(), f"profile:{expires_at}".encode(), hashlib.sha256
+    ).hexdigest()
+
+
+def create_profile_token(ttl_seconds: int) -> str:
+    """Create a token allowing requests to ask for profiling until it expires."""
+    expires_at = int(time.time()) + ttl_seconds
+    return f"{expires_at}.{_signature(expires_at)}"
+
+
+def verify_profile_token(token: str) -> bool:
+    """Check a profile token is signed with ``SECRET_KEY`` and not expired."""
+    expires, _, signature = token.partition(".")
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(signature, _signature(int(expires)))
+
+
+def _import_pyinstrument() -> Any:
+    try:
+        import pyinstrument
+        import pyinstrument.renderers  # noqa: F401
+    except ImportError as e:
+        raise RuntimeError(
+            "PROFILING_ENABLED requires pyinstrument: pip install 'body-vision[profiling]'"
+        ) from e
+    return pyinstrument
+
+
+def _operation_name(body: bytes) -> str | None:
+    try:
+        name = json.loads(body).get("operationName")
+    except (ValueError, AttributeError):
+        return None
+    return name if isinstance(name, str) else None
+
+
+def profile_filename(method: str, path: str, operation: str | None = None) -> str:
+    """File name of a request's profile, sortable by time."""
+    label = f"{path}-{operation}" if operation else path
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", label).strip("-") or "root"
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    return f"{timestamp}-{method}-{slug[:80]}-{uuid.uuid4().hex[:8]}.speedscope.json"
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling requests that ask for it or are sampled."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        if settings.SECRET_KEY == type(settings).model_fields["SECRET_KEY"].default:
+            raise RuntimeError(
+                "PROFILING_ENABLED requires SECRET_KEY to be changed from its default"
+            )
+        self.app = app
+        self.pyinstrument = _import_pyinstrument()
+        self.directory = Path(settings.PROFILING_DIR)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _should_profile(self, scope: Scope) -> bool:
+        token = Headers(scope=scope).get(PROFILE_TOKEN_HEADER)
+        if token is not None:
+            return verify_profile_token(token)
+        return random.random() < settings.PROFILING_SAMPLE_RATE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        # Only GraphQL bodies are kept, to name profiles after the operation;
+        # other bodies, such as image uploads, stream through untouched
+        graphql = scope["path"] == "/graphql"
+        body = bytearray()
+        filename = None
+
+        async def receive_body() -> Message:
+            message = await receive()
+            if message["type"] == "http.request":
+                body.extend(message.get("body", b""))
+            return message
+
+        async def send_with_filename(message: Message) -> None:
+            nonlocal filename
+            if message["type"] == "http.response.start":
+                # The body has been read by the time the response starts
+                operation = _operation_name(bytes(body)) if graphql else None
+                filename = profile_filename(scope["method"], scope["path"], operation)
+                MutableHeaders(scope=message).append(PROFILE_FILE_HEADER, filename)
+            await send(message)
+
+        profiler = self.pyinstrument.Profiler(
+            interval=settings.PROFILING_INTERVAL_SECONDS, async_mode="enabled"
+        )
+        profiler.start()
+        try:
+            await self.app(scope, receive_body if graphql else receive, send_with_filename)
+        finally:
+            profiler.stop()
+            if filename is None:
+                filename = profile_filename(scope["method"], scope["path"])
+            await asyncio.to_thread(self._save, profiler, filename)
+
+    def _save(self, profiler: Any, filename: str) -> None:
+        path = self.directory / filename
+        path.write_text(profiler.output(self.pyinstrument.renderers.SpeedscopeRenderer()))
+        logger.info(f"Saved request profile to {path}")
@@ -0,0 +1,51 @@
+"""Redis clients shared by the API and background workers."""
+
+from functools import lru_cache
+from typing import Any, cast
+
+import redis
+import redis.asyncio as aioredis
+from redis.asyncio.client import Pipeline
+
+from app.core.config import settings
+from app.core.server_timing import redis_call
+
+
+class InstrumentedRedis(aioredis.Redis):
+    """Asyncio Redis client accounting its round trips in Server-Timing."""
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        with redis_call():
+            return await super().execute_command(*args, **options)
+
+    def pipeline(self, transaction: bool = True, shard_hint: str | None = None) -> Pipeline:
+        return InstrumentedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+
+class InstrumentedPipeline(Pipeline):
+    """Pipeline accounting each execution as one Redis round trip."""
+
+    async def execute(self, raise_on_error: bool = True) -> list[Any]:
+        with redis_call():
+            return cast(list[Any], await super().execute(raise_on_error))
+
+
+@lru_cache
+def get_redis() -> aioredis.Redis:
+    """
+    Get the asyncio Redis client used by API handlers.
+
+    The client is created on first use and connects lazily, so importing
+    this module never touches the network.
+    """
+    return cast(
+        aioredis.Redis, InstrumentedRedis.from_url(settings.REDIS_URL, decode_responses=True)
+    )
+
+
+@lru_cache
+def get_sync_redis() -> redis.Redis:
+    """Get the blocking Redis client used by Dramatiq workers."""
+    return redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
@@ -0,0 +1,184 @@
+"""
+Per-request accounting of database, Redis and serialization time.
+
+``ServerTimingMiddleware`` opens a :class:`RequestMetrics` for every HTTP
+request in a context variable. SQLAlchemy cursor events, the instrumented
+Redis client and JSON rendering add to it wherever they run during the
+request, including inside GraphQL resolvers. When the response starts, the
+totals are sent as a ``Server-Timing`` header and logged, at WARNING level
+when the request took longer than ``SLOW_REQUEST_THRESHOLD_MS``. A request
+issuing dozens of queries shows an N+1 pattern at a glance.
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+
+class RequestMetrics:
+    """Work done on behalf of one request."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.redis_calls = 0
+        self.redis_seconds = 0.0
+        self.serialization_seconds = 0.0
+
+    @property
+    def elapsed_seconds(self) -> float:
+        """Time since the request was received."""
+        return time.perf_counter() - self.started
+
+    def server_timing(self, total_seconds: float) -> str:
+        """Format the metrics as a ``Server-Timing`` header value."""
+        return ", ".join(
+            [
+                f'db;desc="{self.db_queries} queries";dur={self.db_seconds * 1000:.1f}',
+                f'redis;desc="{self.redis_calls} calls";dur={self.redis_seconds * 1000:.1f}',
+                f"serialize;dur={self.serialization_seconds * 1000:.1f}",
+                f"total;dur={total_seconds * 1000:.1f}",
+            ]
+        )
+
+    def log_fields(self, total_seconds: float) -> dict[str, Any]:
+        """Structured log fields of the metrics."""
+        return {
+            "duration_ms": round(total_seconds * 1000, 1),
+            "db_queries": self.db_queries,
+            "db_ms": round(self.db_seconds * 1000, 1),
+            "redis_calls": self.redis_calls,
+            "redis_ms": round(self.redis_seconds * 1000, 1),
+            "serialize_ms": round(self.serialization_seconds * 1000, 1),
+        }
+
+
+_current: ContextVar[RequestMetrics | None] = ContextVar("request_metrics", default=None)
+
+
+def current_metrics() -> RequestMetrics | None:
+    """Metrics of the request being handled, if any."""
+    return _current.get()
+
+
+@contextmanager
+def redis_call() -> Iterator[None]:
+    """Account a Redis round trip to the current request."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.redis_calls += 1
+        metrics.redis_seconds += time.perf_counter() - start
+
+
+@contextmanager
+def serialization() -> Iterator[None]:
+    """Account time spent encoding a response body to the current request."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serialization_seconds += time.perf_counter() - start
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Account the statements executed by an engine to the current request."""
+
+    # The async engine runs cursor events in a greenlet that shares the
+    # context of the awaiting task, so the request's metrics are visible here
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        if _current.get() is not None:
+            conn.info["server_timing_start"] = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        metrics = _current.get()
+        start = conn.info.pop("server_timing_start", None)
+        if metrics is not None and start is not None:
+            metrics.db_queries += 1
+            metrics.db_seconds += time.perf_counter() - start
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSON response accounting its encoding time to the current request."""
+
+    def render(self, content: Any) -> bytes:
+        with serialization():
+            return super().render(content)
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware reporting the metrics of each HTTP request."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+
+        async def send_with_timing(message: Message) -> None:
+            # Streaming responses keep running after their headers are sent,
+            # so requests are measured up to the start of the response
+            if message["type"] == "http.response.start":
+                total = metrics.elapsed_seconds
+                MutableHeaders(scope=message).append("Server-Timing", metrics.server_timing(total))
+                _log_request(scope, message["status"], metrics, total)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+
+
+def _log_request(scope: Scope, status_code: int, metrics: RequestMetrics, total: float) -> None:
+    slow = total * 1000 >= settings.SLOW_REQUEST_THRESHOLD_MS
+    fields = metrics.log_fields(total)
+    logger.bind(method=scope["method"], path=scope["path"], status_code=status_code, **fields).log(
+        "WARNING" if slow else "DEBUG",
+        f"{'Slow request' if slow else 'Request'} {scope['method']} {scope['path']} "
+        f"{status_code} in {fields['duration_ms']} ms "
+        f"({metrics.db_queries} queries, {metrics.redis_calls} Redis calls)",
+    )
@@ -0,0 +1,33 @@
+"""Measured application startup phases."""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from loguru import logger
+
+
+class StartupReport:
+    """Time spent in each startup phase, logged once startup completes."""
+
+    def __init__(self) -> None:
+        self.phases: list[tuple[str, float]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Measure one startup phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    @property
+    def total_seconds(self) -> float:
+        """Time spent in all phases."""
+        return sum(seconds for _, seconds in self.phases)
+
+    def log(self) -> None:
+        """Log the duration of every phase."""
+        phases = ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in self.phases)
+        logger.info(f"Startup completed in {self.total_seconds * 1000:.1f} ms ({phases})")
@@ -0,0 +1,42 @@
+"""GraphQL schema extensions for BodyVision."""
+
+from collections.abc import AsyncIterator
+
+from fastapi import status
+from graphql import ExecutionResult, GraphQLError
+from strawberry.extensions import SchemaExtension
+
+from app.services.rate_limit import check_rate_limit, client_identity
+
+
+class RateLimitExtension(SchemaExtension):
+    """
+    Apply the ``graphql`` rate limit to every operation.
+
+    Clients are identified by address. Rejected HTTP requests get a 429 with
+    the rate limit headers; rejected operations over WebSocket only get the
+    error.
+    """
+
+    async def on_execute(self) -> AsyncIterator[None]:
+        context = self.execution_context.context
+        response = context.get("response")
+        result = await check_rate_limit("graphql", {client_identity(context.get("request")): 1})
+
+        if result is not None:
+            if response is not None:
+                response.headers.update(result.headers())
+            if not result.allowed:
+                if response is not None:
+                    response.status_code = status.HTTP_429_TOO_MANY_REQUESTS
+                # Setting a result skips execution
+                self.execution_context.result = ExecutionResult(
+                    data=None,
+                    errors=[
+                        GraphQLError(
+                            f"Rate limit exceeded, retry in {result.retry_after}s",
+                            extensions={"code": "RATE_LIMITED", "retryAfter": result.retry_after},
+                        )
+                    ],
+                )
+        yield
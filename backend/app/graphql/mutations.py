@@ -0,0 +1,21 @@
+"""GraphQL mutations for BodyVision."""
+
+import strawberry
+from strawberry.types import Info
+
+from app.core.database import AsyncSessionLocal
+from app.graphql.queries import map_session_to_type
+from app.graphql.types import AnalysisSessionType
+from app.services.job_control import cancel_job
+
+
+@strawberry.type
+class Mutation:
+    """Root GraphQL mutation."""
+
+    @strawberry.mutation
+    async def cancel_analysis_session(self, info: Info, job_id: str) -> AnalysisSessionType | None:
+        """Cancel a queued or running analysis session by job ID."""
+        async with AsyncSessionLocal() as db:
+            session = await cancel_job(db, job_id)
+            return map_session_to_type(session) if session else None
@@ -1,23 +1,33 @@
 """GraphQL queries for BodyVision."""
 
 from datetime import datetime
+from typing import Any
 
 import strawberry
+from graphql import OperationType
 from sqlalchemy import desc, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
 from strawberry.types import Info
 
 from app.core.database import AsyncSessionLocal
 from app.graphql.types import (
+    AnalysisSessionConnection,
+    AnalysisSessionEdge,
     AnalysisSessionType,
     AnalysisStatsType,
     AnalysisStatusEnum,
     GenderEnum,
     MeasurementType,
+    PageInfo,
     UserType,
     UserWithSessionsType,
 )
 from app.models import AnalysisSession, AnalysisStatus, Gender, Measurement, User
+from app.services.pagination import DEFAULT_PAGE_SIZE, fetch_session_page, session_cursor
+from app.services.status_cache import etag_matches, job_status, status_cache_control, status_etag
+from app.services.storage import fetchable_url
+from app.services.users import get_user_id
 
 
 async def get_db_session(info: Info) -> AsyncSession:
@@ -47,7 +57,7 @@ def map_measurement_to_type(measurement: Measurement) -> MeasurementType:
         body_density_kg_per_liter=measurement.body_density_kg_per_liter,
         lean_mass_kg=measurement.lean_mass_kg,
         fat_mass_kg=measurement.fat_mass_kg,
-        mesh_url=measurement.mesh_url,
+        mesh_url=fetchable_url(measurement.mesh_url) if measurement.mesh_url else None,
         confidence_score=measurement.confidence_score,
         created_at=measurement.created_at,
         updated_at=measurement.updated_at,
@@ -63,9 +73,9 @@ def map_session_to_type(
         user_id=session.user_id,
         job_id=session.job_id,
         status=AnalysisStatusEnum(session.status.value),
-        front_image_url=session.front_image_url,
-        side_image_url=session.side_image_url,
-        back_image_url=session.back_image_url,
+        front_image_url=fetchable_url(session.front_image_url),
+        side_image_url=fetchable_url(session.side_image_url),
+        back_image_url=fetchable_url(session.back_image_url),
         height_cm=session.height_cm,
         weight_kg=session.weight_kg,
         age=session.age,
@@ -81,6 +91,35 @@ def map_session_to_type(
     )
 
 
+def set_status_validators(info: Info, status: dict[str, Any]) -> None:
+    """
+    Set the HTTP validators of a job status on the GraphQL response.
+
+    Only applies when the query selects nothing but the current field, so
+    that the response depends on the session alone. A matching
+    ``If-None-Match`` turns GET responses into a 304, and finished sessions
+    queried over GET become cacheable like their REST counterpart. POST
+    responses still carry the ETag.
+    """
+    request = info.context.get("request")
+    response = info.context.get("response")
+    if (
+        not isinstance(request, Request)
+        or response is None
+        or info.operation.operation != OperationType.QUERY
+        or len(info.operation.selection_set.selections) != 1
+    ):
+        return
+
+    etag = status_etag(status)
+    response.headers["ETag"] = etag
+    if request.method == "GET":
+        response.headers["Cache-Control"] = status_cache_control(status)
+        # POST queries may not be answered with a 304 (RFC 9110, 15.4.5)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            response.status_code = 304
+
+
 @strawberry.type
 class Query:
     """Root GraphQL query."""
@@ -123,6 +162,7 @@ class Query:
                 )
                 measurement = result.scalar_one_or_none()
 
+            set_status_validators(info, job_status(session, measurement))
             return map_session_to_type(session, measurement)
 
     @strawberry.field
@@ -136,15 +176,14 @@ class Query:
     ) -> list[AnalysisSessionType]:
         """Get user's analysis sessions with optional status filter."""
         async with AsyncSessionLocal() as db:
-            # Get user
-            result = await db.execute(select(User).where(User.email == email))
-            user = result.scalar_one_or_none()
+            # Get user ID
+            user_id = await get_user_id(db, email)
 
-            if not user:
+            if user_id is None:
                 return []
 
             # Build query
-            query = select(AnalysisSession).where(AnalysisSession.user_id == user.id)
+            query = select(AnalysisSession).where(AnalysisSession.user_id == user_id)
 
             if status:
                 query = query.where(AnalysisSession.status == AnalysisStatus(status.value))
@@ -170,6 +209,42 @@ class Query:
 
             return session_types
 
+    @strawberry.field
+    async def user_sessions_connection(
+        self,
+        info: Info,
+        email: str,
+        first: int = DEFAULT_PAGE_SIZE,
+        after: str | None = None,
+        status: AnalysisStatusEnum | None = None,
+    ) -> AnalysisSessionConnection:
+        """Get a page of a user's analysis sessions, newest first, by cursor."""
+        async with AsyncSessionLocal() as db:
+            user_id = await get_user_id(db, email)
+
+            if user_id is None:
+                return AnalysisSessionConnection(
+                    edges=[], page_info=PageInfo(has_next_page=False, end_cursor=None)
+                )
+
+            page = await fetch_session_page(
+                db,
+                user_id,
+                first=first,
+                after=after,
+                status=AnalysisStatus(status.value) if status else None,
+            )
+            return AnalysisSessionConnection(
+                edges=[
+                    AnalysisSessionEdge(
+                        cursor=session_cursor(session),
+                        node=map_session_to_type(session, page.measurements.get(session.id)),
+                    )
+                    for session in page.sessions
+                ],
+                page_info=PageInfo(has_next_page=page.has_next_page, end_cursor=page.end_cursor),
+            )
+
     @strawberry.field
     async def user_with_sessions(
         self, info: Info, email: str, limit: int = 10
@@ -183,26 +258,12 @@ class Query:
             if not user:
                 return None
 
-            # Get sessions
-            result = await db.execute(
-                select(AnalysisSession)
-                .where(AnalysisSession.user_id == user.id)
-                .order_by(desc(AnalysisSession.created_at))
-                .limit(limit)
-            )
-            sessions = result.scalars().all()
-
-            # Map to types
-            session_types = []
-            for session in sessions:
-                measurement = None
-                if session.status == AnalysisStatus.COMPLETED:
-                    result = await db.execute(
-                        select(Measurement).where(Measurement.session_id == session.id)
-                    )
-                    measurement = result.scalar_one_or_none()
-
-                session_types.append(map_session_to_type(session, measurement))
+            # Get the first page of sessions
+            page = await fetch_session_page(db, user.id, first=limit)
+            session_types = [
+                map_session_to_type(session, page.measurements.get(session.id))
+                for session in page.sessions
+            ]
 
             return UserWithSessionsType(
                 id=user.id,
@@ -218,17 +279,16 @@ class Query:
     async def user_stats(self, info: Info, email: str) -> AnalysisStatsType | None:
         """Get statistics for a user's body composition analyses."""
         async with AsyncSessionLocal() as db:
-            # Get user
-            result = await db.execute(select(User).where(User.email == email))
-            user = result.scalar_one_or_none()
+            # Get user ID
+            user_id = await get_user_id(db, email)
 
-            if not user:
+            if user_id is None:
                 return None
 
             # Total analyses
             result = await db.execute(
                 select(func.count(AnalysisSession.id)).where(
-                    AnalysisSession.user_id == user.id
+                    AnalysisSession.user_id == user_id
                 )
             )
             total_analyses = result.scalar_one()
@@ -236,7 +296,7 @@ class Query:
             # Completed analyses
             result = await db.execute(
                 select(func.count(AnalysisSession.id)).where(
-                    AnalysisSession.user_id == user.id,
+                    AnalysisSession.user_id == user_id,
                     AnalysisSession.status == AnalysisStatus.COMPLETED,
                 )
             )
@@ -245,7 +305,7 @@ class Query:
             # Failed analyses
             result = await db.execute(
                 select(func.count(AnalysisSession.id)).where(
-                    AnalysisSession.user_id == user.id,
+                    AnalysisSession.user_id == user_id,
                     AnalysisSession.status == AnalysisStatus.FAILED,
                 )
             )
@@ -255,14 +315,14 @@ class Query:
             result = await db.execute(
                 select(func.avg(Measurement.body_fat_percentage))
                 .join(AnalysisSession)
-                .where(AnalysisSession.user_id == user.id)
+                .where(AnalysisSession.user_id == user_id)
             )
             average_body_fat = result.scalar_one()
 
             # Average processing time
             result = await db.execute(
                 select(func.avg(AnalysisSession.processing_time_seconds)).where(
-                    AnalysisSession.user_id == user.id,
+                    AnalysisSession.user_id == user_id,
                     AnalysisSession.status == AnalysisStatus.COMPLETED,
                 )
             )
@@ -273,7 +333,7 @@ class Query:
                 select(
                     func.min(AnalysisSession.created_at),
                     func.max(AnalysisSession.created_at),
-                ).where(AnalysisSession.user_id == user.id)
+                ).where(AnalysisSession.user_id == user_id)
             )
             first_date, last_date = result.one()
 
@@ -295,18 +355,17 @@ class Query:
     ) -> list[MeasurementType]:
         """Get user's latest body composition measurements."""
         async with AsyncSessionLocal() as db:
-            # Get user
-            result = await db.execute(select(User).where(User.email == email))
-            user = result.scalar_one_or_none()
+            # Get user ID
+            user_id = await get_user_id(db, email)
 
-            if not user:
+            if user_id is None:
                 return []
 
             # Get latest measurements
             result = await db.execute(
                 select(Measurement)
                 .join(AnalysisSession)
-                .where(AnalysisSession.user_id == user.id)
+                .where(AnalysisSession.user_id == user_id)
                 .order_by(desc(Measurement.created_at))
                 .limit(limit)
             )
@@ -2,11 +2,15 @@
 
 import strawberry
 
+from app.graphql.extensions import RateLimitExtension
+from app.graphql.mutations import Mutation
 from app.graphql.queries import Query
+from app.graphql.subscriptions import Subscription
 
 # Create the GraphQL schema
 schema = strawberry.Schema(
     query=Query,
-    # Enable GraphiQL in development
-    # mutation=Mutation,  # Add later if needed
+    mutation=Mutation,
+    subscription=Subscription,
+    extensions=[RateLimitExtension],
 )
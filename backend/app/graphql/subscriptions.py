@@ -0,0 +1,73 @@
+"""GraphQL subscriptions for BodyVision."""
+
+from collections.abc import AsyncGenerator
+from contextlib import aclosing
+from datetime import datetime
+from typing import Any
+
+import strawberry
+from strawberry.types import Info
+
+from app.core.database import AsyncSessionLocal
+from app.graphql.types import AnalysisSessionUpdateType, AnalysisStatusEnum
+from app.services.job_events import iter_job_events, job_event_hub, load_job_event
+from app.services.users import get_user_id
+
+
+def map_event_to_update(event: dict[str, Any]) -> AnalysisSessionUpdateType:
+    """Map a job status event to GraphQL type."""
+    return AnalysisSessionUpdateType(
+        job_id=event["job_id"],
+        session_id=event["session_id"],
+        user_id=event["user_id"],
+        status=AnalysisStatusEnum(event["status"]),
+        error_message=event["error_message"],
+        updated_at=datetime.fromisoformat(event["updated_at"]),
+    )
+
+
+@strawberry.type
+class Subscription:
+    """Root GraphQL subscription."""
+
+    @strawberry.subscription
+    async def analysis_session_updates(
+        self, info: Info, job_id: str
+    ) -> AsyncGenerator[AnalysisSessionUpdateType, None]:
+        """Follow an analysis session until it finishes, starting with its current status."""
+        subscription = await job_event_hub.subscribe(job_id=job_id)
+        try:
+            async with AsyncSessionLocal() as db:
+                current = await load_job_event(db, job_id)
+        except Exception:
+            subscription.close()
+            raise
+
+        if current is None:
+            subscription.close()
+            raise ValueError(f"Job {job_id} not found")
+
+        async with aclosing(iter_job_events(subscription, current)) as events:
+            async for event in events:
+                if event is not None:
+                    yield map_event_to_update(event)
+
+    @strawberry.subscription
+    async def user_session_updates(
+        self, info: Info, email: str
+    ) -> AsyncGenerator[AnalysisSessionUpdateType, None]:
+        """Follow status changes of all analysis sessions of a user."""
+        async with AsyncSessionLocal() as db:
+            user_id = await get_user_id(db, email)
+
+        if user_id is None:
+            raise ValueError(f"User {email} not found")
+
+        subscription = await job_event_hub.subscribe(user_id=user_id)
+        try:
+            while True:
+                event = await subscription.get()
+                if event is not None:
+                    yield map_event_to_update(event)
+        finally:
+            subscription.close()
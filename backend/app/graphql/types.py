@@ -44,6 +44,8 @@ class AnalysisStatusEnum(str, Enum):
     PROCESSING = "processing"
     COMPLETED = "completed"
     FAILED = "failed"
+    EXPIRED = "expired"
+    CANCELLED = "cancelled"
 
 
 @strawberry.enum
@@ -82,6 +84,30 @@ class AnalysisSessionType:
     measurements: MeasurementType | None = None
 
 
+@strawberry.type
+class PageInfo:
+    """Relay-style pagination information of a connection."""
+
+    has_next_page: bool
+    end_cursor: str | None
+
+
+@strawberry.type
+class AnalysisSessionEdge:
+    """Analysis session in a connection, with its cursor."""
+
+    cursor: str
+    node: AnalysisSessionType
+
+
+@strawberry.type
+class AnalysisSessionConnection:
+    """Page of analysis sessions, paginated by cursor."""
+
+    edges: list[AnalysisSessionEdge]
+    page_info: PageInfo
+
+
 @strawberry.type
 class UserWithSessionsType:
     """GraphQL type for User with their analysis sessions."""
@@ -106,3 +132,15 @@ class AnalysisStatsType:
     average_processing_time: float | None
     first_analysis_date: datetime | None
     last_analysis_date: datetime | None
+
+
+@strawberry.type
+class AnalysisSessionUpdateType:
+    """Status change of an analysis session, pushed to subscriptions."""
+
+    job_id: str
+    session_id: int
+    user_id: int
+    status: AnalysisStatusEnum
+    error_message: str | None
+    updated_at: datetime
@@ -1,30 +1,67 @@
 """FastAPI application entry point."""
 
+import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
-from fastapi import FastAPI
+from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from loguru import logger
+from sqlalchemy import text
 
 from app.api.endpoints.graphql_endpoint import graphql_router
 from app.api.routes import api_router
-from app.core.broker import redis_broker  # noqa: F401  # Initialize broker
 from app.core.config import settings
+from app.core.database import get_engine
+from app.core.profiling import ProfilingMiddleware
+from app.core.server_timing import ServerTimingMiddleware, TimedJSONResponse
+from app.core.startup import StartupReport
+from app.services.job_events import job_event_hub
+from app.services.leases import run_reaper
+from app.services.outbox import run_outbox_relay
+from app.services.readiness import readiness
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-    """Application lifespan events."""
+    """
+    Application lifespan events.
+
+    The first database connection is opened and timed at startup, so
+    that it is not paid by the first request. The Dramatiq broker is not
+    created here: it connects when the first job is enqueued.
+    """
     # Startup
     logger.info("Starting BodyVision API...")
     logger.info(f"Environment: {settings.APP_ENV}")
     logger.info(f"Model: {settings.BODYVISION_MODEL}")
+    report = StartupReport()
+
+    with report.phase("database"):
+        try:
+            async with get_engine().connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        except Exception as e:
+            # Readiness reports the database until it is reachable
+            logger.warning(f"Database unreachable at startup: {e}")
+
+    stop = asyncio.Event()
+    background_tasks = []
+    if settings.OUTBOX_RELAY_ENABLED:
+        background_tasks.append(asyncio.create_task(run_outbox_relay(stop)))
+    if settings.REAPER_ENABLED:
+        background_tasks.append(asyncio.create_task(run_reaper(stop)))
+
+    report.log()
 
     yield
 
     # Shutdown
     logger.info("Shutting down BodyVision API...")
+    stop.set()
+    await asyncio.gather(*background_tasks)
+    await job_event_hub.close()
 
 
 # Initialize FastAPI app
@@ -35,6 +72,7 @@ app = FastAPI(
     lifespan=lifespan,
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
+    default_response_class=TimedJSONResponse,
 )
 
 # CORS middleware
@@ -46,6 +84,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Server-Timing headers and request logs with query counts
+if settings.SERVER_TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
+
+# Opt-in request profiling; not installed at all when disabled
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
 # Include API routes
 app.include_router(api_router, prefix="/api")
 
@@ -61,3 +107,20 @@ async def health_check() -> dict[str, str]:
         "version": "0.1.0",
         "model": settings.BODYVISION_MODEL,
     }
+
+
+@app.get("/ready")
+async def readiness_check() -> JSONResponse:
+    """
+    Readiness endpoint.
+
+    Reports database and Redis latency, job queue depth and connection pool
+    usage, and answers 503 while a dependency is down or too slow. Probes are
+    cached for ``READY_CACHE_SECONDS``.
+    """
+    report = await readiness()
+    return JSONResponse(
+        content=report.to_dict(),
+        status_code=status.HTTP_200_OK if report.ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Cache-Control": "no-store"},
+    )
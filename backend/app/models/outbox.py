@@ -0,0 +1,26 @@
+"""Transactional outbox for job messages."""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class JobOutbox(Base):
+    """
+    Job message waiting to be relayed to the broker.
+
+    Rows are written in the same transaction as the analysis session they
+    belong to and deleted by the outbox relay once the message is enqueued.
+    """
+
+    __tablename__ = "job_outbox"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    session_id: Mapped[int] = mapped_column(
+        ForeignKey("analysis_sessions.id", ondelete="CASCADE"), index=True
+    )
+    message: Mapped[str] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,26 @@
+"""Reference counts of content-addressed stored objects."""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class StoredObjectRecord(Base):
+    """
+    Object kept in object storage, with the number of references to it.
+
+    Objects are keyed by the SHA-256 of their content, so identical images
+    or meshes share one object and one row. The object is deleted from
+    storage when its last reference is released.
+    """
+
+    __tablename__ = "stored_objects"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    size: Mapped[int] = mapped_column(BigInteger)
+    content_type: Mapped[str] = mapped_column(String(100))
+    refcount: Mapped[int] = mapped_column(Integer)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,150 @@
+"""
+Queue-depth-aware admission control for job submissions.
+
+Workers count the jobs they take off the queue in short Redis buckets. The
+API divides the depth of the Dramatiq queue, plus the messages the job
+outbox has not relayed yet, by the recent throughput to estimate how long a
+new job would wait before starting, and turns submissions away with 429
+while that estimate exceeds ``ADMISSION_MAX_WAIT_SECONDS``. ``Retry-After``
+is the time the workers need to bring the wait back under the limit.
+
+Admission fails open: if Redis or the outbox cannot be read, jobs are
+accepted.
+"""
+
+import asyncio
+import math
+import time
+
+from fastapi import HTTPException, status
+from loguru import logger
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.redis import get_redis, get_sync_redis
+from app.services.outbox import count_staged_messages
+from app.services.queue_stats import queue_key
+
+THROUGHPUT_KEY_PREFIX = "bodyvision:admission:processed:"
+THROUGHPUT_BUCKET_SECONDS = 10
+# How long each process reuses its count of the outbox backlog
+STAGED_COUNT_TTL_SECONDS = 1.0
+
+# Per-process outbox backlog count and its expiry time
+_staged_count: tuple[int, float] | None = None
+_staged_count_lock = asyncio.Lock()
+
+
+def _throughput_key(bucket: int) -> str:
+    return f"{THROUGHPUT_KEY_PREFIX}{bucket}"
+
+
+def record_processed_job() -> None:
+    """Count a job taken off the queue by a worker."""
+    bucket = int(time.time()) // THROUGHPUT_BUCKET_SECONDS
+    key = _throughput_key(bucket)
+    try:
+        pipe = get_sync_redis().pipeline(transaction=False)
+        pipe.incr(key)
+        pipe.expire(key, settings.ADMISSION_THROUGHPUT_WINDOW_SECONDS + THROUGHPUT_BUCKET_SECONDS)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to record worker throughput: {e}")
+
+
+async def staged_message_count() -> int:
+    """
+    Count the messages the job outbox has not relayed yet.
+
+    The count is cached for ``STAGED_COUNT_TTL_SECONDS``, so submissions
+    share one query per process instead of each scanning the outbox, whose
+    backlog is largest exactly when the API is overloaded.
+    """
+    global _staged_count
+    async with _staged_count_lock:
+        if _staged_count is None or _staged_count[1] < time.monotonic():
+            # A short-lived session, so that uploads admitted here do not
+            # hold a connection while they stream
+            async with AsyncSessionLocal() as db:
+                count = await count_staged_messages(db)
+            _staged_count = (count, time.monotonic() + STAGED_COUNT_TTL_SECONDS)
+        return _staged_count[0]
+
+
+class QueueEstimate:
+    """Snapshot of the job queue used for admission decisions."""
+
+    def __init__(self, depth: int, throughput: float) -> None:
+        self.depth = depth
+        # Jobs taken off the queue per second over the recent window
+        self.throughput = throughput
+
+    @property
+    def wait_seconds(self) -> float:
+        """Estimated time before a job submitted now starts."""
+        return self.depth / self.throughput
+
+    @property
+    def retry_after_seconds(self) -> int:
+        """Time until the estimated wait is back under the limit."""
+        excess = self.wait_seconds - settings.ADMISSION_MAX_WAIT_SECONDS
+        return max(1, math.ceil(excess))
+
+
+async def estimate_queue() -> QueueEstimate:
+    """
+    Read the queue depth and recent worker throughput.
+
+    The Dramatiq queue and throughput buckets are read in one Redis round
+    trip; the depth also counts the messages still in the job outbox, which
+    are queued as far as clients are concerned, from a per-process count
+    refreshed every ``STAGED_COUNT_TTL_SECONDS``. Only complete buckets are
+    counted, and throughput never drops below ``ADMISSION_MIN_THROUGHPUT``
+    so that idle workers (or a cold start) do not make a short queue look
+    stuck.
+    """
+    current = int(time.time()) // THROUGHPUT_BUCKET_SECONDS
+    buckets = max(1, settings.ADMISSION_THROUGHPUT_WINDOW_SECONDS // THROUGHPUT_BUCKET_SECONDS)
+    keys = [_throughput_key(current - offset) for offset in range(1, buckets + 1)]
+
+    pipe = get_redis().pipeline(transaction=False)
+    pipe.llen(queue_key())
+    pipe.mget(keys)
+    depth, counts = await pipe.execute()
+
+    depth += await staged_message_count()
+
+    processed = sum(int(count) for count in counts if count)
+    throughput = processed / (buckets * THROUGHPUT_BUCKET_SECONDS)
+    return QueueEstimate(depth=depth, throughput=max(throughput, settings.ADMISSION_MIN_THROUGHPUT))
+
+
+async def admit_job() -> None:
+    """
+    Dependency rejecting job submissions while the queue is too deep.
+
+    Raises:
+        HTTPException: 429 with ``Retry-After`` if a new job would wait longer
+            than ``ADMISSION_MAX_WAIT_SECONDS`` before starting
+    """
+    if not settings.ADMISSION_CONTROL_ENABLED:
+        return
+
+    try:
+        estimate = await estimate_queue()
+    except Exception as e:
+        logger.warning(f"Admission control unavailable, accepting job: {e}")
+        return
+
+    if estimate.wait_seconds <= settings.ADMISSION_MAX_WAIT_SECONDS:
+        return
+
+    logger.warning(
+        f"Rejecting job submission: {estimate.depth} jobs queued, "
+        f"estimated wait {estimate.wait_seconds:.0f}s"
+    )
+    raise HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=f"Job queue is full (estimated wait {estimate.wait_seconds:.0f}s), retry later",
+        headers={"Retry-After": str(estimate.retry_after_seconds)},
+    )
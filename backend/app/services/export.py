@@ -0,0 +1,140 @@
+"""
+Streaming exports of measurements.
+
+Rows are read through a server-side cursor (``AsyncSession.stream`` with
+``yield_per``) and encoded one fetched batch at a time, so memory use does
+not depend on the size of the export.
+"""
+
+import csv
+import enum
+import io
+import json
+from collections.abc import AsyncIterator, Callable, Sequence
+from datetime import datetime
+from typing import Any, Literal
+
+from sqlalchemy import Select, select
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models import AnalysisSession, Measurement, User
+from app.services.status_cache import MEASUREMENT_FIELDS, isoformat_utc
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_MEDIA_TYPES: dict[ExportFormat, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Exported columns, in output order
+EXPORT_COLUMNS = (
+    Measurement.id.label("measurement_id"),
+    AnalysisSession.id.label("session_id"),
+    AnalysisSession.job_id,
+    User.email,
+    Measurement.created_at.label("measured_at"),
+    AnalysisSession.height_cm,
+    AnalysisSession.weight_kg,
+    AnalysisSession.age,
+    AnalysisSession.gender,
+    AnalysisSession.model_used,
+    *(getattr(Measurement, field) for field in MEASUREMENT_FIELDS),
+)
+
+EXPORT_FIELDNAMES = tuple(column.key for column in EXPORT_COLUMNS)
+
+
+def measurement_export_query(
+    user_id: int | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> Select[Any]:
+    """
+    Build the query of a measurement export.
+
+    Args:
+        user_id: Only export this user's measurements
+        since: Only export measurements taken at or after this time
+        until: Only export measurements taken before this time
+
+    Returns:
+        Query selecting ``EXPORT_COLUMNS`` in measurement order
+    """
+    query = (
+        select(*EXPORT_COLUMNS)
+        .join(AnalysisSession, AnalysisSession.id == Measurement.session_id)
+        .join(User, User.id == AnalysisSession.user_id)
+        .order_by(Measurement.id)
+    )
+    if user_id is not None:
+        query = query.where(AnalysisSession.user_id == user_id)
+    if since is not None:
+        query = query.where(Measurement.created_at >= since)
+    if until is not None:
+        query = query.where(Measurement.created_at < until)
+    return query
+
+
+def _export_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return isoformat_utc(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def encode_ndjson(rows: Sequence[Sequence[Any]]) -> str:
+    """Encode rows as newline-delimited JSON objects."""
+    return "".join(
+        json.dumps(dict(zip(EXPORT_FIELDNAMES, map(_export_value, row), strict=True))) + "\n"
+        for row in rows
+    )
+
+
+def encode_csv(rows: Sequence[Sequence[Any]]) -> str:
+    """Encode rows as CSV lines."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(map(_export_value, row) for row in rows)
+    return buffer.getvalue()
+
+
+def csv_header() -> str:
+    """CSV header line of measurement exports."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(EXPORT_FIELDNAMES)
+    return buffer.getvalue()
+
+
+ENCODERS: dict[ExportFormat, Callable[[Sequence[Sequence[Any]]], str]] = {
+    "ndjson": encode_ndjson,
+    "csv": encode_csv,
+}
+
+
+async def stream_measurements(
+    query: Select[Any], export_format: ExportFormat
+) -> AsyncIterator[str]:
+    """
+    Stream the rows of an export query, encoded in the given format.
+
+    Uses its own database session, which stays open for the duration of
+    the response.
+
+    Args:
+        query: Query built by :func:`measurement_export_query`
+        export_format: Output format
+
+    Yields:
+        Encoded chunks of up to ``EXPORT_BATCH_SIZE`` rows
+    """
+    encode = ENCODERS[export_format]
+    if export_format == "csv":
+        yield csv_header()
+
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+        async for rows in result.partitions():
+            yield encode(rows)
@@ -0,0 +1,87 @@
+"""
+Idempotency keys for job submissions.
+
+Clients retrying a submission send the same ``Idempotency-Key`` header, and
+get the response of the original request back instead of a new job. The
+response is kept in Redis for ``IDEMPOTENCY_TTL_SECONDS``; the key is also
+stored on the analysis session with the request fingerprint, and its unique
+constraint on ``(user_id, idempotency_key)`` catches concurrent retries and
+retries that arrive after the Redis entry expired.
+"""
+
+import hashlib
+import json
+from typing import Any
+
+from loguru import logger
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.redis import get_redis
+
+IDEMPOTENCY_KEY_PREFIX = "bodyvision:idempotency:"
+
+
+class IdempotencyKeyReusedError(Exception):
+    """Raised when an idempotency key is sent again with a different request."""
+
+    def __init__(self, key: str) -> None:
+        super().__init__(f"Idempotency-Key {key} was already used for a different request")
+        self.key = key
+
+
+def idempotency_redis_key(email: str, key: str) -> str:
+    """Redis key holding the response for a user's idempotency key."""
+    digest = hashlib.sha256(f"{email}\0{key}".encode()).hexdigest()
+    return f"{IDEMPOTENCY_KEY_PREFIX}{digest}"
+
+
+def request_fingerprint(request: BaseModel) -> str:
+    """Hash a request body to detect idempotency keys reused for other requests."""
+    return hashlib.sha256(request.model_dump_json().encode()).hexdigest()
+
+
+async def get_stored_response(email: str, key: str, fingerprint: str) -> dict[str, Any] | None:
+    """
+    Look up the response stored for an idempotency key.
+
+    Args:
+        email: Email of the submitting user
+        key: Idempotency key sent by the client
+        fingerprint: Fingerprint of the current request
+
+    Returns:
+        The original response, or None if the key was not seen (or expired)
+
+    Raises:
+        IdempotencyKeyReusedError: If the key was used for a different request
+    """
+    try:
+        stored = await get_redis().get(idempotency_redis_key(email, key))
+    except Exception as e:
+        # The database constraint still prevents duplicate jobs
+        logger.warning(f"Failed to read idempotency key: {e}")
+        return None
+
+    if not stored:
+        return None
+
+    entry = json.loads(stored)
+    if entry["fingerprint"] != fingerprint:
+        raise IdempotencyKeyReusedError(key)
+    response: dict[str, Any] = entry["response"]
+    return response
+
+
+async def store_response(email: str, key: str, fingerprint: str, response: dict[str, Any]) -> None:
+    """Keep the response of a request sent with an idempotency key."""
+    entry = json.dumps({"fingerprint": fingerprint, "response": response}, separators=(",", ":"))
+    try:
+        await get_redis().set(
+            idempotency_redis_key(email, key),
+            entry,
+            ex=settings.IDEMPOTENCY_TTL_SECONDS,
+            nx=True,
+        )
+    except Exception as e:
+        logger.warning(f"Failed to store idempotency key: {e}")
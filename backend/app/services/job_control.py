@@ -0,0 +1,110 @@
+"""Job control: cancellation flags shared by the API and workers."""
+
+from datetime import datetime, timezone
+
+from loguru import logger
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.redis import get_redis, get_sync_redis
+from app.models import AnalysisSession, AnalysisStatus
+from app.services.job_events import publish_job_event_async, session_event
+from app.services.status_cache import cache_job_status, job_status
+
+CANCEL_KEY_PREFIX = "bodyvision:job:cancelled:"
+
+# Statuses a job can be cancelled from
+CANCELLABLE_STATUSES = (AnalysisStatus.QUEUED, AnalysisStatus.PROCESSING)
+
+
+class JobNotCancellableError(Exception):
+    """Raised when cancelling a job that already reached a terminal status."""
+
+    def __init__(self, job_id: str, status: AnalysisStatus) -> None:
+        super().__init__(f"Job {job_id} is already {status.value}")
+        self.job_id = job_id
+        self.status = status
+
+
+class JobCancelledError(Exception):
+    """Raised inside a worker when the job it is running was cancelled."""
+
+
+def cancel_key(job_id: str) -> str:
+    """Redis key holding the cancellation flag for a job."""
+    return f"{CANCEL_KEY_PREFIX}{job_id}"
+
+
+async def cancel_job(db: AsyncSession, job_id: str) -> AnalysisSession | None:
+    """
+    Cancel a queued or running job.
+
+    The session is marked ``CANCELLED`` and a flag is set in Redis so that
+    workers skip queued messages without touching the database and abort
+    running jobs at the next stage boundary. The flag outlives the longest
+    accepted job deadline, after which the message would be dropped anyway.
+
+    Args:
+        db: Database session
+        job_id: Public job ID to cancel
+
+    Returns:
+        The cancelled session, or None if the job does not exist
+
+    Raises:
+        JobNotCancellableError: If the job already finished
+    """
+    # Decide in the database, so a worker finishing the job concurrently
+    # either wins or is cancelled, never overwritten
+    result = await db.execute(
+        update(AnalysisSession)
+        .where(
+            AnalysisSession.job_id == job_id,
+            AnalysisSession.status.in_(CANCELLABLE_STATUSES),
+        )
+        .values(
+            status=AnalysisStatus.CANCELLED,
+            error_message="Cancelled by client",
+            completed_at=datetime.now(timezone.utc),
+        )
+        .returning(AnalysisSession)
+    )
+    session = result.scalar_one_or_none()
+
+    if not session:
+        await db.rollback()
+        current = await db.execute(
+            select(AnalysisSession.status).where(AnalysisSession.job_id == job_id)
+        )
+        current_status = current.scalar_one_or_none()
+        if current_status is None:
+            return None
+        raise JobNotCancellableError(job_id, current_status)
+
+    await db.commit()
+
+    await get_redis().set(cancel_key(job_id), "1", ex=settings.JOB_MAX_DEADLINE_SECONDS)
+    await cache_job_status(job_status(session))
+    await publish_job_event_async(session_event(session))
+
+    logger.info(f"Cancelled job {job_id}")
+    return session
+
+
+def is_cancelled(job_id: str) -> bool:
+    """Check the cancellation flag for a job from a worker."""
+    return bool(get_sync_redis().exists(cancel_key(job_id)))
+
+
+def raise_if_cancelled(job_id: str) -> None:
+    """
+    Abort the current job if it was cancelled.
+
+    Workers call this between pipeline stages.
+
+    Raises:
+        JobCancelledError: If the job was cancelled
+    """
+    if is_cancelled(job_id):
+        raise JobCancelledError(job_id)
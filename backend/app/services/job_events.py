@@ -0,0 +1,291 @@
+"""
+Job status events published over Redis pub/sub.
+
+Workers and the API publish an event on the job's channel whenever a session
+changes status, so clients can follow a job over SSE, WebSocket or GraphQL
+subscriptions instead of polling. Each API process relays the events to its
+subscribers through one shared :class:`JobEventHub`. Publishing is best effort: streams always start from the status
+read from the database after subscribing, so a lost event only delays the
+next update.
+"""
+
+import asyncio
+import json
+from collections.abc import AsyncGenerator
+from datetime import datetime, timezone
+from typing import Any
+
+from loguru import logger
+from redis.asyncio.client import PubSub
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.redis import get_redis, get_sync_redis
+from app.models import AnalysisSession, AnalysisStatus
+
+JOB_CHANNEL_PREFIX = "bodyvision:jobs:"
+
+# Statuses after which a job never changes again
+TERMINAL_STATUSES = frozenset(
+    {
+        AnalysisStatus.COMPLETED,
+        AnalysisStatus.FAILED,
+        AnalysisStatus.EXPIRED,
+        AnalysisStatus.CANCELLED,
+    }
+)
+
+_TERMINAL_STATUS_VALUES = frozenset(status.value for status in TERMINAL_STATUSES)
+
+# Position of the non-terminal statuses in a job's lifecycle; terminal
+# statuses come after all of them
+_STATUS_RANKS = {
+    AnalysisStatus.PENDING.value: 0,
+    AnalysisStatus.QUEUED.value: 1,
+    AnalysisStatus.PROCESSING.value: 2,
+}
+
+
+def status_rank(status: str) -> int:
+    """Position of a status value in the lifecycle of a job."""
+    return _STATUS_RANKS.get(status, len(_STATUS_RANKS))
+
+
+def job_channel(job_id: str) -> str:
+    """Redis pub/sub channel carrying the status events of a job."""
+    return f"{JOB_CHANNEL_PREFIX}{job_id}"
+
+
+def job_event(
+    job_id: str,
+    session_id: int,
+    user_id: int,
+    status: AnalysisStatus,
+    error_message: str | None = None,
+) -> dict[str, Any]:
+    """Build the status event of a job."""
+    return {
+        "job_id": job_id,
+        "session_id": session_id,
+        "user_id": user_id,
+        "status": status.value,
+        "error_message": error_message,
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def session_event(session: AnalysisSession) -> dict[str, Any]:
+    """Build the status event of an analysis session."""
+    return job_event(
+        session.job_id, session.id, session.user_id, session.status, session.error_message
+    )
+
+
+def is_terminal_event(event: dict[str, Any]) -> bool:
+    """Check whether an event reports a terminal job status."""
+    return event["status"] in _TERMINAL_STATUS_VALUES
+
+
+def publish_job_event(event: dict[str, Any]) -> None:
+    """Publish a job status event from a worker."""
+    try:
+        get_sync_redis().publish(job_channel(event["job_id"]), json.dumps(event))
+    except Exception as e:
+        logger.warning(f"Failed to publish status event for job {event['job_id']}: {e}")
+
+
+async def publish_job_event_async(event: dict[str, Any]) -> None:
+    """Publish a job status event from the API."""
+    try:
+        await get_redis().publish(job_channel(event["job_id"]), json.dumps(event))
+    except Exception as e:
+        logger.warning(f"Failed to publish status event for job {event['job_id']}: {e}")
+
+
+async def load_job_event(db: AsyncSession, job_id: str) -> dict[str, Any] | None:
+    """
+    Read the current status event of a job from the database.
+
+    Returns:
+        The event, or None if the job does not exist
+    """
+    result = await db.execute(
+        select(
+            AnalysisSession.id,
+            AnalysisSession.user_id,
+            AnalysisSession.status,
+            AnalysisSession.error_message,
+        ).where(AnalysisSession.job_id == job_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+    return job_event(job_id, row.id, row.user_id, row.status, row.error_message)
+
+
+class JobEventSubscription:
+    """Queue of status events delivered to one subscriber of the hub."""
+
+    def __init__(self, hub: "JobEventHub", job_id: str | None, user_id: int | None) -> None:
+        self.hub = hub
+        self.job_id = job_id
+        self.user_id = user_id
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(
+            maxsize=settings.JOB_EVENTS_QUEUE_SIZE
+        )
+
+    def matches(self, event: dict[str, Any]) -> bool:
+        """Check whether an event is for this subscriber."""
+        if self.job_id is not None:
+            return bool(event["job_id"] == self.job_id)
+        return bool(event["user_id"] == self.user_id)
+
+    def put(self, event: dict[str, Any]) -> None:
+        """Deliver an event, dropping the oldest one if the subscriber lags."""
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: float | None = None) -> dict[str, Any] | None:
+        """
+        Wait for the next event.
+
+        Returns:
+            The event, or None if none arrived within ``timeout`` seconds
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except TimeoutError:
+            return None
+
+    def close(self) -> None:
+        """Stop receiving events."""
+        self.hub.unsubscribe(self)
+
+
+class JobEventHub:
+    """
+    Per-process fan-out of job status events.
+
+    A single Redis connection pattern-subscribes to every job channel and
+    dispatches each event to the in-process subscribers of its job or user,
+    so open streams and GraphQL subscriptions do not each hold a Redis
+    connection. The listener starts with the first subscriber and runs
+    until :meth:`close`.
+    """
+
+    def __init__(self) -> None:
+        self._subscriptions: set[JobEventSubscription] = set()
+        self._listener: asyncio.Task[None] | None = None
+        self._start_lock = asyncio.Lock()
+
+    async def subscribe(
+        self, job_id: str | None = None, user_id: int | None = None
+    ) -> JobEventSubscription:
+        """
+        Subscribe to the status events of a job or of all jobs of a user.
+
+        Subscribe before reading the current status, so that no transition
+        is missed in between.
+
+        Args:
+            job_id: Job to follow
+            user_id: User whose jobs to follow, if no job is given
+
+        Returns:
+            Subscription to read events from and close when done
+        """
+        await self._ensure_listener()
+        subscription = JobEventSubscription(self, job_id, user_id)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: JobEventSubscription) -> None:
+        """Remove a subscriber."""
+        self._subscriptions.discard(subscription)
+
+    async def _ensure_listener(self) -> None:
+        async with self._start_lock:
+            if self._listener is not None:
+                return
+
+            pubsub = get_redis().pubsub()
+            # Subscribe before the first subscriber reads its current status
+            await pubsub.psubscribe(f"{JOB_CHANNEL_PREFIX}*")
+            self._listener = asyncio.create_task(self._listen(pubsub))
+
+    async def _listen(self, pubsub: PubSub) -> None:
+        try:
+            while True:
+                try:
+                    async for message in pubsub.listen():
+                        if message["type"] == "pmessage":
+                            self._dispatch(json.loads(message["data"]))
+                except Exception as e:
+                    # Reading again reconnects and restores the subscription
+                    logger.warning(f"Job event listener failed, retrying: {e}")
+                    await asyncio.sleep(1)
+        finally:
+            await pubsub.aclose()
+
+    def _dispatch(self, event: dict[str, Any]) -> None:
+        for subscription in list(self._subscriptions):
+            if subscription.matches(event):
+                subscription.put(event)
+
+    async def close(self) -> None:
+        """Stop the listener, e.g. on application shutdown."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+        self._listener = None
+        self._start_lock = asyncio.Lock()
+        self._subscriptions.clear()
+
+
+job_event_hub = JobEventHub()
+
+
+async def subscribe_job(job_id: str) -> JobEventSubscription:
+    """Subscribe to the status events of a job through the shared hub."""
+    return await job_event_hub.subscribe(job_id=job_id)
+
+
+async def iter_job_events(
+    subscription: JobEventSubscription, current: dict[str, Any]
+) -> AsyncGenerator[dict[str, Any] | None, None]:
+    """
+    Yield the current status of a job, then each transition until it ends.
+
+    ``None`` is yielded every ``JOB_EVENTS_KEEPALIVE_SECONDS`` without
+    events so that streams can send keepalives. The subscription is closed
+    once the job reaches a terminal status or the iterator is closed.
+
+    Streams only move forward in the lifecycle: events not past the last
+    status yielded are dropped. They are transitions published before the
+    current status was read, delivered late; a job requeued after losing
+    its worker keeps showing as processing until it ends.
+
+    Args:
+        subscription: Subscription returned by :func:`subscribe_job`
+        current: Status event read after subscribing
+    """
+    try:
+        yield current
+        last_status = current["status"]
+        while last_status not in _TERMINAL_STATUS_VALUES:
+            event = await subscription.get(timeout=settings.JOB_EVENTS_KEEPALIVE_SECONDS)
+            if event is None:
+                yield None
+                continue
+
+            if status_rank(event["status"]) <= status_rank(last_status):
+                continue
+            last_status = event["status"]
+            yield event
+    finally:
+        subscription.close()
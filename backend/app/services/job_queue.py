@@ -0,0 +1,131 @@
+"""Helpers for building and enqueueing body analysis job messages."""
+
+import uuid
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+from typing import cast
+
+import dramatiq
+from dramatiq.brokers.redis import RedisBroker
+from dramatiq.common import current_millis
+
+from app.core.broker import get_broker
+from app.core.config import settings
+
+# Define the task name for sending messages
+# The actual task implementation is in inference/app/tasks/body_analysis.py
+BODY_ANALYSIS_TASK = "process_body_analysis"
+BODY_ANALYSIS_QUEUE = "default"
+
+# Dramatiq version whose Redis dispatch script enqueue_many was tested with
+PIPELINED_DRAMATIQ_VERSION = "1.17.0"
+
+
+def compute_deadline(deadline_seconds: int | None = None) -> datetime:
+    """
+    Compute the absolute deadline for a new analysis job.
+
+    Args:
+        deadline_seconds: Client-provided deadline relative to now, if any
+
+    Returns:
+        Timezone-aware UTC datetime after which the job should be skipped
+    """
+    seconds = deadline_seconds or settings.JOB_DEFAULT_DEADLINE_SECONDS
+    seconds = min(seconds, settings.JOB_MAX_DEADLINE_SECONDS)
+    return datetime.now(timezone.utc) + timedelta(seconds=seconds)
+
+
+def build_analysis_message(session_id: int, job_id: str, deadline_at: datetime) -> dramatiq.Message:
+    """
+    Build the Dramatiq message for a body analysis job.
+
+    The deadline travels in the message options (as UNIX milliseconds, like
+    Dramatiq's own ``eta``) so workers can drop expired jobs before loading
+    anything from the database.
+
+    Args:
+        session_id: ID of the analysis session to process
+        job_id: Public job ID of the analysis session
+        deadline_at: Absolute deadline for the job
+
+    Returns:
+        Message ready to be enqueued on the broker
+    """
+    return dramatiq.Message(
+        queue_name=BODY_ANALYSIS_QUEUE,
+        actor_name=BODY_ANALYSIS_TASK,
+        args=(session_id,),
+        kwargs={},
+        options={
+            "job_id": job_id,
+            "deadline": int(deadline_at.timestamp() * 1000),
+        },
+    )
+
+
+def enqueue_analysis(message: dramatiq.Message) -> dramatiq.Message:
+    """Send a body analysis message to the configured broker."""
+    broker = get_broker()
+    return cast(dramatiq.Message, broker.enqueue(message))
+
+
+def enqueue_many(messages: Sequence[dramatiq.Message]) -> list[dramatiq.Message]:
+    """
+    Send several messages to the broker in a single Redis round trip.
+
+    Dramatiq has no batch enqueue, so on the Redis broker this mirrors
+    ``RedisBroker.enqueue`` (including its middleware hooks) but issues every
+    dispatch script call through one non-transactional pipeline. That relies
+    on broker internals, so it only runs on the Dramatiq version it was
+    tested against; other versions and brokers enqueue messages one by one.
+
+    Args:
+        messages: Messages to enqueue (without delay)
+
+    Returns:
+        The enqueued messages, as returned by the broker
+    """
+    broker = get_broker()
+    if not isinstance(broker, RedisBroker) or dramatiq.__version__ != PIPELINED_DRAMATIQ_VERSION:
+        return [broker.enqueue(message) for message in messages]
+    return _pipelined_enqueue(broker, messages)
+
+
+def _pipelined_enqueue(
+    broker: RedisBroker, messages: Sequence[dramatiq.Message]
+) -> list[dramatiq.Message]:
+    # Arguments of the "enqueue" command of Dramatiq's dispatch script
+    dispatch = broker.scripts["dispatch"]
+    max_unpack_size = broker._max_unpack_size()
+    pipe = broker.client.pipeline(transaction=False)
+
+    enqueued = []
+    for message in messages:
+        # Each enqueued message needs its own Redis ID, like RedisBroker.enqueue
+        message = message.copy(options={"redis_message_id": str(uuid.uuid4())})
+        broker.emit_before("enqueue", message, None)
+        dispatch(
+            keys=[broker.namespace],
+            args=[
+                "enqueue",
+                current_millis(),
+                message.queue_name,
+                broker.broker_id,
+                broker.heartbeat_timeout,
+                broker.dead_message_ttl,
+                0,  # Leave queue maintenance to regular enqueues
+                max_unpack_size,
+                message.options["redis_message_id"],
+                message.encode(),
+            ],
+            client=pipe,
+        )
+        enqueued.append(message)
+
+    pipe.execute()
+
+    for message in enqueued:
+        broker.emit_after("enqueue", message, None)
+
+    return enqueued
@@ -0,0 +1,272 @@
+"""Job leases: worker ownership, heartbeats and the stuck-job reaper."""
+
+import asyncio
+import os
+import socket
+import threading
+from datetime import datetime, timedelta, timezone
+from types import TracebackType
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models import AnalysisSession, AnalysisStatus
+from app.services.job_events import publish_job_event_async, session_event
+from app.services.job_queue import build_analysis_message, compute_deadline
+from app.services.outbox import notify_relay, stage_messages
+from app.services.status_cache import cache_job_status, job_status
+
+
+class LeaseLostError(Exception):
+    """Raised inside a worker when another owner took over its job."""
+
+
+def lease_owner_id() -> str:
+    """Identify the current worker thread as a lease owner."""
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+def _lease_expiry(now: datetime) -> datetime:
+    return now + timedelta(seconds=settings.JOB_LEASE_SECONDS)
+
+
+async def claim_lease(db: AsyncSession, session_id: int, owner: str) -> AnalysisSession | None:
+    """
+    Atomically move a queued session to ``PROCESSING`` under a lease.
+
+    Args:
+        db: Database session
+        session_id: ID of the analysis session to claim
+        owner: Lease owner ID of the calling worker
+
+    Returns:
+        The claimed session, or None if it is not queued anymore
+    """
+    now = datetime.now(timezone.utc)
+    result = await db.execute(
+        update(AnalysisSession)
+        .where(
+            AnalysisSession.id == session_id,
+            AnalysisSession.status == AnalysisStatus.QUEUED,
+        )
+        .values(
+            status=AnalysisStatus.PROCESSING,
+            started_at=now,
+            lease_owner=owner,
+            lease_expires_at=_lease_expiry(now),
+            heartbeat_at=now,
+            attempt_count=AnalysisSession.attempt_count + 1,
+        )
+        .returning(AnalysisSession)
+    )
+    session = result.scalar_one_or_none()
+    await db.commit()
+    return session
+
+
+async def finish_leased_job(
+    db: AsyncSession, session_id: int, owner: str, **values: Any
+) -> AnalysisSession | None:
+    """
+    Move a running job to a terminal status and release its lease.
+
+    The update only applies while the caller still owns the job, so a
+    worker whose job was re-queued or finalized by the reaper, or
+    cancelled, cannot overwrite the newer status. The caller commits.
+
+    Args:
+        db: Database session
+        session_id: ID of the analysis session to finish
+        owner: Lease owner ID of the calling worker
+        **values: Columns to set, including the new ``status``
+
+    Returns:
+        The updated session, or None if the worker lost the job
+    """
+    result = await db.execute(
+        update(AnalysisSession)
+        .where(
+            AnalysisSession.id == session_id,
+            AnalysisSession.status == AnalysisStatus.PROCESSING,
+            AnalysisSession.lease_owner == owner,
+        )
+        .values(lease_owner=None, lease_expires_at=None, **values)
+        .returning(AnalysisSession)
+    )
+    return result.scalar_one_or_none()
+
+
+async def renew_lease(session_id: int, owner: str) -> bool:
+    """
+    Extend the lease of a running job.
+
+    Returns:
+        False if the worker no longer owns the job
+    """
+    now = datetime.now(timezone.utc)
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            update(AnalysisSession)
+            .where(
+                AnalysisSession.id == session_id,
+                AnalysisSession.status == AnalysisStatus.PROCESSING,
+                AnalysisSession.lease_owner == owner,
+            )
+            .values(lease_expires_at=_lease_expiry(now), heartbeat_at=now)
+        )
+        await db.commit()
+        return result.rowcount == 1
+
+
+class LeaseHeartbeat:
+    """
+    Async context manager renewing a job lease while the job runs.
+
+    Example:
+        ```python
+        async with LeaseHeartbeat(session.id, owner) as lease:
+            ...
+            lease.raise_if_lost()
+        ```
+    """
+
+    def __init__(self, session_id: int, owner: str) -> None:
+        self.session_id = session_id
+        self.owner = owner
+        self.lost = False
+        self._task: asyncio.Task[None] | None = None
+
+    async def __aenter__(self) -> "LeaseHeartbeat":
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.JOB_HEARTBEAT_INTERVAL_SECONDS)
+            try:
+                renewed = await renew_lease(self.session_id, self.owner)
+            except Exception as e:
+                # A transient DB error must not kill the job; the lease
+                # only expires if renewals keep failing
+                logger.warning(f"Failed to renew lease for session {self.session_id}: {e}")
+                continue
+
+            if not renewed:
+                logger.warning(f"Lost lease for session {self.session_id}")
+                self.lost = True
+                return
+
+    def raise_if_lost(self) -> None:
+        """
+        Abort the current job if its lease was taken over.
+
+        Raises:
+            LeaseLostError: If the lease was lost
+        """
+        if self.lost:
+            raise LeaseLostError(f"Lease lost for session {self.session_id}")
+
+
+async def reap_expired_leases(db: AsyncSession, limit: int) -> tuple[int, int]:
+    """
+    Re-queue or fail sessions whose worker stopped renewing its lease.
+
+    Candidates come from the partial index on ``lease_expires_at`` for
+    ``PROCESSING`` rows, locked with ``SKIP LOCKED`` so several reapers can
+    run concurrently.
+
+    Args:
+        db: Database session
+        limit: Maximum number of sessions to reap in one pass
+
+    Returns:
+        Tuple of (requeued, finished) session counts, where finished
+        sessions were moved to ``FAILED`` or ``EXPIRED``
+    """
+    now = datetime.now(timezone.utc)
+    result = await db.execute(
+        select(AnalysisSession)
+        .where(
+            AnalysisSession.status == AnalysisStatus.PROCESSING,
+            AnalysisSession.lease_expires_at < now,
+        )
+        .order_by(AnalysisSession.lease_expires_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    sessions = result.scalars().all()
+
+    requeued = []
+    finished = 0
+    for session in sessions:
+        logger.warning(
+            f"Lease of session {session.id} held by {session.lease_owner} "
+            f"expired at {session.lease_expires_at}"
+        )
+        session.lease_owner = None
+        session.lease_expires_at = None
+
+        deadline_at = session.deadline_at or compute_deadline()
+        if deadline_at.tzinfo is None:
+            # SQLite returns naive datetimes
+            deadline_at = deadline_at.replace(tzinfo=timezone.utc)
+        if session.attempt_count >= settings.JOB_MAX_ATTEMPTS:
+            session.status = AnalysisStatus.FAILED
+            session.error_message = f"Worker lease expired after {session.attempt_count} attempts"
+            session.completed_at = now
+            finished += 1
+        elif deadline_at <= now:
+            session.status = AnalysisStatus.EXPIRED
+            session.error_message = "Job deadline exceeded after worker lease expired"
+            session.completed_at = now
+            finished += 1
+        else:
+            session.status = AnalysisStatus.QUEUED
+            session.started_at = None
+            requeued.append(build_analysis_message(session.id, session.job_id, deadline_at))
+
+    await stage_messages(db, requeued)
+    await db.commit()
+    if requeued:
+        notify_relay()
+
+    for session in sessions:
+        await cache_job_status(job_status(session))
+        await publish_job_event_async(session_event(session))
+
+    return len(requeued), finished
+
+
+async def run_reaper(stop: asyncio.Event) -> None:
+    """Periodically reap expired leases until ``stop`` is set."""
+    logger.info(f"Lease reaper started (interval={settings.REAPER_INTERVAL_SECONDS}s)")
+    while not stop.is_set():
+        try:
+            async with AsyncSessionLocal() as db:
+                requeued, finished = await reap_expired_leases(db, settings.REAPER_BATCH_SIZE)
+            if requeued or finished:
+                logger.info(f"Lease reaper requeued {requeued} and finished {finished} sessions")
+        except Exception as e:
+            logger.error(f"Lease reaper pass failed: {e}")
+
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=settings.REAPER_INTERVAL_SECONDS)
+        except TimeoutError:
+            pass
@@ -0,0 +1,131 @@
+"""
+Transactional outbox relaying job messages to the broker.
+
+Request handlers stage job messages in the ``job_outbox`` table within the
+transaction that creates their analysis sessions, so a job is queued if and
+only if its session is committed, and never wait on Redis themselves. The
+relay drains the outbox to Dramatiq in batches, one Redis round trip each.
+
+Delivery is at-least-once: a crash between enqueueing and deleting a batch
+re-sends it, which workers tolerate since claiming a session's lease only
+succeeds while it is queued.
+
+The relay runs in the API lifespan by default. To run it as a sidecar
+instead, disable ``OUTBOX_RELAY_ENABLED`` and run ``python -m app.services.outbox``.
+"""
+
+import asyncio
+from collections.abc import Iterable
+
+import dramatiq
+from loguru import logger
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.outbox import JobOutbox
+from app.services.job_queue import enqueue_many
+
+# Wakes the relay of this process as soon as new messages are committed
+_relay_wakeup: asyncio.Event | None = None
+
+
+async def stage_messages(db: AsyncSession, messages: Iterable[dramatiq.Message]) -> None:
+    """
+    Add job messages to the outbox in the current transaction.
+
+    Messages must carry the analysis session ID as their first argument.
+    Call :func:`notify_relay` once the transaction is committed.
+
+    Args:
+        db: Database session
+        messages: Messages to relay once the transaction commits
+    """
+    rows = [
+        {"session_id": message.args[0], "message": message.encode().decode()}
+        for message in messages
+    ]
+    if rows:
+        await db.execute(insert(JobOutbox), rows)
+
+
+async def count_staged_messages(db: AsyncSession) -> int:
+    """Count the messages waiting in the outbox to be relayed."""
+    result = await db.execute(select(func.count()).select_from(JobOutbox))
+    return result.scalar_one()
+
+
+def notify_relay() -> None:
+    """Wake the outbox relay of this process after staging messages."""
+    if _relay_wakeup is not None:
+        _relay_wakeup.set()
+
+
+async def relay_batch(db: AsyncSession, limit: int) -> int:
+    """
+    Enqueue one batch of outbox messages and delete them.
+
+    Rows are locked with ``SKIP LOCKED`` so several relays can run
+    concurrently without sending the same messages.
+
+    Args:
+        db: Database session
+        limit: Maximum number of messages to relay
+
+    Returns:
+        Number of messages relayed
+    """
+    result = await db.execute(
+        select(JobOutbox.id, JobOutbox.message)
+        .order_by(JobOutbox.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    rows = result.all()
+    if not rows:
+        await db.rollback()
+        return 0
+
+    messages = [dramatiq.Message.decode(row.message.encode()) for row in rows]
+    await asyncio.to_thread(enqueue_many, messages)
+
+    await db.execute(delete(JobOutbox).where(JobOutbox.id.in_([row.id for row in rows])))
+    await db.commit()
+    return len(rows)
+
+
+async def run_outbox_relay(stop: asyncio.Event) -> None:
+    """Relay outbox messages until ``stop`` is set."""
+    global _relay_wakeup
+    _relay_wakeup = wakeup_event = asyncio.Event()
+
+    logger.info(f"Outbox relay started (batch_size={settings.OUTBOX_BATCH_SIZE})")
+    while not stop.is_set():
+        wakeup_event.clear()
+        try:
+            async with AsyncSessionLocal() as db:
+                relayed = await relay_batch(db, settings.OUTBOX_BATCH_SIZE)
+        except Exception as e:
+            logger.error(f"Outbox relay pass failed: {e}")
+            relayed = 0
+
+        if relayed == settings.OUTBOX_BATCH_SIZE:
+            # More messages are likely waiting
+            continue
+        if relayed:
+            logger.debug(f"Outbox relay enqueued {relayed} messages")
+
+        wakeup = asyncio.create_task(wakeup_event.wait())
+        stopped = asyncio.create_task(stop.wait())
+        await asyncio.wait(
+            {wakeup, stopped},
+            timeout=settings.OUTBOX_POLL_INTERVAL_SECONDS,
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        wakeup.cancel()
+        stopped.cancel()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_outbox_relay(asyncio.Event()))
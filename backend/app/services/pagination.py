@@ -0,0 +1,130 @@
+"""
+Keyset pagination of analysis session listings.
+
+Pages are ordered by ``(created_at, id)``, newest first, and continue after
+an opaque cursor encoding the last session of the previous page. Unlike
+``OFFSET``, the cost of a page does not grow with its depth, and sessions
+created while paging do not shift later pages. The
+``ix_analysis_sessions_user_id_created_at_id`` index serves each page with
+a single range scan.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from sqlalchemy import desc, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import AnalysisSession, AnalysisStatus, Measurement
+
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+    def __init__(self, cursor: str) -> None:
+        super().__init__(f"Invalid cursor: {cursor}")
+        self.cursor = cursor
+
+
+def encode_cursor(created_at: datetime, session_id: int) -> str:
+    """Encode the position of a session as an opaque cursor."""
+    payload = json.dumps([created_at.isoformat(), session_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decode a cursor returned by :func:`encode_cursor`.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, session_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(session_id)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise InvalidCursorError(cursor) from e
+
+
+class SessionPage:
+    """One page of analysis sessions, with the measurements of completed ones."""
+
+    def __init__(
+        self,
+        sessions: list[AnalysisSession],
+        measurements: dict[int, Measurement],
+        has_next_page: bool,
+    ) -> None:
+        self.sessions = sessions
+        self.measurements = measurements
+        self.has_next_page = has_next_page
+
+    @property
+    def end_cursor(self) -> str | None:
+        """Cursor of the last session of the page."""
+        if not self.sessions:
+            return None
+        return session_cursor(self.sessions[-1])
+
+
+def session_cursor(session: AnalysisSession) -> str:
+    """Cursor pointing at a session."""
+    return encode_cursor(session.created_at, session.id)
+
+
+async def fetch_session_page(
+    db: AsyncSession,
+    user_id: int,
+    first: int = DEFAULT_PAGE_SIZE,
+    after: str | None = None,
+    status: AnalysisStatus | None = None,
+) -> SessionPage:
+    """
+    Fetch a page of a user's sessions, newest first.
+
+    Args:
+        db: Database session
+        user_id: Owner of the sessions
+        first: Page size, capped at ``MAX_PAGE_SIZE``
+        after: Cursor of the last session of the previous page
+        status: Only list sessions with this status
+
+    Returns:
+        The page, with the measurements of its completed sessions
+
+    Raises:
+        InvalidCursorError: If ``after`` is malformed
+    """
+    first = max(1, min(first, MAX_PAGE_SIZE))
+    query = select(AnalysisSession).where(AnalysisSession.user_id == user_id)
+    if status is not None:
+        query = query.where(AnalysisSession.status == status)
+    if after is not None:
+        created_at, session_id = decode_cursor(after)
+        query = query.where(
+            tuple_(AnalysisSession.created_at, AnalysisSession.id) < (created_at, session_id)
+        )
+
+    # One extra row tells whether another page follows
+    session_result = await db.execute(
+        query.order_by(desc(AnalysisSession.created_at), desc(AnalysisSession.id)).limit(first + 1)
+    )
+    sessions = list(session_result.scalars().all())
+    has_next_page = len(sessions) > first
+    sessions = sessions[:first]
+
+    completed = [s.id for s in sessions if s.status == AnalysisStatus.COMPLETED]
+    measurements: dict[int, Measurement] = {}
+    if completed:
+        measurement_result = await db.execute(
+            select(Measurement).where(Measurement.session_id.in_(completed))
+        )
+        measurements = {m.session_id: m for m in measurement_result.scalars().all()}
+
+    return SessionPage(sessions, measurements, has_next_page)
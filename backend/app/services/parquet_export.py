@@ -0,0 +1,276 @@
+"""
+Columnar Parquet exports of analysis sessions and their measurements.
+
+Rows are streamed from a server-side cursor and converted column by column
+straight into Arrow record batches of ``EXPORT_BATCH_SIZE`` rows, without
+building ORM, Pydantic or Strawberry objects. Batches are converted and
+written from a worker thread, so exports do not block the event loop.
+
+Incremental exports select sessions updated between the previous watermark
+and ``EXPORT_WATERMARK_LAG_SECONDS`` ago, and that upper bound becomes the
+next watermark. A session updated again after an export is exported again:
+the dataset then holds several rows for it, across part files, and readers
+keep the one with the latest ``updated_at``.
+
+pyarrow is an optional dependency (``pip install 'body-vision[parquet]'``)
+and is only imported when an export runs.
+"""
+
+import asyncio
+import enum
+import uuid
+from collections import defaultdict
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
+
+from loguru import logger
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import AnalysisSession, Measurement
+from app.services.status_cache import MEASUREMENT_FIELDS, isoformat_utc
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+# Exported columns with their Arrow type names, in output order
+PARQUET_COLUMNS = (
+    (AnalysisSession.id.label("session_id"), "int64"),
+    (AnalysisSession.job_id, "string"),
+    (AnalysisSession.user_id, "int64"),
+    (AnalysisSession.status, "string"),
+    (AnalysisSession.created_at, "timestamp"),
+    (AnalysisSession.completed_at, "timestamp"),
+    (AnalysisSession.updated_at, "timestamp"),
+    (AnalysisSession.height_cm, "float64"),
+    (AnalysisSession.weight_kg, "float64"),
+    (AnalysisSession.age, "int32"),
+    (AnalysisSession.gender, "string"),
+    (AnalysisSession.model_used, "string"),
+    (AnalysisSession.processing_time_seconds, "float64"),
+    *(
+        (getattr(Measurement, field), "string" if field == "mesh_url" else "float64")
+        for field in MEASUREMENT_FIELDS
+    ),
+)
+
+WATERMARK_FILE = "_watermark"
+
+
+class ParquetUnavailableError(RuntimeError):
+    """Raised when exporting to Parquet without pyarrow installed."""
+
+
+def _import_pyarrow() -> Any:
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise ParquetUnavailableError(
+            "Parquet exports require pyarrow: pip install 'body-vision[parquet]'"
+        ) from e
+    return pyarrow
+
+
+def arrow_schema() -> "pa.Schema":
+    """Arrow schema of session exports."""
+    pa = _import_pyarrow()
+    types = {
+        "int32": pa.int32(),
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "string": pa.string(),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+    }
+    return pa.schema([(column.key, types[type_name]) for column, type_name in PARQUET_COLUMNS])
+
+
+def session_export_query(
+    since: datetime | None = None, until: datetime | None = None
+) -> Select[Any]:
+    """
+    Build the query of a session export.
+
+    Sessions without measurements (failed, cancelled or still running) are
+    included with empty measurement columns.
+
+    Args:
+        since: Only export sessions updated after this watermark
+        until: Only export sessions updated at or before this time
+
+    Returns:
+        Query selecting ``PARQUET_COLUMNS`` in session order
+    """
+    query = (
+        select(*(column for column, _ in PARQUET_COLUMNS))
+        .outerjoin(Measurement, Measurement.session_id == AnalysisSession.id)
+        .order_by(AnalysisSession.id)
+    )
+    if since is not None:
+        query = query.where(AnalysisSession.updated_at > since)
+    if until is not None:
+        query = query.where(AnalysisSession.updated_at <= until)
+    return query
+
+
+def export_upper_bound(until: datetime | None = None) -> datetime:
+    """
+    Upper bound of an export, and watermark of the next one.
+
+    Sessions updated within ``EXPORT_WATERMARK_LAG_SECONDS`` are left out:
+    a transaction still open while exporting may commit later with an
+    earlier ``updated_at``, which an export resuming after the greatest
+    exported ``updated_at`` would never select.
+
+    Args:
+        until: Requested upper bound, if any, in UTC when naive
+
+    Returns:
+        The requested bound, capped to the lagged current time
+    """
+    bound = datetime.now(timezone.utc) - timedelta(seconds=settings.EXPORT_WATERMARK_LAG_SECONDS)
+    if until is None:
+        return bound
+    if until.tzinfo is None:
+        until = until.replace(tzinfo=timezone.utc)
+    return min(until, bound)
+
+
+def rows_to_record_batch(rows: Sequence[Any], schema: "pa.Schema") -> "pa.RecordBatch":
+    """Convert fetched rows to an Arrow record batch, one column at a time."""
+    pa = _import_pyarrow()
+    arrays = []
+    for field, values in zip(schema, zip(*rows, strict=True), strict=True):
+        column: Sequence[Any] = values
+        if field.type == pa.string():
+            column = [value.value if isinstance(value, enum.Enum) else value for value in values]
+        arrays.append(pa.array(column, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _write_rows(writer: Any, rows: Sequence[Any], schema: "pa.Schema") -> None:
+    writer.write_batch(rows_to_record_batch(rows, schema))
+
+
+def _month(created_at: datetime) -> str:
+    return f"{created_at.year:04d}-{created_at.month:02d}"
+
+
+class ParquetExportResult:
+    """Summary of a Parquet export."""
+
+    def __init__(self, watermark: datetime) -> None:
+        self.rows = 0
+        self.files: list[Path] = []
+        # Upper bound of the export, to resume the next incremental export
+        self.watermark = watermark
+
+    def add(self, rows: Sequence[Any]) -> None:
+        """Account for a batch of exported rows."""
+        self.rows += len(rows)
+
+
+async def export_sessions_to_parquet(
+    db: AsyncSession,
+    output_dir: Path,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> ParquetExportResult:
+    """
+    Export sessions to Parquet files partitioned by month of creation.
+
+    Files are written as ``created_month=YYYY-MM/part-<run>.parquet``, so
+    successive incremental exports add files next to earlier ones; a
+    session updated between two exports appears in both.
+
+    Args:
+        db: Database session
+        output_dir: Root directory of the dataset
+        since: Watermark of the previous export, if incremental
+        until: Upper bound of the export, capped by ``export_upper_bound``
+
+    Returns:
+        Number of rows and files written, and the new watermark
+    """
+    pa = _import_pyarrow()
+    schema = arrow_schema()
+    run_id = uuid.uuid4().hex[:12]
+    writers: dict[str, Any] = {}
+    until = export_upper_bound(until)
+    result = ParquetExportResult(until)
+
+    try:
+        stream = await db.stream(
+            session_export_query(since, until).execution_options(
+                yield_per=settings.EXPORT_BATCH_SIZE
+            )
+        )
+        async for rows in stream.partitions():
+            by_month: dict[str, list[Any]] = defaultdict(list)
+            for row in rows:
+                by_month[_month(row.created_at)].append(row)
+
+            for month, month_rows in by_month.items():
+                writer = writers.get(month)
+                if writer is None:
+                    path = output_dir / f"created_month={month}" / f"part-{run_id}.parquet"
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    writer = writers[month] = pa.parquet.ParquetWriter(path, schema)
+                    result.files.append(path)
+                await asyncio.to_thread(_write_rows, writer, month_rows, schema)
+            result.add(rows)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    logger.info(f"Exported {result.rows} sessions to {len(result.files)} Parquet files")
+    return result
+
+
+async def export_sessions_to_parquet_file(
+    db: AsyncSession,
+    sink: IO[bytes],
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> ParquetExportResult:
+    """
+    Export sessions to a single Parquet file, e.g. for a download.
+
+    Args:
+        db: Database session
+        sink: Binary file to write to
+        since: Only export sessions updated after this watermark
+        until: Upper bound of the export, capped by ``export_upper_bound``
+
+    Returns:
+        Number of rows written and the new watermark
+    """
+    pa = _import_pyarrow()
+    schema = arrow_schema()
+    until = export_upper_bound(until)
+    result = ParquetExportResult(until)
+
+    stream = await db.stream(
+        session_export_query(since, until).execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+    )
+    with pa.parquet.ParquetWriter(sink, schema) as writer:
+        async for rows in stream.partitions():
+            await asyncio.to_thread(_write_rows, writer, rows, schema)
+            result.add(rows)
+    return result
+
+
+def read_watermark(output_dir: Path) -> datetime | None:
+    """Read the watermark left by the last export into a directory, if any."""
+    path = output_dir / WATERMARK_FILE
+    if not path.exists():
+        return None
+    return datetime.fromisoformat(path.read_text().strip())
+
+
+def write_watermark(output_dir: Path, watermark: datetime) -> None:
+    """Record the watermark of a completed export into a directory."""
+    (output_dir / WATERMARK_FILE).write_text(f"{isoformat_utc(watermark)}\n")
@@ -0,0 +1,45 @@
+"""Redis and job queue statistics."""
+
+from typing import Any
+
+from dramatiq.common import dq_name
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.services.job_queue import BODY_ANALYSIS_QUEUE
+
+# Key prefixes used by Dramatiq's RedisBroker and RedisBackend defaults
+BROKER_NAMESPACE = "dramatiq"
+RESULTS_NAMESPACE = "dramatiq-results"
+
+
+def queue_key(queue_name: str = BODY_ANALYSIS_QUEUE) -> str:
+    """Redis list holding the message IDs of a Dramatiq queue."""
+    return f"{BROKER_NAMESPACE}:{queue_name}"
+
+
+def delay_queue_key(queue_name: str = BODY_ANALYSIS_QUEUE) -> str:
+    """Redis list holding the messages Dramatiq delays before a retry."""
+    return queue_key(dq_name(queue_name))
+
+
+async def redis_memory_report() -> dict[str, Any]:
+    """
+    Summarize Redis memory usage and what the job queue accounts for.
+
+    Returns:
+        Dictionary with server memory figures and the memory used by the
+        analysis queue's message hash
+    """
+    client = get_redis()
+    info = await client.info("memory")
+    queue_messages_bytes = await client.memory_usage(f"{queue_key()}.msgs")
+
+    return {
+        "used_memory_bytes": info["used_memory"],
+        "used_memory_peak_bytes": info["used_memory_peak"],
+        "max_memory_bytes": info.get("maxmemory") or None,
+        "fragmentation_ratio": info.get("mem_fragmentation_ratio"),
+        "queue_messages_bytes": queue_messages_bytes or 0,
+        "result_storage": settings.RESULT_STORAGE,
+    }
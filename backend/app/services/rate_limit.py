@@ -0,0 +1,279 @@
+"""
+Per-user token bucket rate limiting in Redis.
+
+Every limited endpoint has a bucket per client, holding up to the
+endpoint's request count and refilled at that count per period. Users get
+a multiple of the endpoint limits according to their tier. A check runs
+one Lua script, which refills and debits all buckets involved atomically
+using the Redis clock, so API processes share limits without coordinating.
+
+Limits are configured as ``"<requests>/<period>"`` in ``RATE_LIMITS``.
+Endpoints without an entry are not limited, and limiting fails open when
+Redis cannot be reached.
+
+Per-user limits and tiers are keyed by the email a request names, which is
+not authenticated: a client sending another user's email gets that user's
+tier and uses up that user's limits. Tiers raise limits for trusted
+integrations, not for protection against abuse; anonymous limits by address
+still apply to uploads and GraphQL.
+
+Anonymous clients are identified by address. Behind a reverse proxy, list it
+in ``RATE_LIMIT_TRUSTED_PROXIES`` so that clients are identified by the
+``X-Forwarded-For`` header it sets rather than all sharing its address.
+"""
+
+import hashlib
+import ipaddress
+import math
+from collections.abc import Awaitable, Mapping
+from functools import lru_cache
+from typing import Any, cast
+
+from fastapi import HTTPException, Request, Response, status
+from loguru import logger
+
+from app.core.config import settings
+from app.core.redis import get_redis
+
+RATE_LIMIT_KEY_PREFIX = "bodyvision:ratelimit:"
+
+PERIOD_SECONDS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# Refill and debit several token buckets, all or nothing.
+# KEYS: bucket keys. ARGV: capacity, refill rate per second and cost of each
+# bucket, in order. Returns whether the request is allowed, the seconds to
+# wait until it would be, and the tokens left in each bucket.
+TOKEN_BUCKET_SCRIPT = """
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local allowed = 1
+local wait = 0
+local tokens = {}
+
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 3 - 2])
+    local rate = tonumber(ARGV[i * 3 - 1])
+    local cost = tonumber(ARGV[i * 3])
+    local bucket = redis.call("HMGET", key, "tokens", "ts")
+    local available = capacity
+    if bucket[1] then
+        local elapsed = math.max(0, now - tonumber(bucket[2]))
+        available = math.min(capacity, tonumber(bucket[1]) + elapsed * rate)
+    end
+    if available < cost then
+        allowed = 0
+        wait = math.max(wait, (cost - available) / rate)
+    end
+    tokens[i] = available
+end
+
+local result = {allowed, tostring(wait)}
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 3 - 2])
+    local rate = tonumber(ARGV[i * 3 - 1])
+    if allowed == 1 then
+        tokens[i] = tokens[i] - tonumber(ARGV[i * 3])
+        redis.call("HSET", key, "tokens", tostring(tokens[i]), "ts", tostring(now))
+        -- A bucket left alone until full is the same as no bucket
+        redis.call("PEXPIRE", key, math.ceil((capacity - tokens[i]) / rate * 1000) + 1000)
+    end
+    result[i + 2] = tostring(tokens[i])
+end
+return result
+"""
+
+
+class RateLimit:
+    """Token bucket parameters of one endpoint for one tier."""
+
+    def __init__(self, requests: float, period_seconds: int) -> None:
+        self.capacity = requests
+        self.refill_rate = requests / period_seconds
+
+
+class RateLimitResult:
+    """Outcome of a rate limit check, for the most constrained bucket."""
+
+    def __init__(
+        self, allowed: bool, limit: int, remaining: int, reset_seconds: int, retry_after: int
+    ) -> None:
+        self.allowed = allowed
+        self.limit = limit
+        self.remaining = remaining
+        self.reset_seconds = reset_seconds
+        self.retry_after = retry_after
+
+    def headers(self) -> dict[str, str]:
+        """Rate limit headers to send with the response."""
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(self.reset_seconds),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(self.retry_after)
+        return headers
+
+
+def parse_rate(value: str) -> tuple[int, int]:
+    """
+    Parse a rate such as ``"30/minute"``.
+
+    Returns:
+        Number of requests and period in seconds
+
+    Raises:
+        ValueError: If the rate is malformed
+    """
+    try:
+        requests, period = value.split("/")
+        count, seconds = int(requests), PERIOD_SECONDS[period.strip()]
+    except (ValueError, KeyError) as e:
+        raise ValueError(
+            f"Invalid rate limit {value!r}, expected '<requests>/<second|minute|hour|day>'"
+        ) from e
+    if count <= 0:
+        raise ValueError(f"Invalid rate limit {value!r}, expected at least one request")
+    return count, seconds
+
+
+def user_tier(identity: str) -> str:
+    """Tier of a client, as configured in ``RATE_LIMIT_USER_TIERS``."""
+    return settings.RATE_LIMIT_USER_TIERS.get(identity, settings.RATE_LIMIT_DEFAULT_TIER)
+
+
+def endpoint_limit(endpoint: str, tier: str) -> RateLimit | None:
+    """
+    Limit of an endpoint for a tier.
+
+    Returns:
+        The limit, or None if the endpoint is not limited
+    """
+    rate = settings.RATE_LIMITS.get(endpoint)
+    if rate is None:
+        return None
+    requests, period = parse_rate(rate)
+    return RateLimit(requests * settings.RATE_LIMIT_TIERS.get(tier, 1.0), period)
+
+
+def rate_limit_key(endpoint: str, identity: str) -> str:
+    """Redis key of the token bucket of a client for an endpoint."""
+    digest = hashlib.sha256(identity.encode()).hexdigest()[:32]
+    return f"{RATE_LIMIT_KEY_PREFIX}{endpoint}:{digest}"
+
+
+@lru_cache
+def _proxy_networks(
+    proxies: tuple[str, ...],
+) -> tuple[ipaddress.IPv4Network | ipaddress.IPv6Network, ...]:
+    return tuple(ipaddress.ip_network(proxy, strict=False) for proxy in proxies)
+
+
+def is_trusted_proxy(host: str) -> bool:
+    """Check whether an address belongs to ``RATE_LIMIT_TRUSTED_PROXIES``."""
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    networks = _proxy_networks(tuple(settings.RATE_LIMIT_TRUSTED_PROXIES))
+    return any(address in network for network in networks)
+
+
+def client_identity(request: Request | None) -> str:
+    """
+    Identify an anonymous client by its address.
+
+    Requests from trusted proxies are attributed to the last address of
+    ``X-Forwarded-For`` that was not added by a trusted proxy. The header is
+    ignored on other requests, since clients can set it to anything.
+    """
+    if request is None or request.client is None:
+        return "unknown"
+
+    host = request.client.host
+    if not is_trusted_proxy(host):
+        return host
+    forwarded = ",".join(request.headers.getlist("x-forwarded-for"))
+    for hop in reversed(forwarded.split(",")):
+        hop = hop.strip()
+        if not hop:
+            continue
+        host = hop
+        if not is_trusted_proxy(hop):
+            break
+    return host
+
+
+async def check_rate_limit(endpoint: str, costs: Mapping[str, int]) -> RateLimitResult | None:
+    """
+    Debit the buckets of one or more clients for a request.
+
+    The request is allowed only if every client has enough tokens, in which
+    case all buckets are debited; otherwise none is.
+
+    Args:
+        endpoint: Endpoint name, as used in ``RATE_LIMITS``
+        costs: Tokens to take per client identity (email or address)
+
+    Returns:
+        The outcome, or None if the endpoint is not limited or Redis failed
+    """
+    if not settings.RATE_LIMIT_ENABLED or not costs:
+        return None
+
+    keys = []
+    args: list[str] = []
+    limits = []
+    for identity, cost in costs.items():
+        limit = endpoint_limit(endpoint, user_tier(identity))
+        if limit is None:
+            return None
+        keys.append(rate_limit_key(endpoint, identity))
+        args.extend((str(limit.capacity), str(limit.refill_rate), str(cost)))
+        limits.append(limit)
+
+    try:
+        reply = await cast(
+            Awaitable[list[Any]],
+            get_redis().eval(TOKEN_BUCKET_SCRIPT, len(keys), *keys, *args),
+        )
+        allowed, wait, *tokens = reply
+    except Exception as e:
+        logger.warning(f"Rate limiting unavailable for {endpoint}: {e}")
+        return None
+
+    # Report the bucket with the fewest tokens left
+    left, limit = min(zip((float(t) for t in tokens), limits, strict=True), key=lambda x: x[0])
+    return RateLimitResult(
+        allowed=bool(allowed),
+        limit=math.floor(limit.capacity),
+        remaining=max(0, math.floor(left)),
+        reset_seconds=math.ceil((limit.capacity - left) / limit.refill_rate),
+        retry_after=max(1, math.ceil(float(wait))),
+    )
+
+
+async def enforce_rate_limit(endpoint: str, costs: Mapping[str, int], response: Response) -> None:
+    """
+    Check a REST request against its rate limit.
+
+    Args:
+        endpoint: Endpoint name, as used in ``RATE_LIMITS``
+        costs: Tokens to take per client identity
+        response: Outgoing response, to add the rate limit headers to
+
+    Raises:
+        HTTPException: 429 with ``Retry-After`` if the limit is exceeded
+    """
+    result = await check_rate_limit(endpoint, costs)
+    if result is None:
+        return
+
+    if not result.allowed:
+        logger.warning(f"Rate limit exceeded on {endpoint}")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Rate limit exceeded, retry in {result.retry_after}s",
+            headers=result.headers(),
+        )
+    response.headers.update(result.headers())
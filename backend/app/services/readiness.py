@@ -0,0 +1,152 @@
+"""
+Readiness probe of the API's dependencies.
+
+The report times a database round trip and a Redis ping, reads the depth of
+the job queue and its delay queue, and counts the connections checked out of
+each pool. The API is ready while both probes succeed under
+``READY_MAX_DB_LATENCY_MS`` and ``READY_MAX_REDIS_LATENCY_MS``; queue depth
+is reported for autoscalers but never makes the API unready, since a busy
+queue is a reason to add workers, not to stop accepting requests.
+
+Reports are reused for ``READY_CACHE_SECONDS``, and concurrent probes wait
+for the check in flight, so the dependencies see at most one probe per
+process per interval however often load balancers poll.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import get_engine
+from app.core.redis import get_redis
+from app.services.queue_stats import delay_queue_key, queue_key
+
+
+class ProbeResult:
+    """Outcome of one dependency probe."""
+
+    def __init__(self, latency_ms: float | None, error: str | None = None) -> None:
+        self.latency_ms = latency_ms
+        self.error = error
+
+    def ok(self, max_latency_ms: float) -> bool:
+        """Whether the probe succeeded within the latency budget."""
+        return (
+            self.error is None
+            and self.latency_ms is not None
+            and (self.latency_ms <= max_latency_ms)
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"latency_ms": self.latency_ms, "error": self.error}
+
+
+async def _probe(name: str, check: Callable[[], Awaitable[Any]]) -> ProbeResult:
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(check(), timeout=settings.READY_PROBE_TIMEOUT_SECONDS)
+    except Exception as e:
+        logger.warning(f"Readiness probe of {name} failed: {e!r}")
+        return ProbeResult(None, error=type(e).__name__)
+    return ProbeResult(round((time.perf_counter() - start) * 1000, 2))
+
+
+async def _ping_database() -> None:
+    async with get_engine().connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def _queue_depths() -> dict[str, int] | None:
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.llen(queue_key())
+        pipe.llen(delay_queue_key())
+        depth, delayed = await asyncio.wait_for(
+            pipe.execute(), timeout=settings.READY_PROBE_TIMEOUT_SECONDS
+        )
+    except Exception as e:
+        logger.warning(f"Failed to read the job queue depth: {e!r}")
+        return None
+    return {"depth": depth, "delayed": delayed}
+
+
+def _pool_usage() -> dict[str, int | None]:
+    # Pools without a fixed size (NullPool, StaticPool) do not count connections
+    pool = get_engine().pool
+    checkedout = getattr(pool, "checkedout", None)
+    size = getattr(pool, "size", None)
+    # redis-py exposes no public counter for connections in use
+    redis_in_use = getattr(get_redis().connection_pool, "_in_use_connections", None)
+    return {
+        "database_checked_out": checkedout() if checkedout else None,
+        "database_size": size() if size else None,
+        "redis_in_use": len(redis_in_use) if redis_in_use is not None else None,
+    }
+
+
+class ReadinessReport:
+    """Dependency health of one API process."""
+
+    def __init__(
+        self,
+        database: ProbeResult,
+        redis: ProbeResult,
+        queue: dict[str, int] | None,
+        pools: dict[str, int | None],
+    ) -> None:
+        self.database = database
+        self.redis = redis
+        self.queue = queue
+        self.pools = pools
+        self.checked_at = time.time()
+
+    @property
+    def ready(self) -> bool:
+        """Whether load balancers should route traffic to this process."""
+        return self.database.ok(settings.READY_MAX_DB_LATENCY_MS) and self.redis.ok(
+            settings.READY_MAX_REDIS_LATENCY_MS
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "status": "ready" if self.ready else "unavailable",
+            "checked_at": self.checked_at,
+            "database": self.database.to_dict(),
+            "redis": self.redis.to_dict(),
+            "queue": self.queue,
+            "pools": self.pools,
+        }
+
+
+async def check_readiness() -> ReadinessReport:
+    """Probe the database, Redis and the job queue concurrently."""
+    database, redis, queue = await asyncio.gather(
+        _probe("database", _ping_database),
+        _probe("redis", get_redis().ping),
+        _queue_depths(),
+    )
+    return ReadinessReport(database, redis, queue, _pool_usage())
+
+
+_cached: ReadinessReport | None = None
+_lock = asyncio.Lock()
+
+
+async def readiness() -> ReadinessReport:
+    """
+    Get the readiness of this process, probing at most once per interval.
+
+    Returns:
+        The cached report if it is younger than ``READY_CACHE_SECONDS``,
+        otherwise a fresh one
+    """
+    global _cached
+    async with _lock:
+        if _cached is None or time.time() - _cached.checked_at >= settings.READY_CACHE_SECONDS:
+            _cached = await check_readiness()
+        return _cached
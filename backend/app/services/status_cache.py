@@ -0,0 +1,235 @@
+"""
+Redis cache of job status responses, and their HTTP validators.
+
+Workers and the API write the status of a job through to Redis on every
+transition, so status lookups are normally served without touching the
+database. Entries of finished jobs never change and are kept longer, and
+HTTP caches may keep them indefinitely.
+
+Writes from workers and the API are not ordered, so a write never replaces
+a finished status: a worker's late ``processing`` write cannot hide that
+the API cancelled the job.
+"""
+
+import hashlib
+import json
+from collections.abc import Awaitable
+from datetime import datetime, timezone
+from typing import Any, cast
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.redis import get_redis, get_sync_redis
+from app.models import AnalysisSession, AnalysisStatus, Measurement
+from app.services.job_events import TERMINAL_STATUSES
+
+STATUS_KEY_PREFIX = "bodyvision:job:status:"
+
+# Set a cached status unless the entry holds a finished status, or exists at
+# all when only filling a missing entry.
+# KEYS: status key. ARGV: payload, TTL in seconds, "1" to only fill a missing
+# entry, then the terminal status values. Returns whether the entry was set.
+SET_STATUS_SCRIPT = """
+local current = redis.call("GET", KEYS[1])
+if current then
+    if ARGV[3] == "1" then
+        return 0
+    end
+    local status = cjson.decode(current)["status"]
+    for i = 4, #ARGV do
+        if status == ARGV[i] then
+            return 0
+        end
+    end
+end
+redis.call("SET", KEYS[1], ARGV[1], "EX", ARGV[2])
+return 1
+"""
+
+_TERMINAL_STATUS_VALUES = tuple(status.value for status in TERMINAL_STATUSES)
+
+MEASUREMENT_FIELDS = (
+    "body_fat_percentage",
+    "body_volume_liters",
+    "body_density_kg_per_liter",
+    "lean_mass_kg",
+    "fat_mass_kg",
+    "mesh_url",
+    "confidence_score",
+)
+
+
+def status_key(job_id: str) -> str:
+    """Redis key holding the cached status of a job."""
+    return f"{STATUS_KEY_PREFIX}{job_id}"
+
+
+def isoformat_utc(value: datetime | None) -> str | None:
+    """Format a database timestamp as ISO 8601, treating naive values as UTC."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        # SQLite returns naive datetimes
+        value = value.replace(tzinfo=timezone.utc)
+    return value.isoformat()
+
+
+def job_status(session: Any, measurement: Any | None = None) -> dict[str, Any]:
+    """
+    Build the status payload of a job.
+
+    The payload has the fields of ``JobStatusResponse`` plus ``updated_at``,
+    the time of the last transition.
+
+    Args:
+        session: Analysis session, or a row with the same attributes
+        measurement: Measurement of a completed session, or a row with the
+            same attributes
+
+    Returns:
+        JSON-serializable status payload
+    """
+    last_transition = session.completed_at or session.started_at or session.created_at
+    return {
+        "job_id": session.job_id,
+        "session_id": session.id,
+        "status": session.status.value,
+        "created_at": isoformat_utc(session.created_at),
+        "started_at": isoformat_utc(session.started_at),
+        "completed_at": isoformat_utc(session.completed_at),
+        "processing_time_seconds": session.processing_time_seconds,
+        "model_used": session.model_used,
+        "error_message": session.error_message,
+        "measurements": (
+            {field: getattr(measurement, field) for field in MEASUREMENT_FIELDS}
+            if measurement is not None and session.status == AnalysisStatus.COMPLETED
+            else None
+        ),
+        "updated_at": isoformat_utc(last_transition),
+    }
+
+
+def is_terminal_status(status: dict[str, Any]) -> bool:
+    """Check whether a status payload is final and will never change."""
+    return AnalysisStatus(status["status"]) in TERMINAL_STATUSES
+
+
+def status_etag(status: dict[str, Any]) -> str:
+    """
+    Strong ETag of a status payload.
+
+    The payload only changes on status transitions, so the status and the
+    time of the last transition identify it.
+    """
+    digest = hashlib.sha256(f"{status['status']}|{status['updated_at']}".encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def status_cache_control(status: dict[str, Any]) -> str:
+    """
+    Cache-Control header for a status payload.
+
+    Finished statuses never change, but hold the user's measurements, so
+    only the client may cache them.
+    """
+    if is_terminal_status(status):
+        return f"private, max-age={settings.JOB_RESULT_MAX_AGE_SECONDS}, immutable"
+    return "no-cache"
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an ``If-None-Match`` header against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (candidate.strip().removeprefix("W/") for candidate in if_none_match.split(","))
+    return etag in candidates
+
+
+async def load_job_status(db: AsyncSession, job_id: str) -> dict[str, Any] | None:
+    """
+    Read the status payload of a job from the database.
+
+    Uses a single outer join selecting only the columns of the payload.
+
+    Returns:
+        The payload, or None if the job does not exist
+    """
+    result = await db.execute(
+        select(
+            AnalysisSession.id,
+            AnalysisSession.job_id,
+            AnalysisSession.status,
+            AnalysisSession.created_at,
+            AnalysisSession.started_at,
+            AnalysisSession.completed_at,
+            AnalysisSession.processing_time_seconds,
+            AnalysisSession.model_used,
+            AnalysisSession.error_message,
+            Measurement.id.label("measurement_id"),
+            *(getattr(Measurement, field) for field in MEASUREMENT_FIELDS),
+        )
+        .outerjoin(Measurement, Measurement.session_id == AnalysisSession.id)
+        .where(AnalysisSession.job_id == job_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+    return job_status(row, row if row.measurement_id is not None else None)
+
+
+def _set_status_args(status: dict[str, Any], only_if_missing: bool) -> list[Any]:
+    ttl = (
+        settings.STATUS_CACHE_TERMINAL_TTL_SECONDS
+        if is_terminal_status(status)
+        else settings.STATUS_CACHE_TTL_SECONDS
+    )
+    return [
+        SET_STATUS_SCRIPT,
+        1,
+        status_key(status["job_id"]),
+        json.dumps(status, separators=(",", ":")),
+        ttl,
+        "1" if only_if_missing else "0",
+        *_TERMINAL_STATUS_VALUES,
+    ]
+
+
+async def get_cached_job_status(job_id: str) -> dict[str, Any] | None:
+    """Read the cached status payload of a job, if any."""
+    try:
+        cached = await get_redis().get(status_key(job_id))
+    except Exception as e:
+        logger.warning(f"Failed to read cached status of job {job_id}: {e}")
+        return None
+    return json.loads(cached) if cached else None
+
+
+async def cache_job_status(status: dict[str, Any], only_if_missing: bool = False) -> None:
+    """
+    Write the status payload of a job to the cache from the API.
+
+    A cached finished status is never replaced.
+
+    Args:
+        status: Status payload
+        only_if_missing: Leave an existing entry alone. Used when filling the
+            cache after a database read, which must not overwrite a newer
+            status written through by a worker in the meantime
+    """
+    try:
+        await cast(Awaitable[int], get_redis().eval(*_set_status_args(status, only_if_missing)))
+    except Exception as e:
+        logger.warning(f"Failed to cache status of job {status['job_id']}: {e}")
+
+
+def cache_job_status_sync(status: dict[str, Any]) -> None:
+    """Write the status payload of a job through to the cache from a worker."""
+    try:
+        get_sync_redis().eval(*_set_status_args(status, only_if_missing=False))
+    except Exception as e:
+        logger.warning(f"Failed to cache status of job {status['job_id']}: {e}")
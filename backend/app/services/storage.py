@@ -0,0 +1,367 @@
+"""
+Content-addressed object storage for images and meshes.
+
+Objects are keyed by the SHA-256 of their content, computed while they are
+written, so identical uploads are stored once. ``STORAGE_BACKEND`` selects
+where they live:
+
+- ``local``: files under ``STORAGE_DIR``, sharded in two levels of
+  directories by the first characters of the key
+- ``supabase``: the ``SUPABASE_STORAGE_BUCKET`` bucket
+
+Whatever the backend, the number of references to each object is counted
+in the ``stored_objects`` table. A writer takes a reference before placing
+its object, and the object is deleted when the last reference is released.
+Records hold their objects as ``<scheme>://<key>`` URLs.
+"""
+
+import asyncio
+import hashlib
+import mmap
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import IO
+
+from fastapi import Response
+from fastapi.responses import FileResponse, RedirectResponse
+from loguru import logger
+from sqlalchemy import delete, update
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, dialect_insert
+from app.models.storage import StoredObjectRecord
+
+
+class ObjectTooLargeError(ValueError):
+    """Raised when an object exceeds the size allowed by its writer."""
+
+    def __init__(self, max_bytes: int) -> None:
+        super().__init__(f"Object exceeds {max_bytes} bytes")
+        self.max_bytes = max_bytes
+
+
+class StoredObject:
+    """Object written to storage."""
+
+    def __init__(self, key: str, size: int, content_type: str, created: bool) -> None:
+        self.key = key
+        self.size = size
+        self.content_type = content_type
+        # False when identical content was already stored
+        self.created = created
+
+
+class ObjectWriter:
+    """
+    Streams one object to a local temporary file, hashing it on the fly.
+
+    Chunks are buffered up to ``UPLOAD_CHUNK_SIZE`` bytes and written from a
+    worker thread, so memory use does not depend on the object size and the
+    event loop never waits on the disk.
+    """
+
+    def __init__(self, storage: "ObjectStorage", content_type: str, max_bytes: int) -> None:
+        self.storage = storage
+        self.content_type = content_type
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._buffer = bytearray()
+        self._file: IO[bytes] | None = None
+
+    async def write(self, chunk: bytes) -> None:
+        """
+        Append a chunk to the object.
+
+        Raises:
+            ObjectTooLargeError: If the object grows over ``max_bytes``
+        """
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise ObjectTooLargeError(self.max_bytes)
+        self._hash.update(chunk)
+        self._buffer.extend(chunk)
+        if len(self._buffer) >= settings.UPLOAD_CHUNK_SIZE:
+            await self._flush()
+
+    async def _flush(self) -> None:
+        if self._file is None:
+            self._file = await asyncio.to_thread(self.storage.temporary_file)
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        await asyncio.to_thread(self._file.write, data)
+
+    async def commit(self) -> StoredObject:
+        """
+        Take a reference to the object and move it to its key.
+
+        The caller owns the reference and must release it if the object ends
+        up unused.
+        """
+        await self._flush()
+        assert self._file is not None
+        key = self._hash.hexdigest()
+        # Referencing first makes a concurrent release of the same content
+        # wait, instead of deleting the object this writer relies on
+        await self.storage.acquire(key, self.size, self.content_type)
+        try:
+            created = await asyncio.to_thread(
+                self.storage.store_file, self._file, key, self.content_type
+            )
+        except Exception:
+            await self.storage.release([key])
+            raise
+        finally:
+            await asyncio.to_thread(self.storage.discard_file, self._file)
+            self._file = None
+        return StoredObject(key, self.size, self.content_type, created)
+
+    async def abort(self) -> None:
+        """Discard the partially written object."""
+        if self._file is not None:
+            await asyncio.to_thread(self.storage.discard_file, self._file)
+            self._file = None
+
+
+class ObjectStorage(ABC):
+    """Content-addressed object storage with reference counting."""
+
+    scheme: str
+
+    def __init__(self, tmp_dir: Path) -> None:
+        self.tmp_dir = tmp_dir
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+
+    def writer(self, content_type: str, max_bytes: int) -> ObjectWriter:
+        """Start writing an object of at most ``max_bytes``."""
+        return ObjectWriter(self, content_type, max_bytes)
+
+    def url(self, key: str) -> str:
+        """URL referencing a stored object from database records."""
+        return f"{self.scheme}://{key}"
+
+    def key_from_url(self, url: str) -> str | None:
+        """Key of the object a URL references, if it belongs to this storage."""
+        prefix = f"{self.scheme}://"
+        return url.removeprefix(prefix) if url.startswith(prefix) else None
+
+    def temporary_file(self) -> IO[bytes]:
+        # Temporary files live next to the objects so local commits are renames
+        return tempfile.NamedTemporaryFile(dir=self.tmp_dir, delete=False)
+
+    def discard_file(self, file: IO[bytes]) -> None:
+        file.close()
+        Path(file.name).unlink(missing_ok=True)
+
+    @abstractmethod
+    def store_file(self, file: IO[bytes], key: str, content_type: str) -> bool:
+        """
+        Store a written temporary file under its key.
+
+        Returns:
+            False if the object was already stored
+        """
+
+    @abstractmethod
+    def delete_object(self, key: str) -> None:
+        """Delete an object, if it exists."""
+
+    @abstractmethod
+    @contextmanager
+    def open(self, key: str) -> Iterator[memoryview]:
+        """Read an object, without copying it where the backend allows."""
+
+    @abstractmethod
+    def response(self, key: str, content_type: str) -> Response:
+        """HTTP response serving an object."""
+
+    async def acquire(self, key: str, size: int, content_type: str) -> None:
+        """Take a reference to an object."""
+        async with AsyncSessionLocal() as db:
+            stmt = dialect_insert(db, StoredObjectRecord).values(
+                key=key, size=size, content_type=content_type, refcount=1
+            )
+            await db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[StoredObjectRecord.key],
+                    set_={"refcount": StoredObjectRecord.refcount + 1},
+                )
+            )
+            await db.commit()
+
+    async def release(self, keys: Iterable[str]) -> list[str]:
+        """
+        Release references to objects, deleting those left unreferenced.
+
+        References are released and committed first, so a failure never
+        leaves a referenced row pointing at a deleted object. Rows left at
+        zero are then deleted with their objects; if that fails, an
+        unreferenced row remains, which the next upload of the same
+        content takes over, storing the object again.
+
+        Args:
+            keys: Keys of the released objects, once per reference
+
+        Returns:
+            Keys of the deleted objects
+        """
+        released = Counter(keys)
+        unreferenced = []
+        async with AsyncSessionLocal() as db:
+            for key, count in released.items():
+                result = await db.execute(
+                    update(StoredObjectRecord)
+                    .where(StoredObjectRecord.key == key)
+                    .values(refcount=StoredObjectRecord.refcount - count)
+                    .returning(StoredObjectRecord.refcount)
+                )
+                remaining = result.scalar_one_or_none()
+                if remaining is not None and remaining <= 0:
+                    unreferenced.append(key)
+            await db.commit()
+
+        if not unreferenced:
+            return []
+
+        async with AsyncSessionLocal() as db:
+            # Objects referenced again in the meantime are kept
+            removed = await db.execute(
+                delete(StoredObjectRecord)
+                .where(
+                    StoredObjectRecord.key.in_(unreferenced),
+                    StoredObjectRecord.refcount <= 0,
+                )
+                .returning(StoredObjectRecord.key)
+            )
+            deleted = list(removed.scalars())
+            # Delete while the rows are locked: writers of the same content
+            # wait, then store it again
+            for key in deleted:
+                await asyncio.to_thread(self.delete_object, key)
+            await db.commit()
+
+        if deleted:
+            logger.info(f"Deleted {len(deleted)} unreferenced objects")
+        return deleted
+
+
+class LocalStorage(ObjectStorage):
+    """Object storage on the local filesystem."""
+
+    scheme = "local"
+
+    def __init__(self, root: Path) -> None:
+        super().__init__(root / "tmp")
+        self.root = root
+        self.objects_dir = root / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+
+    def path(self, key: str) -> Path:
+        """Path of a stored object, in directories sharded by key prefix."""
+        return self.objects_dir / key[:2] / key[2:4] / key
+
+    def store_file(self, file: IO[bytes], key: str, content_type: str) -> bool:
+        file.close()
+        target = self.path(key)
+        if target.exists():
+            return False
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(file.name, target)
+        return True
+
+    def delete_object(self, key: str) -> None:
+        self.path(key).unlink(missing_ok=True)
+
+    @contextmanager
+    def open(self, key: str) -> Iterator[memoryview]:
+        with open(self.path(key), "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                yield memoryview(b"")
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    yield view
+                finally:
+                    view.release()
+
+    def response(self, key: str, content_type: str) -> Response:
+        # Servers supporting the ASGI pathsend extension send the file with
+        # sendfile; others stream it from a thread
+        return FileResponse(self.path(key), media_type=content_type)
+
+
+class SupabaseStorage(ObjectStorage):
+    """Object storage in a Supabase Storage bucket."""
+
+    scheme = "supabase"
+
+    def __init__(self, tmp_dir: Path) -> None:
+        super().__init__(tmp_dir)
+        from supabase import create_client
+
+        client = create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_ROLE_KEY)
+        self.bucket = client.storage.from_(settings.SUPABASE_STORAGE_BUCKET)
+
+    def object_path(self, key: str) -> str:
+        """Path of an object in the bucket, sharded by key prefix."""
+        return f"{key[:2]}/{key}"
+
+    def store_file(self, file: IO[bytes], key: str, content_type: str) -> bool:
+        from storage3.exceptions import StorageApiError
+
+        file.close()
+        try:
+            self.bucket.upload(
+                self.object_path(key),
+                file.name,
+                {"content-type": content_type, "upsert": "false"},
+            )
+        except StorageApiError as e:
+            if str(e.status) == "409":
+                return False
+            raise
+        return True
+
+    def delete_object(self, key: str) -> None:
+        self.bucket.remove([self.object_path(key)])
+
+    @contextmanager
+    def open(self, key: str) -> Iterator[memoryview]:
+        yield memoryview(self.bucket.download(self.object_path(key)))
+
+    def response(self, key: str, content_type: str) -> Response:
+        # Clients download from Supabase directly instead of through the API
+        signed = self.bucket.create_signed_url(
+            self.object_path(key), settings.SUPABASE_SIGNED_URL_SECONDS
+        )
+        return RedirectResponse(signed["signedURL"])
+
+
+OBJECTS_PATH = "/api/objects"
+
+
+def fetchable_url(url: str) -> str:
+    """
+    URL clients can fetch an image or mesh from.
+
+    References to stored objects map to the objects endpoint; URLs given
+    by clients are returned unchanged.
+    """
+    key = get_storage().key_from_url(url)
+    return url if key is None else f"{OBJECTS_PATH}/{key}"
+
+
+@lru_cache
+def get_storage() -> ObjectStorage:
+    """Get the object storage configured by ``STORAGE_BACKEND``."""
+    root = Path(settings.STORAGE_DIR)
+    if settings.STORAGE_BACKEND == "supabase":
+        return SupabaseStorage(root / "tmp")
+    return LocalStorage(root)
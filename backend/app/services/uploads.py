@@ -0,0 +1,223 @@
+"""
+Streaming parser for multipart image uploads.
+
+The request body is fed to python-multipart's push parser as it arrives.
+File parts are written to object storage chunk by chunk while being hashed,
+and only the small form fields are kept in memory, so an upload never holds
+a whole image.
+"""
+
+from typing import TYPE_CHECKING, Literal
+
+from fastapi import Request, status
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+from app.core.config import settings
+from app.services.storage import ObjectStorage, ObjectTooLargeError, ObjectWriter, StoredObject
+
+if TYPE_CHECKING:
+    from python_multipart.multipart import MultipartCallbacks
+
+ALLOWED_IMAGE_TYPES = frozenset({"image/jpeg", "image/png", "image/webp"})
+MAX_FIELD_BYTES = 1024
+MAX_PARTS = 16
+
+
+class UploadError(Exception):
+    """Raised when an upload is malformed, with the HTTP status to answer."""
+
+    def __init__(self, status_code: int, detail: str) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class Upload:
+    """Form fields and stored files of a multipart upload."""
+
+    def __init__(
+        self, storage: ObjectStorage, fields: dict[str, str], files: dict[str, StoredObject]
+    ) -> None:
+        self.storage = storage
+        self.fields = fields
+        self.files = files
+
+    async def discard(self) -> None:
+        """Release the references the upload holds, deleting unused objects."""
+        if self.files:
+            await self.storage.release(stored.key for stored in self.files.values())
+            self.files = {}
+
+
+# Parser events: a part's headers, a chunk of its data, or its end
+_PartEvent = (
+    tuple[Literal["begin"], dict[bytes, bytes]]
+    | tuple[Literal["data"], bytes]
+    | tuple[Literal["end"], None]
+)
+
+
+class _PartEvents:
+    """Collects the synchronous callbacks of the parser as events."""
+
+    def __init__(self) -> None:
+        self.events: list[_PartEvent] = []
+        self._headers: dict[bytes, bytes] = {}
+        self._field = b""
+        self._value = b""
+
+    def on_part_begin(self) -> None:
+        self._headers = {}
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self._headers[self._field.lower()] = self._value
+        self._field = self._value = b""
+
+    def on_headers_finished(self) -> None:
+        self.events.append(("begin", self._headers))
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        self.events.append(("data", data[start:end]))
+
+    def on_part_end(self) -> None:
+        self.events.append(("end", None))
+
+    def callbacks(self) -> "MultipartCallbacks":
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        }
+
+
+async def receive_upload(
+    request: Request, storage: ObjectStorage, file_fields: tuple[str, ...]
+) -> Upload:
+    """
+    Stream a multipart upload, storing its files as they arrive.
+
+    Args:
+        request: Incoming request with a ``multipart/form-data`` body
+        storage: Storage the files are written to
+        file_fields: Names of the expected file parts, all required
+
+    Returns:
+        The upload's form fields and stored files
+
+    Raises:
+        UploadError: If the body is not a valid upload of the expected
+            images; files already stored by the upload are deleted
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type"))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise UploadError(
+            status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, "Expected a multipart/form-data body"
+        )
+
+    parts = _PartEvents()
+    parser = MultipartParser(boundary, parts.callbacks())
+    upload = Upload(storage, fields={}, files={})
+    name = ""
+    in_part = False
+    writer: ObjectWriter | None = None
+    value = bytearray()
+    part_count = 0
+
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            for event in parts.events:
+                if event[0] == "begin":
+                    part_count += 1
+                    if part_count > MAX_PARTS:
+                        raise UploadError(status.HTTP_422_UNPROCESSABLE_ENTITY, "Too many parts")
+                    name, writer = _begin_part(event[1], storage, file_fields, upload)
+                    in_part = True
+                    value.clear()
+                elif event[0] == "data":
+                    if writer is not None:
+                        await writer.write(event[1])
+                    else:
+                        value.extend(event[1])
+                        if len(value) > MAX_FIELD_BYTES:
+                            raise UploadError(
+                                status.HTTP_422_UNPROCESSABLE_ENTITY, f"Field {name} is too long"
+                            )
+                elif writer is not None:
+                    if writer.size == 0:
+                        raise UploadError(status.HTTP_422_UNPROCESSABLE_ENTITY, f"{name} is empty")
+                    upload.files[name] = await writer.commit()
+                    writer = None
+                    in_part = False
+                else:
+                    upload.fields[name] = value.decode()
+                    in_part = False
+            parts.events.clear()
+        parser.finalize()
+        # finalize() accepts a body cut off in the middle of a part
+        if in_part:
+            raise MultipartParseError(f"Body ends inside part {name}")
+    except ObjectTooLargeError as e:
+        await _abort(writer, upload)
+        raise UploadError(
+            status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, f"{name} exceeds {e.max_bytes} bytes"
+        ) from e
+    except MultipartParseError as e:
+        await _abort(writer, upload)
+        raise UploadError(status.HTTP_400_BAD_REQUEST, "Malformed multipart body") from e
+    except UnicodeDecodeError as e:
+        await _abort(writer, upload)
+        raise UploadError(status.HTTP_422_UNPROCESSABLE_ENTITY, "Form fields must be UTF-8") from e
+    except Exception:
+        await _abort(writer, upload)
+        raise
+
+    missing = [field for field in file_fields if field not in upload.files]
+    if missing:
+        await upload.discard()
+        raise UploadError(
+            status.HTTP_422_UNPROCESSABLE_ENTITY, f"Missing files: {', '.join(missing)}"
+        )
+    return upload
+
+
+def _begin_part(
+    headers: dict[bytes, bytes],
+    storage: ObjectStorage,
+    file_fields: tuple[str, ...],
+    upload: Upload,
+) -> tuple[str, ObjectWriter | None]:
+    _, options = parse_options_header(headers.get(b"content-disposition"))
+    name = options.get(b"name", b"").decode()
+    if name in upload.fields or name in upload.files:
+        raise UploadError(status.HTTP_422_UNPROCESSABLE_ENTITY, f"Duplicate field {name}")
+    if b"filename" not in options:
+        return name, None
+
+    if name not in file_fields:
+        raise UploadError(status.HTTP_422_UNPROCESSABLE_ENTITY, f"Unexpected file {name}")
+    content_type = headers.get(b"content-type", b"").decode()
+    if content_type not in ALLOWED_IMAGE_TYPES:
+        raise UploadError(
+            status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            f"{name} must be one of {', '.join(sorted(ALLOWED_IMAGE_TYPES))}",
+        )
+    return name, storage.writer(content_type, settings.UPLOAD_MAX_IMAGE_BYTES)
+
+
+async def _abort(writer: ObjectWriter | None, upload: Upload) -> None:
+    if writer is not None:
+        await writer.abort()
+    await upload.discard()
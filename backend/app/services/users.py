@@ -0,0 +1,164 @@
+"""User lookup and creation helpers shared by REST and GraphQL."""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import dialect_insert
+from app.models import User
+
+
+class UserIdCache:
+    """
+    Size-bounded, TTL'd LRU cache mapping user emails to user IDs.
+
+    Entries are evicted least-recently-used first once ``max_size`` is
+    reached, and ignored once older than ``ttl_seconds``.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, email: str) -> int | None:
+        """Get the cached user ID for an email, if fresh."""
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is None:
+                return None
+
+            user_id, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[email]
+                return None
+
+            self._entries.move_to_end(email)
+            return user_id
+
+    def set(self, email: str, user_id: int) -> None:
+        """Cache the user ID for an email."""
+        with self._lock:
+            self._entries[email] = (user_id, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(email)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, email: str) -> None:
+        """Forget the cached user ID for an email."""
+        with self._lock:
+            self._entries.pop(email, None)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Per-process cache shared by REST endpoints and GraphQL resolvers
+user_id_cache = UserIdCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+)
+
+
+async def get_user_id(db: AsyncSession, email: str) -> int | None:
+    """
+    Look up a user ID by email, using the in-process cache.
+
+    Args:
+        db: Database session
+        email: User email
+
+    Returns:
+        The user ID, or None if no user has this email
+    """
+    user_id = user_id_cache.get(email)
+    if user_id is not None:
+        return user_id
+
+    result = await db.execute(select(User.id).where(User.email == email))
+    user_id = result.scalar_one_or_none()
+    if user_id is not None:
+        user_id_cache.set(email, user_id)
+    return user_id
+
+
+async def get_or_create_user_id(db: AsyncSession, email: str) -> int:
+    """
+    Get the ID of the user with this email, creating the user if needed.
+
+    Uses a single ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING`` so that
+    concurrent requests for a new email cannot race, and skips the database
+    entirely on a cache hit. Callers rolling back the transaction must
+    ``user_id_cache.discard`` the email, as the user may not exist anymore.
+
+    Args:
+        db: Database session
+        email: User email
+
+    Returns:
+        The user ID
+    """
+    user_id = user_id_cache.get(email)
+    if user_id is not None:
+        return user_id
+
+    insert_stmt = dialect_insert(db, User).values(email=email, full_name=None, is_active=True)
+    result = await db.execute(
+        insert_stmt.on_conflict_do_update(
+            index_elements=[User.email],
+            # No-op update so RETURNING also yields existing rows
+            set_={"email": insert_stmt.excluded.email},
+        ).returning(User.id)
+    )
+    user_id = result.scalar_one()
+    user_id_cache.set(email, user_id)
+    return user_id
+
+
+async def bulk_upsert_users(db: AsyncSession, emails: Iterable[str]) -> dict[str, int]:
+    """
+    Create any missing users and return the IDs of all of them.
+
+    Args:
+        db: Database session
+        emails: Emails of the users to look up or create
+
+    Returns:
+        Mapping of email to user ID
+    """
+    user_ids: dict[str, int] = {}
+    missing = []
+    for email in sorted(set(emails)):
+        user_id = user_id_cache.get(email)
+        if user_id is None:
+            missing.append(email)
+        else:
+            user_ids[email] = user_id
+
+    if not missing:
+        return user_ids
+
+    insert_stmt = dialect_insert(db, User).values(
+        [{"email": email, "is_active": True} for email in missing]
+    )
+    result = await db.execute(
+        insert_stmt.on_conflict_do_update(
+            index_elements=[User.email],
+            # No-op update so RETURNING also yields existing rows, like in
+            # get_or_create_user_id
+            set_={"email": insert_stmt.excluded.email},
+        ).returning(User.email, User.id)
+    )
+    for email, new_id in result.tuples().all():
+        user_id_cache.set(email, new_id)
+        user_ids[email] = new_id
+
+    return user_ids
@@ -23,6 +23,8 @@ from app.models import (  # noqa: E402, F401
     Measurement,
     User,
 )
+from app.models.outbox import JobOutbox  # noqa: E402, F401
+from app.models.storage import StoredObjectRecord  # noqa: E402, F401
 
 # This is the Alembic Config object
 config = context.config
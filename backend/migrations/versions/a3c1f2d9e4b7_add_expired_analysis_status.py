@@ -0,0 +1,30 @@
+"""Add EXPIRED analysis status for jobs dropped after their deadline
+
+Revision ID: a3c1f2d9e4b7
+Revises: 5eea10b5f0bc
+Create Date: 2026-10-19 09:12:44.318204
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a3c1f2d9e4b7"
+down_revision: Union[str, None] = "5eea10b5f0bc"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Only PostgreSQL stores the enum as a native type
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE analysisstatus ADD VALUE IF NOT EXISTS 'EXPIRED'")
+
+
+def downgrade() -> None:
+    # PostgreSQL cannot drop a value from an enum type; move rows back instead
+    op.execute(sa.text("UPDATE analysis_sessions SET status = 'FAILED' WHERE status = 'EXPIRED'"))
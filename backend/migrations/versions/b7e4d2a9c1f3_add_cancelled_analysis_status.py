@@ -0,0 +1,30 @@
+"""Add CANCELLED analysis status for jobs cancelled by clients
+
+Revision ID: b7e4d2a9c1f3
+Revises: a3c1f2d9e4b7
+Create Date: 2026-10-19 10:03:17.845120
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e4d2a9c1f3"
+down_revision: Union[str, None] = "a3c1f2d9e4b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Only PostgreSQL stores the enum as a native type
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE analysisstatus ADD VALUE IF NOT EXISTS 'CANCELLED'")
+
+
+def downgrade() -> None:
+    # PostgreSQL cannot drop a value from an enum type; move rows back instead
+    op.execute(sa.text("UPDATE analysis_sessions SET status = 'FAILED' WHERE status = 'CANCELLED'"))
@@ -0,0 +1,58 @@
+"""Add job lease, heartbeat and deadline columns to analysis sessions
+
+Revision ID: c5a8e1f0d2b6
+Revises: b7e4d2a9c1f3
+Create Date: 2026-10-19 11:26:03.512877
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c5a8e1f0d2b6"
+down_revision: Union[str, None] = "b7e4d2a9c1f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "analysis_sessions", sa.Column("deadline_at", sa.DateTime(timezone=True), nullable=True)
+    )
+    op.add_column(
+        "analysis_sessions", sa.Column("lease_owner", sa.String(length=255), nullable=True)
+    )
+    op.add_column(
+        "analysis_sessions",
+        sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column(
+        "analysis_sessions", sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True)
+    )
+    op.add_column(
+        "analysis_sessions",
+        sa.Column("attempt_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    # Partial index so the reaper only scans running sessions, oldest lease first
+    op.create_index(
+        "ix_analysis_sessions_processing_lease_expires_at",
+        "analysis_sessions",
+        ["lease_expires_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'PROCESSING'"),
+        sqlite_where=sa.text("status = 'PROCESSING'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_analysis_sessions_processing_lease_expires_at", table_name="analysis_sessions"
+    )
+    op.drop_column("analysis_sessions", "attempt_count")
+    op.drop_column("analysis_sessions", "heartbeat_at")
+    op.drop_column("analysis_sessions", "lease_expires_at")
+    op.drop_column("analysis_sessions", "lease_owner")
+    op.drop_column("analysis_sessions", "deadline_at")
@@ -0,0 +1,52 @@
+"""Test admission control estimates."""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+from backend.app.core.config import settings
+from backend.app.services import admission
+from backend.app.services.admission import QueueEstimate, staged_message_count
+
+
+def test_wait_estimate_uses_recent_throughput() -> None:
+    """Test the wait is the queue depth drained at the recent throughput."""
+    assert QueueEstimate(depth=100, throughput=2.0).wait_seconds == 50
+
+
+def test_retry_after_covers_the_excess_wait() -> None:
+    """Test Retry-After is the time needed to get back under the limit."""
+    limit = settings.ADMISSION_MAX_WAIT_SECONDS
+    estimate = QueueEstimate(depth=(limit + 120) * 2, throughput=2.0)
+
+    assert estimate.retry_after_seconds == 120
+    assert QueueEstimate(depth=limit, throughput=1.0).retry_after_seconds == 1
+
+
+def test_staged_message_count_is_cached(monkeypatch) -> None:
+    """Test submissions share one outbox count per interval."""
+    counts = iter([3, 5])
+    queries = []
+
+    @asynccontextmanager
+    async def session():
+        yield None
+
+    async def count_staged_messages(db) -> int:
+        queries.append(db)
+        return next(counts)
+
+    monkeypatch.setattr(admission, "AsyncSessionLocal", session)
+    monkeypatch.setattr(admission, "count_staged_messages", count_staged_messages)
+    monkeypatch.setattr(admission, "_staged_count", None)
+
+    async def submit() -> None:
+        counts = await asyncio.gather(*(staged_message_count() for _ in range(10)))
+        assert counts == [3] * 10
+        assert len(queries) == 1
+
+        # Once expired, the next submission counts again
+        admission._staged_count = (3, 0.0)
+        assert await staged_message_count() == 5
+        assert len(queries) == 2
+
+    asyncio.run(submit())
@@ -0,0 +1,37 @@
+"""Test the Dramatiq broker configuration."""
+
+import pytest
+from dramatiq.results import Results
+
+from backend.app.core import broker
+
+
+@pytest.fixture
+def create_broker(monkeypatch):
+    """Create brokers without replacing Dramatiq's global broker."""
+    monkeypatch.setattr(broker.dramatiq, "set_broker", lambda created: None)
+
+    def create(result_storage: str):
+        monkeypatch.setattr(broker.settings, "RESULT_STORAGE", result_storage)
+        return broker._create_broker()
+
+    return create
+
+
+def _results_middleware(created) -> list[Results]:
+    return [m for m in created.middleware if isinstance(m, Results)]
+
+
+def test_db_result_storage_keeps_no_results_in_redis(create_broker) -> None:
+    """Test the default storage installs no result backend."""
+    assert _results_middleware(create_broker("db")) == []
+
+
+def test_status_result_storage_keeps_codes_in_redis(create_broker, monkeypatch) -> None:
+    """Test status storage installs a result backend with the configured TTL."""
+    monkeypatch.setattr(broker.settings, "RESULT_TTL_SECONDS", 60)
+
+    [results] = _results_middleware(create_broker("status"))
+
+    assert results.store_results
+    assert results.result_ttl == 60_000
@@ -0,0 +1,58 @@
+"""Test the command line interface."""
+
+import pytest
+from typer.testing import CliRunner
+
+from backend.app import cli
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def uvicorn_runs(monkeypatch) -> list[dict]:
+    """Record the options the server would be started with."""
+    runs: list[dict] = []
+    monkeypatch.setattr(cli.uvicorn, "run", lambda app, **options: runs.append(options))
+    return runs
+
+
+def test_serve_passes_options_to_uvicorn(uvicorn_runs, monkeypatch) -> None:
+    """Test command line options reach uvicorn, with the faster loop when installed."""
+    monkeypatch.setattr(cli, "_installed", lambda module: True)
+
+    result = runner.invoke(
+        cli.app,
+        [
+            "serve",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            "9000",
+            "--workers",
+            "2",
+            "--max-requests",
+            "50",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    [options] = uvicorn_runs
+    assert options["host"] == "127.0.0.1"
+    assert options["port"] == 9000
+    assert options["workers"] == 2
+    assert options["limit_max_requests"] == 50
+    assert (options["loop"], options["http"]) == ("uvloop", "httptools")
+    assert options["log_level"] == cli.settings.LOG_LEVEL.lower()
+
+
+def test_serve_defaults(uvicorn_runs, monkeypatch) -> None:
+    """Test settings provide the defaults and 0 disables worker recycling."""
+    monkeypatch.setattr(cli, "_installed", lambda module: False)
+
+    result = runner.invoke(cli.app, ["serve", "--max-requests", "0"])
+
+    assert result.exit_code == 0, result.output
+    [options] = uvicorn_runs
+    assert options["workers"] == cli.settings.WORKERS
+    assert options["limit_max_requests"] is None
+    assert (options["loop"], options["http"]) == ("asyncio", "h11")
@@ -0,0 +1,41 @@
+"""Test measurement export encoders."""
+
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+from backend.app.services.export import EXPORT_FIELDNAMES, csv_header, encode_csv, encode_ndjson
+
+
+def make_row(measurement_id: int) -> tuple:
+    """Build an export row with a value for every column."""
+    values = {
+        "measurement_id": measurement_id,
+        "session_id": measurement_id,
+        "job_id": f"job-{measurement_id}",
+        "email": "a@example.com",
+        "measured_at": datetime(2025, 1, 1, tzinfo=timezone.utc),
+        "mesh_url": None,
+    }
+    return tuple(values.get(name, 1.5) for name in EXPORT_FIELDNAMES)
+
+
+def test_encode_ndjson() -> None:
+    """Test each row becomes one JSON object per line."""
+    lines = encode_ndjson([make_row(1), make_row(2)]).splitlines()
+
+    assert len(lines) == 2
+    record = json.loads(lines[1])
+    assert record["measurement_id"] == 2
+    assert record["measured_at"] == "2025-01-01T00:00:00+00:00"
+    assert record["mesh_url"] is None
+
+
+def test_encode_csv() -> None:
+    """Test CSV chunks line up with the header."""
+    text = csv_header() + encode_csv([make_row(1)]) + encode_csv([make_row(2)])
+    records = list(csv.DictReader(io.StringIO(text)))
+
+    assert [record["job_id"] for record in records] == ["job-1", "job-2"]
+    assert records[0]["mesh_url"] == ""
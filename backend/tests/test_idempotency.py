@@ -0,0 +1,29 @@
+"""Test idempotency key helpers."""
+
+from pydantic import BaseModel
+
+from backend.app.services.idempotency import idempotency_redis_key, request_fingerprint
+
+
+class Body(BaseModel):
+    """Minimal request body."""
+
+    email: str
+    age: int
+
+
+def test_idempotency_keys_are_scoped_to_users() -> None:
+    """Test the same key sent by different users maps to different entries."""
+    key = idempotency_redis_key("a@example.com", "retry-1")
+
+    assert key == idempotency_redis_key("a@example.com", "retry-1")
+    assert key != idempotency_redis_key("b@example.com", "retry-1")
+    assert key != idempotency_redis_key("a@example.com", "retry-2")
+
+
+def test_request_fingerprint_detects_different_bodies() -> None:
+    """Test only identical request bodies share a fingerprint."""
+    fingerprint = request_fingerprint(Body(email="a@example.com", age=30))
+
+    assert fingerprint == request_fingerprint(Body(email="a@example.com", age=30))
+    assert fingerprint != request_fingerprint(Body(email="a@example.com", age=31))
@@ -0,0 +1,116 @@
+"""Test job cancellation against a database and Redis."""
+
+import asyncio
+import importlib
+from pathlib import Path
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from backend.app.services import job_control
+from backend.app.services.job_control import JobNotCancellableError, cancel_job, is_cancelled
+from backend.app.services.leases import claim_lease, finish_leased_job
+
+# The models as imported by the services
+models = importlib.import_module(job_control.AnalysisSession.__module__)
+AnalysisStatus = models.AnalysisStatus
+
+
+def _database(root: Path) -> async_sessionmaker:
+    """SQLite database with the session tables."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{root / 'jobs.db'}", poolclass=NullPool)
+
+    async def create_tables() -> None:
+        async with engine.begin() as conn:
+            await conn.run_sync(models.Base.metadata.create_all)
+
+    asyncio.run(create_tables())
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+async def _add_session(db, job_id: str, status) -> int:
+    """Store an analysis session and return its ID."""
+    session = models.AnalysisSession(
+        user_id=1,
+        job_id=job_id,
+        status=status,
+        front_image_url="front",
+        side_image_url="side",
+        back_image_url="back",
+        height_cm=180.0,
+        weight_kg=80.0,
+        age=30,
+        gender=models.Gender.MALE,
+    )
+    db.add(session)
+    await db.commit()
+    return session.id
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    """Shared in-memory Redis for the API and worker clients."""
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(job_control, "get_redis", lambda: fakeredis.FakeAsyncRedis(server=server))
+    monkeypatch.setattr(job_control, "get_sync_redis", lambda: fakeredis.FakeRedis(server=server))
+    monkeypatch.setattr(job_control, "cache_job_status", _ignore)
+    monkeypatch.setattr(job_control, "publish_job_event_async", _ignore)
+    return server
+
+
+async def _ignore(*args) -> None:
+    pass
+
+
+def test_cancel_queued_job_flags_workers(tmp_path: Path, redis) -> None:
+    """Test cancelling marks the session and sets the flag workers check."""
+    sessions = _database(tmp_path)
+
+    async def scenario() -> None:
+        async with sessions() as db:
+            await _add_session(db, "job-1", AnalysisStatus.QUEUED)
+            cancelled = await cancel_job(db, "job-1")
+            assert cancelled.status == AnalysisStatus.CANCELLED
+            assert await cancel_job(db, "missing") is None
+
+    asyncio.run(scenario())
+    assert is_cancelled("job-1")
+    assert not is_cancelled("job-2")
+
+
+def test_cancel_racing_with_completion(tmp_path: Path, redis) -> None:
+    """Test whichever of cancellation and completion lands first wins."""
+    sessions = _database(tmp_path)
+
+    async def scenario() -> None:
+        async with sessions() as db:
+            # Cancelled while running: the worker cannot complete it
+            cancelled_id = await _add_session(db, "job-1", AnalysisStatus.QUEUED)
+            await claim_lease(db, cancelled_id, "worker-1")
+            await cancel_job(db, "job-1")
+            assert (
+                await finish_leased_job(
+                    db, cancelled_id, "worker-1", status=AnalysisStatus.COMPLETED
+                )
+                is None
+            )
+            await db.rollback()
+            assert (await db.get(models.AnalysisSession, cancelled_id)).status == (
+                AnalysisStatus.CANCELLED
+            )
+
+            # Completed first: the cancellation is refused
+            completed_id = await _add_session(db, "job-2", AnalysisStatus.QUEUED)
+            await claim_lease(db, completed_id, "worker-1")
+            assert await finish_leased_job(
+                db, completed_id, "worker-1", status=AnalysisStatus.COMPLETED
+            )
+            await db.commit()
+            with pytest.raises(JobNotCancellableError) as exc_info:
+                await cancel_job(db, "job-2")
+            assert exc_info.value.status == AnalysisStatus.COMPLETED
+
+    asyncio.run(scenario())
+    assert not is_cancelled("job-2")
@@ -0,0 +1,171 @@
+"""Test job status event helpers."""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from types import SimpleNamespace
+from typing import Any
+
+from backend.app.core.config import settings
+from backend.app.services import job_events
+from backend.app.services.job_events import (
+    TERMINAL_STATUSES,
+    JobEventHub,
+    JobEventSubscription,
+    is_terminal_event,
+    iter_job_events,
+    job_channel,
+)
+
+
+class FakePubSub:
+    """In-memory stand-in for a Redis pattern subscription."""
+
+    def __init__(self) -> None:
+        self.patterns: list[str] = []
+        self.messages: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        self.closed = False
+
+    async def psubscribe(self, pattern: str) -> None:
+        self.patterns.append(pattern)
+
+    async def listen(self) -> AsyncIterator[dict[str, Any]]:
+        while True:
+            yield await self.messages.get()
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+    def publish(self, job_id: str, status: str) -> None:
+        event = {"job_id": job_id, "user_id": 1, "status": status}
+        self.messages.put_nowait({"type": "pmessage", "data": json.dumps(event)})
+
+
+def test_job_channel_is_per_job() -> None:
+    """Test each job gets its own pub/sub channel."""
+    assert job_channel("job-1") != job_channel("job-2")
+    assert job_channel("job-1").endswith("job-1")
+
+
+def test_is_terminal_event() -> None:
+    """Test only finished jobs end status streams."""
+    assert not is_terminal_event({"status": "queued"})
+    assert not is_terminal_event({"status": "processing"})
+    for status in TERMINAL_STATUSES:
+        assert is_terminal_event({"status": status.value})
+
+
+def test_hub_dispatches_by_job_and_user() -> None:
+    """Test the hub only delivers events to matching subscribers."""
+    hub = JobEventHub()
+    # Register subscribers directly to avoid starting the Redis listener
+    job_subscription = JobEventSubscription(hub, "job-1", None)
+    user_subscription = JobEventSubscription(hub, None, 7)
+    hub._subscriptions.update({job_subscription, user_subscription})
+
+    hub._dispatch({"job_id": "job-1", "user_id": 7, "status": "processing"})
+    hub._dispatch({"job_id": "job-2", "user_id": 7, "status": "processing"})
+    hub._dispatch({"job_id": "job-3", "user_id": 8, "status": "processing"})
+
+    assert job_subscription.queue.qsize() == 1
+    assert user_subscription.queue.qsize() == 2
+
+    job_subscription.close()
+    assert job_subscription not in hub._subscriptions
+
+
+def test_subscription_drops_oldest_events_when_full() -> None:
+    """Test a lagging subscriber keeps the most recent events."""
+    subscription = JobEventSubscription(JobEventHub(), "job-1", None)
+    for i in range(settings.JOB_EVENTS_QUEUE_SIZE + 1):
+        subscription.put({"job_id": "job-1", "user_id": 1, "status": str(i)})
+
+    assert subscription.queue.qsize() == settings.JOB_EVENTS_QUEUE_SIZE
+    assert subscription.queue.get_nowait()["status"] == "1"
+
+
+async def test_iter_job_events_follows_job_until_terminal(monkeypatch) -> None:
+    """Test a job stream yields each transition once and ends on completion."""
+    pubsub = FakePubSub()
+    monkeypatch.setattr(job_events, "get_redis", lambda: SimpleNamespace(pubsub=lambda: pubsub))
+    hub = JobEventHub()
+    subscription = await hub.subscribe(job_id="job-1")
+    assert pubsub.patterns == [f"{job_events.JOB_CHANNEL_PREFIX}*"]
+
+    # Published before the current status was read, then delivered again
+    pubsub.publish("job-1", "queued")
+    pubsub.publish("job-2", "processing")
+    pubsub.publish("job-1", "processing")
+    pubsub.publish("job-1", "completed")
+    pubsub.publish("job-1", "failed")
+
+    current = {"job_id": "job-1", "user_id": 1, "status": "queued"}
+    events = [event async for event in iter_job_events(subscription, current)]
+
+    assert [event["status"] for event in events if event] == ["queued", "processing", "completed"]
+    assert subscription not in hub._subscriptions
+
+    await hub.close()
+    assert pubsub.closed
+
+
+async def test_iter_job_events_never_goes_backwards(monkeypatch) -> None:
+    """Test transitions delivered after a newer current status are dropped."""
+    pubsub = FakePubSub()
+    monkeypatch.setattr(job_events, "get_redis", lambda: SimpleNamespace(pubsub=lambda: pubsub))
+    hub = JobEventHub()
+    subscription = await hub.subscribe(job_id="job-1")
+
+    pubsub.publish("job-1", "queued")
+    pubsub.publish("job-1", "processing")
+    pubsub.publish("job-1", "queued")
+    pubsub.publish("job-1", "cancelled")
+
+    current = {"job_id": "job-1", "user_id": 1, "status": "processing"}
+    events = [event async for event in iter_job_events(subscription, current)]
+
+    assert [event["status"] for event in events if event] == ["processing", "cancelled"]
+    assert subscription not in hub._subscriptions
+
+    await hub.close()
+    assert pubsub.closed
+
+
+def test_subscription_matches_its_job_or_user() -> None:
+    """Test job subscribers ignore the user, and user subscribers any job of theirs."""
+    hub = JobEventHub()
+    job_subscription = JobEventSubscription(hub, "job-1", 7)
+    user_subscription = JobEventSubscription(hub, None, 7)
+
+    assert job_subscription.matches({"job_id": "job-1", "user_id": 8}) is True
+    assert job_subscription.matches({"job_id": "job-2", "user_id": 7}) is False
+    assert user_subscription.matches({"job_id": "job-2", "user_id": 7}) is True
+    assert user_subscription.matches({"job_id": "job-2", "user_id": 8}) is False
+    assert user_subscription.matches({"job_id": "job-2", "user_id": None}) is False
+
+
+async def test_subscribers_share_one_listener(monkeypatch) -> None:
+    """Test concurrent subscribers use one Redis subscription and get their own events."""
+    pubsubs: list[FakePubSub] = []
+
+    def pubsub() -> FakePubSub:
+        pubsubs.append(FakePubSub())
+        return pubsubs[-1]
+
+    monkeypatch.setattr(job_events, "get_redis", lambda: SimpleNamespace(pubsub=pubsub))
+    hub = JobEventHub()
+    job_subscription, user_subscription, other_subscription = await asyncio.gather(
+        hub.subscribe(job_id="job-1"),
+        hub.subscribe(user_id=1),
+        hub.subscribe(job_id="job-2"),
+    )
+    assert len(pubsubs) == 1
+
+    pubsubs[0].publish("job-1", "processing")
+
+    assert (await job_subscription.get(timeout=1))["job_id"] == "job-1"
+    assert (await user_subscription.get(timeout=1))["job_id"] == "job-1"
+    assert await other_subscription.get(timeout=0.05) is None
+
+    await hub.close()
+    assert pubsubs[0].closed
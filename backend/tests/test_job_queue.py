@@ -0,0 +1,64 @@
+"""Test job message helpers."""
+
+from datetime import datetime, timedelta, timezone
+
+import dramatiq
+import pytest
+from dramatiq.brokers.redis import RedisBroker
+
+from backend.app.core.config import settings
+from backend.app.services import job_queue
+from backend.app.services.job_queue import (
+    BODY_ANALYSIS_QUEUE,
+    BODY_ANALYSIS_TASK,
+    build_analysis_message,
+    compute_deadline,
+)
+
+
+def test_compute_deadline_uses_server_default() -> None:
+    """Test the server default applies when no deadline is given."""
+    before = datetime.now(timezone.utc)
+    deadline = compute_deadline()
+    expected = before + timedelta(seconds=settings.JOB_DEFAULT_DEADLINE_SECONDS)
+    assert abs((deadline - expected).total_seconds()) < 5
+
+
+def test_compute_deadline_is_capped() -> None:
+    """Test client deadlines cannot exceed the configured maximum."""
+    before = datetime.now(timezone.utc)
+    deadline = compute_deadline(settings.JOB_MAX_DEADLINE_SECONDS * 10)
+    assert deadline - before <= timedelta(seconds=settings.JOB_MAX_DEADLINE_SECONDS + 5)
+
+
+def test_build_analysis_message_carries_deadline() -> None:
+    """Test the deadline and job ID travel in the message options."""
+    deadline_at = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    message = build_analysis_message(42, "job-123", deadline_at)
+
+    assert message.actor_name == BODY_ANALYSIS_TASK
+    assert message.args == (42,)
+    assert message.options["job_id"] == "job-123"
+    assert message.options["deadline"] == int(deadline_at.timestamp() * 1000)
+
+
+def test_enqueue_many_matches_broker_enqueue(monkeypatch) -> None:
+    """Test pipelined messages land in Redis like regular enqueues."""
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    broker = RedisBroker(client=fakeredis.FakeRedis())
+    monkeypatch.setattr(job_queue, "get_broker", lambda: broker)
+
+    deadline_at = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    messages = [build_analysis_message(i, f"job-{i}", deadline_at) for i in range(3)]
+    enqueued = job_queue.enqueue_many(messages)
+    broker.enqueue(build_analysis_message(3, "job-3", deadline_at))
+
+    queue_key = f"{broker.namespace}:{BODY_ANALYSIS_QUEUE}"
+    redis_ids = [m.options["redis_message_id"] for m in enqueued]
+    assert [i.decode() for i in broker.client.lrange(queue_key, 0, 2)] == redis_ids
+    assert broker.client.hlen(f"{queue_key}.msgs") == 4
+
+    stored = dramatiq.Message.decode(broker.client.hget(f"{queue_key}.msgs", redis_ids[0]))
+    assert stored.args == (0,)
+    assert stored.options["job_id"] == "job-0"
@@ -0,0 +1,154 @@
+"""Test job leases and the stuck-job reaper against a database."""
+
+import asyncio
+import importlib
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from backend.app.services import leases
+from backend.app.services.leases import (
+    claim_lease,
+    finish_leased_job,
+    reap_expired_leases,
+    renew_lease,
+)
+
+# The models as imported by the services
+models = importlib.import_module(leases.AnalysisSession.__module__)
+AnalysisSession = models.AnalysisSession
+AnalysisStatus = models.AnalysisStatus
+JobOutbox = importlib.import_module(leases.stage_messages.__module__).JobOutbox
+
+
+@pytest.fixture
+def sessions(tmp_path: Path, monkeypatch) -> async_sessionmaker:
+    """SQLite database with the session and outbox tables."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}", poolclass=NullPool)
+
+    async def create_tables() -> None:
+        async with engine.begin() as conn:
+            await conn.run_sync(models.Base.metadata.create_all)
+
+    asyncio.run(create_tables())
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    monkeypatch.setattr(leases, "AsyncSessionLocal", factory)
+    monkeypatch.setattr(leases, "cache_job_status", _ignore)
+    monkeypatch.setattr(leases, "publish_job_event_async", _ignore)
+    return factory
+
+
+async def _ignore(*args) -> None:
+    pass
+
+
+async def _add_session(db, job_id: str, **values) -> int:
+    """Store a queued analysis session and return its ID."""
+    session = AnalysisSession(
+        user_id=1,
+        job_id=job_id,
+        status=AnalysisStatus.QUEUED,
+        front_image_url="front",
+        side_image_url="side",
+        back_image_url="back",
+        height_cm=180.0,
+        weight_kg=80.0,
+        age=30,
+        gender=models.Gender.MALE,
+        **values,
+    )
+    db.add(session)
+    await db.commit()
+    return session.id
+
+
+async def _expire_lease(db, session_id: int) -> None:
+    """Make a lease look abandoned by its worker."""
+    expired = datetime.now(timezone.utc) - timedelta(minutes=1)
+    await db.execute(
+        update(AnalysisSession)
+        .where(AnalysisSession.id == session_id)
+        .values(lease_expires_at=expired)
+    )
+    await db.commit()
+
+
+def test_only_the_owner_renews_and_finishes(sessions) -> None:
+    """Test a lease is claimed once and only its owner can use it."""
+
+    async def scenario() -> None:
+        async with sessions() as db:
+            session_id = await _add_session(db, "job-1")
+            claimed = await claim_lease(db, session_id, "worker-1")
+            assert claimed.status == AnalysisStatus.PROCESSING
+            assert claimed.attempt_count == 1
+            assert await claim_lease(db, session_id, "worker-2") is None
+
+            assert await renew_lease(session_id, "worker-1")
+            assert not await renew_lease(session_id, "worker-2")
+
+            values = {"status": AnalysisStatus.COMPLETED}
+            assert await finish_leased_job(db, session_id, "worker-2", **values) is None
+            finished = await finish_leased_job(db, session_id, "worker-1", **values)
+            await db.commit()
+            assert finished.status == AnalysisStatus.COMPLETED
+            assert finished.lease_owner is None
+            assert not await renew_lease(session_id, "worker-1")
+
+    asyncio.run(scenario())
+
+
+def test_expired_lease_is_requeued_and_reclaimed(sessions) -> None:
+    """Test the reaper re-queues an abandoned job for another worker."""
+
+    async def scenario() -> None:
+        async with sessions() as db:
+            deadline_at = datetime.now(timezone.utc) + timedelta(hours=1)
+            session_id = await _add_session(db, "job-1", deadline_at=deadline_at)
+            running_id = await _add_session(db, "job-2", deadline_at=deadline_at)
+            await claim_lease(db, session_id, "worker-1")
+            await claim_lease(db, running_id, "worker-2")
+            await _expire_lease(db, session_id)
+
+            assert await reap_expired_leases(db, limit=10) == (1, 0)
+            staged = (await db.execute(select(JobOutbox.session_id))).scalars().all()
+            assert staged == [session_id]
+
+            reclaimed = await claim_lease(db, session_id, "worker-3")
+            assert reclaimed.attempt_count == 2
+            # The first worker wakes up too late to complete the job
+            values = {"status": AnalysisStatus.COMPLETED}
+            assert await finish_leased_job(db, session_id, "worker-1", **values) is None
+            assert await finish_leased_job(db, session_id, "worker-3", **values)
+            await db.commit()
+
+            running = await db.get(AnalysisSession, running_id)
+            assert running.status == AnalysisStatus.PROCESSING
+            assert running.lease_owner == "worker-2"
+
+    asyncio.run(scenario())
+
+
+def test_reaper_finishes_exhausted_and_late_jobs(sessions, monkeypatch) -> None:
+    """Test jobs out of attempts fail and jobs past their deadline expire."""
+    monkeypatch.setattr(leases.settings, "JOB_MAX_ATTEMPTS", 2)
+
+    async def scenario() -> None:
+        async with sessions() as db:
+            late = datetime.now(timezone.utc) - timedelta(seconds=1)
+            exhausted_id = await _add_session(db, "job-1", attempt_count=1)
+            late_id = await _add_session(db, "job-2", deadline_at=late)
+            for session_id in (exhausted_id, late_id):
+                await claim_lease(db, session_id, "worker-1")
+                await _expire_lease(db, session_id)
+
+            assert await reap_expired_leases(db, limit=10) == (0, 2)
+            assert (await db.get(AnalysisSession, exhausted_id)).status == AnalysisStatus.FAILED
+            assert (await db.get(AnalysisSession, late_id)).status == AnalysisStatus.EXPIRED
+            assert (await db.execute(select(JobOutbox.id))).first() is None
+
+    asyncio.run(scenario())
@@ -0,0 +1,99 @@
+"""Test the transactional outbox against a database."""
+
+import asyncio
+import importlib
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from backend.app.services import outbox
+from backend.app.services.job_queue import build_analysis_message
+from backend.app.services.outbox import count_staged_messages, relay_batch, stage_messages
+
+# The models as imported by the services
+models = importlib.import_module(outbox.JobOutbox.__module__)
+
+
+@pytest.fixture
+def sessions(tmp_path: Path) -> async_sessionmaker:
+    """SQLite database with the outbox table."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}", poolclass=NullPool)
+
+    async def create_tables() -> None:
+        async with engine.begin() as conn:
+            await conn.run_sync(models.Base.metadata.create_all)
+
+    asyncio.run(create_tables())
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+def _messages(count: int) -> list:
+    deadline = datetime.now(timezone.utc) + timedelta(hours=1)
+    return [build_analysis_message(i, f"job-{i}", deadline) for i in range(1, count + 1)]
+
+
+def test_relay_sends_each_message_once(sessions, monkeypatch) -> None:
+    """Test batches drain the outbox in order without sending a message twice."""
+    enqueued: list = []
+    monkeypatch.setattr(outbox, "enqueue_many", enqueued.extend)
+    messages = _messages(5)
+
+    async def scenario() -> list[int]:
+        async with sessions() as db:
+            await stage_messages(db, messages)
+            await db.commit()
+            assert await count_staged_messages(db) == 5
+
+        relayed = []
+        while True:
+            async with sessions() as db:
+                count = await relay_batch(db, limit=2)
+            if not count:
+                break
+            relayed.append(count)
+
+        async with sessions() as db:
+            assert await count_staged_messages(db) == 0
+        return relayed
+
+    assert asyncio.run(scenario()) == [2, 2, 1]
+    assert [m.message_id for m in enqueued] == [m.message_id for m in messages]
+    assert [m.args for m in enqueued] == [m.args for m in messages]
+
+
+def test_failed_enqueue_keeps_messages(sessions, monkeypatch) -> None:
+    """Test messages stay staged when the broker cannot be reached."""
+
+    def unavailable(messages) -> None:
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(outbox, "enqueue_many", unavailable)
+
+    async def scenario() -> int:
+        async with sessions() as db:
+            await stage_messages(db, _messages(3))
+            await db.commit()
+
+        with pytest.raises(ConnectionError):
+            async with sessions() as db:
+                await relay_batch(db, limit=10)
+
+        async with sessions() as db:
+            return await count_staged_messages(db)
+
+    assert asyncio.run(scenario()) == 3
+
+
+def test_staging_nothing_is_a_no_op(sessions) -> None:
+    """Test empty batches neither stage nor relay anything."""
+
+    async def scenario() -> tuple[int, int]:
+        async with sessions() as db:
+            await stage_messages(db, [])
+            await db.commit()
+            return await count_staged_messages(db), await relay_batch(db, limit=10)
+
+    assert asyncio.run(scenario()) == (0, 0)
@@ -0,0 +1,23 @@
+"""Test keyset pagination cursors."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from backend.app.services.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip() -> None:
+    """Test a cursor decodes to the position it encodes."""
+    created_at = datetime(2025, 1, 1, 12, 0, 0, 123456, tzinfo=timezone.utc)
+    cursor = encode_cursor(created_at, 42)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", "bm90IGpzb24", "WzFd"])
+def test_invalid_cursor(cursor: str) -> None:
+    """Test malformed cursors are rejected."""
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
@@ -0,0 +1,65 @@
+"""Test Parquet export conversion."""
+
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backend.app.services import parquet_export
+from backend.app.services.parquet_export import (
+    PARQUET_COLUMNS,
+    arrow_schema,
+    export_upper_bound,
+    read_watermark,
+    rows_to_record_batch,
+    write_watermark,
+)
+
+Row = namedtuple("Row", [column.key for column, _ in PARQUET_COLUMNS])
+
+
+def make_row(session_id: int, updated_at: datetime) -> Row:
+    """Build an export row of a session without measurement."""
+    values = dict.fromkeys(Row._fields)
+    values.update(
+        session_id=session_id,
+        job_id=f"job-{session_id}",
+        user_id=1,
+        status="queued",
+        created_at=updated_at,
+        updated_at=updated_at,
+    )
+    return Row(**values)
+
+
+def test_upper_bound_lags_behind_now(monkeypatch) -> None:
+    """Test exports leave out recent updates, which may still be committing."""
+    monkeypatch.setattr(parquet_export.settings, "EXPORT_WATERMARK_LAG_SECONDS", 60)
+    past = datetime(2025, 1, 1)
+
+    bound = export_upper_bound()
+    future = export_upper_bound(datetime.now(timezone.utc) + timedelta(days=1))
+
+    assert datetime.now(timezone.utc) - bound >= timedelta(seconds=60)
+    assert datetime.now(timezone.utc) - future >= timedelta(seconds=60)
+    assert export_upper_bound(past) == past.replace(tzinfo=timezone.utc)
+
+
+def test_watermark_round_trip(tmp_path) -> None:
+    """Test a written watermark is read back by the next export."""
+    watermark = datetime(2025, 1, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+    assert read_watermark(tmp_path) is None
+    write_watermark(tmp_path, watermark)
+    assert read_watermark(tmp_path) == watermark
+
+
+def test_rows_to_record_batch() -> None:
+    """Test rows are converted to typed Arrow columns."""
+    pytest.importorskip("pyarrow")
+    updated_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    batch = rows_to_record_batch([make_row(1, updated_at), make_row(2, updated_at)], arrow_schema())
+
+    assert batch.num_rows == 2
+    assert batch.column("session_id").to_pylist() == [1, 2]
+    assert batch.column("body_fat_percentage").null_count == 2
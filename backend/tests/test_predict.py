@@ -6,6 +6,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from backend.app.core.config import settings
 from backend.app.core.database import Base, get_db
 from backend.app.main import app
 
@@ -87,3 +88,47 @@ def test_get_nonexistent_job(client: TestClient) -> None:
     response = client.get("/api/predict/nonexistent-job-id")
     assert response.status_code == 404
     assert "not found" in response.json()["detail"].lower()
+
+
+def test_create_prediction_rejects_non_positive_deadline(client: TestClient) -> None:
+    """Test prediction creation rejects a non-positive deadline."""
+    response = client.post(
+        "/api/predict/",
+        json={
+            "front_image_url": "https://example.com/front.jpg",
+            "side_image_url": "https://example.com/side.jpg",
+            "back_image_url": "https://example.com/back.jpg",
+            "user_metadata": {
+                "email": "test@example.com",
+                "height_cm": 180,
+                "weight_kg": 75,
+                "age": 30,
+                "gender": "male",
+            },
+            "deadline_seconds": 0,
+        },
+    )
+    assert response.status_code == 422
+
+
+def test_create_prediction_batch_validates_size(client: TestClient) -> None:
+    """Test batch submission rejects empty and oversized batches."""
+    response = client.post("/api/predict/batch", json={"items": []})
+    assert response.status_code == 422
+
+    item = {
+        "front_image_url": "https://example.com/front.jpg",
+        "side_image_url": "https://example.com/side.jpg",
+        "back_image_url": "https://example.com/back.jpg",
+        "user_metadata": {
+            "email": "test@example.com",
+            "height_cm": 180,
+            "weight_kg": 75,
+            "age": 30,
+            "gender": "male",
+        },
+    }
+    response = client.post(
+        "/api/predict/batch", json={"items": [item] * (settings.BATCH_MAX_ITEMS + 1)}
+    )
+    assert response.status_code == 422
@@ -0,0 +1,73 @@
+"""Test request profiling guards."""
+
+import asyncio
+
+import pytest
+
+from backend.app.core import profiling
+from backend.app.core.profiling import (
+    ProfilingMiddleware,
+    _operation_name,
+    create_profile_token,
+    profile_filename,
+    verify_profile_token,
+)
+
+
+def test_profile_tokens_are_signed_and_expire() -> None:
+    """Test only unexpired tokens signed with SECRET_KEY are accepted."""
+    token = create_profile_token(60)
+    expires, _, signature = token.partition(".")
+
+    assert verify_profile_token(token)
+    assert not verify_profile_token(create_profile_token(-1))
+    assert not verify_profile_token(f"{int(expires) + 3600}.{signature}")
+    assert not verify_profile_token("not-a-token")
+
+
+def test_graphql_profiles_are_named_after_the_operation() -> None:
+    """Test profile file names carry the GraphQL operation name."""
+    operation = _operation_name(b'{"query": "query userStats { x }", "operationName": "userStats"}')
+    filename = profile_filename("POST", "/graphql", operation)
+
+    assert filename.endswith(".speedscope.json")
+    assert "-POST-graphql-userStats-" in filename
+    assert _operation_name(b"not json") is None
+
+
+def test_profiling_refuses_the_default_secret_key(monkeypatch) -> None:
+    """Test profiling cannot start while anyone could sign profile tokens."""
+    default = type(profiling.settings).model_fields["SECRET_KEY"].default
+    monkeypatch.setattr(profiling.settings, "SECRET_KEY", default)
+
+    with pytest.raises(RuntimeError, match="SECRET_KEY"):
+        ProfilingMiddleware(lambda scope, receive, send: None)
+
+
+def test_only_graphql_bodies_are_buffered(tmp_path, monkeypatch) -> None:
+    """Test uploads stream through the profiler without being copied."""
+    pytest.importorskip("pyinstrument")
+    monkeypatch.setattr(profiling.settings, "SECRET_KEY", "test-secret")
+    monkeypatch.setattr(profiling.settings, "PROFILING_DIR", str(tmp_path))
+    monkeypatch.setattr(profiling.settings, "PROFILING_SAMPLE_RATE", 1.0)
+    received = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"{}", "more_body": False}
+
+    async def send(message) -> None:
+        pass
+
+    async def app(scope, receive_body, send) -> None:
+        received.append(receive_body)
+        await receive_body()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+
+    middleware = ProfilingMiddleware(app)
+    for path in ("/api/predict/upload", "/graphql"):
+        scope = {"type": "http", "method": "POST", "path": path, "headers": []}
+        asyncio.run(middleware(scope, receive, send))
+
+    assert received[0] is receive
+    assert received[1] is not receive
+    assert len(list(tmp_path.iterdir())) == 2
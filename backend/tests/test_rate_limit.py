@@ -0,0 +1,68 @@
+"""Test rate limit configuration and headers."""
+
+import pytest
+from pydantic import ValidationError
+from starlette.requests import Request
+
+from backend.app.core.config import Settings
+from backend.app.services import rate_limit
+from backend.app.services.rate_limit import (
+    RateLimitResult,
+    client_identity,
+    parse_rate,
+    rate_limit_key,
+)
+
+
+def test_parse_rate() -> None:
+    """Test rates are parsed into a request count and a period."""
+    assert parse_rate("30/minute") == (30, 60)
+    assert parse_rate("5/ second") == (5, 1)
+
+    with pytest.raises(ValueError):
+        parse_rate("30 per minute")
+    with pytest.raises(ValueError):
+        parse_rate("30/fortnight")
+    with pytest.raises(ValueError):
+        parse_rate("0/minute")
+
+
+def test_tier_multipliers_must_be_positive() -> None:
+    """Test a tier without requests is rejected with the settings."""
+    with pytest.raises(ValidationError):
+        Settings(RATE_LIMIT_TIERS={"free": 1.0, "banned": 0})
+
+
+def test_rate_limit_keys_are_per_endpoint_and_client() -> None:
+    """Test each client has its own bucket per endpoint."""
+    key = rate_limit_key("predict", "a@example.com")
+
+    assert key != rate_limit_key("predict", "b@example.com")
+    assert key != rate_limit_key("graphql", "a@example.com")
+
+
+def test_retry_after_only_sent_when_limited() -> None:
+    """Test rejected requests also tell clients when to retry."""
+    allowed = RateLimitResult(allowed=True, limit=30, remaining=4, reset_seconds=52, retry_after=1)
+    limited = RateLimitResult(allowed=False, limit=30, remaining=0, reset_seconds=60, retry_after=2)
+
+    assert allowed.headers() == {
+        "X-RateLimit-Limit": "30",
+        "X-RateLimit-Remaining": "4",
+        "X-RateLimit-Reset": "52",
+    }
+    assert limited.headers()["Retry-After"] == "2"
+
+
+def test_client_identity_trusts_forwarded_for_only_from_proxies(monkeypatch) -> None:
+    """Test X-Forwarded-For is only used when set by a trusted proxy."""
+    monkeypatch.setattr(rate_limit.settings, "RATE_LIMIT_TRUSTED_PROXIES", ["10.0.0.0/8"])
+
+    def request(host: str, forwarded_for: str) -> Request:
+        headers = [(b"x-forwarded-for", forwarded_for.encode())]
+        return Request({"type": "http", "client": (host, 4321), "headers": headers})
+
+    # Spoofed hops before the address seen by the last trusted proxy are ignored
+    assert client_identity(request("10.0.0.2", "1.2.3.4, 203.0.113.7, 10.0.0.1")) == "203.0.113.7"
+    assert client_identity(request("198.51.100.9", "203.0.113.7")) == "198.51.100.9"
+    assert client_identity(None) == "unknown"
@@ -0,0 +1,27 @@
+"""Test readiness reports."""
+
+from backend.app.core.config import settings
+from backend.app.services.readiness import ProbeResult, ReadinessReport
+
+
+def _report(database: ProbeResult, redis: ProbeResult) -> ReadinessReport:
+    return ReadinessReport(database, redis, queue={"depth": 5000, "delayed": 3}, pools={})
+
+
+def test_ready_when_probes_are_fast() -> None:
+    """Test a deep queue alone does not make the API unready."""
+    report = _report(ProbeResult(1.0), ProbeResult(0.5))
+
+    assert report.ready
+    assert report.to_dict()["status"] == "ready"
+    assert report.to_dict()["queue"] == {"depth": 5000, "delayed": 3}
+
+
+def test_unready_when_a_dependency_is_slow_or_down() -> None:
+    """Test slow and failed probes make the API unready."""
+    slow_db = ProbeResult(settings.READY_MAX_DB_LATENCY_MS + 1)
+    redis_down = ProbeResult(None, error="ConnectionError")
+
+    assert not _report(slow_db, ProbeResult(0.5)).ready
+    assert not _report(ProbeResult(1.0), redis_down).ready
+    assert _report(ProbeResult(1.0), redis_down).to_dict()["status"] == "unavailable"
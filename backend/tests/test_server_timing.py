@@ -0,0 +1,45 @@
+"""Test Server-Timing request accounting."""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.app.core.server_timing import (
+    RequestMetrics,
+    ServerTimingMiddleware,
+    TimedJSONResponse,
+    current_metrics,
+    redis_call,
+)
+
+
+def test_server_timing_header_format() -> None:
+    """Test the metrics are formatted as Server-Timing entries."""
+    metrics = RequestMetrics()
+    metrics.db_queries = 3
+    metrics.db_seconds = 0.0125
+
+    header = metrics.server_timing(0.05)
+
+    assert 'db;desc="3 queries";dur=12.5' in header
+    assert header.endswith("total;dur=50.0")
+
+
+def test_middleware_accounts_work_to_the_request() -> None:
+    """Test work done by a handler ends up in its response headers."""
+    app = FastAPI(default_response_class=TimedJSONResponse)
+    app.add_middleware(ServerTimingMiddleware)
+
+    @app.get("/work")
+    async def work() -> dict[str, int]:
+        with redis_call():
+            pass
+        with redis_call():
+            pass
+        return {"ok": 1}
+
+    response = TestClient(app).get("/work")
+
+    assert response.status_code == 200
+    assert 'redis;desc="2 calls"' in response.headers["Server-Timing"]
+    assert "serialize;dur=" in response.headers["Server-Timing"]
+    assert current_metrics() is None
@@ -0,0 +1,31 @@
+"""Tests for measured startup phases."""
+
+import pytest
+
+from backend.app.core.startup import StartupReport
+
+
+def test_startup_report_records_phases() -> None:
+    """Test each phase is recorded in order, including ones that fail."""
+    report = StartupReport()
+    with report.phase("database"):
+        pass
+    with pytest.raises(RuntimeError), report.phase("models"):
+        raise RuntimeError("boom")
+
+    assert [name for name, _ in report.phases] == ["database", "models"]
+    assert report.total_seconds == sum(seconds for _, seconds in report.phases)
+
+
+def test_broker_is_created_on_first_use(monkeypatch) -> None:
+    """Test importing the broker module does not connect to Redis."""
+    from backend.app.core import broker
+
+    created = []
+    monkeypatch.setattr(broker, "_broker", None)
+    monkeypatch.setattr(broker, "_create_broker", lambda: created.append(1) or object())
+
+    assert created == []
+    first = broker.get_broker()
+    assert broker.get_broker() is first
+    assert created == [1]
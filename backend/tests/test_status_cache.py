@@ -0,0 +1,68 @@
+"""Test job status cache validators."""
+
+import asyncio
+
+import pytest
+
+from backend.app.services import status_cache
+from backend.app.services.status_cache import (
+    cache_job_status,
+    cache_job_status_sync,
+    etag_matches,
+    get_cached_job_status,
+    status_cache_control,
+    status_etag,
+)
+
+
+def make_status(status: str, updated_at: str = "2025-01-01T00:00:00+00:00") -> dict:
+    """Build a minimal status payload."""
+    return {"job_id": "job-1", "status": status, "updated_at": updated_at}
+
+
+def test_status_etag_changes_with_transitions() -> None:
+    """Test the ETag changes with the status and the transition time."""
+    queued = status_etag(make_status("queued"))
+
+    assert queued == status_etag(make_status("queued"))
+    assert queued != status_etag(make_status("processing"))
+    assert queued != status_etag(make_status("queued", "2025-01-01T00:01:00+00:00"))
+    assert queued.startswith('"') and queued.endswith('"')
+
+
+def test_etag_matches() -> None:
+    """Test If-None-Match parsing."""
+    etag = status_etag(make_status("completed"))
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_only_finished_statuses_are_cacheable() -> None:
+    """Test running jobs must be revalidated while finished ones are immutable."""
+    assert status_cache_control(make_status("processing")) == "no-cache"
+    assert "immutable" in status_cache_control(make_status("completed"))
+    assert "immutable" in status_cache_control(make_status("failed"))
+    assert status_cache_control(make_status("completed")).startswith("private")
+
+
+def test_finished_status_is_never_overwritten(monkeypatch) -> None:
+    """Test a late worker write cannot replace a cancellation."""
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(status_cache, "get_sync_redis", lambda: fakeredis.FakeRedis(server=server))
+    monkeypatch.setattr(status_cache, "get_redis", lambda: fakeredis.FakeAsyncRedis(server=server))
+
+    async def transitions() -> dict | None:
+        await cache_job_status(make_status("queued"), only_if_missing=True)
+        await cache_job_status(make_status("processing"), only_if_missing=True)
+        assert (await get_cached_job_status("job-1"))["status"] == "queued"
+
+        await cache_job_status(make_status("cancelled"))
+        cache_job_status_sync(make_status("processing"))
+        return await get_cached_job_status("job-1")
+
+    assert asyncio.run(transitions())["status"] == "cancelled"
@@ -0,0 +1,228 @@
+"""Test streaming multipart uploads."""
+
+import asyncio
+import importlib
+from collections import Counter
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.app.services import uploads
+from backend.app.services.uploads import UploadError, receive_upload
+
+# The storage module as imported by the upload parser
+storage_module = importlib.import_module(uploads.ObjectStorage.__module__)
+
+FIELDS = ("front_image", "side_image", "back_image")
+
+
+def _local_storage(root: Path, monkeypatch) -> tuple[object, Counter]:
+    """Local storage counting references in memory instead of the database."""
+    storage = storage_module.LocalStorage(root)
+    refs: Counter = Counter()
+
+    async def acquire(key: str, size: int, content_type: str) -> None:
+        refs[key] += 1
+
+    async def release(keys) -> list[str]:
+        refs.subtract(keys)
+        return []
+
+    monkeypatch.setattr(storage, "acquire", acquire)
+    monkeypatch.setattr(storage, "release", release)
+    return storage, refs
+
+
+def _database_storage(root: Path, monkeypatch) -> tuple[object, object]:
+    """Local storage counting references in a SQLite database."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{root / 'objects.db'}")
+    monkeypatch.setattr(
+        storage_module, "AsyncSessionLocal", async_sessionmaker(engine, expire_on_commit=False)
+    )
+    table = storage_module.StoredObjectRecord.__table__
+
+    async def create_table() -> None:
+        async with engine.begin() as conn:
+            await conn.run_sync(table.create)
+
+    asyncio.run(create_table())
+    return storage_module.LocalStorage(root), engine
+
+
+class FakeRequest:
+    """Request streaming a multipart body in small chunks."""
+
+    def __init__(self, parts: list[tuple[str, bytes, str | None]]) -> None:
+        self.headers = {"content-type": "multipart/form-data; boundary=test-boundary"}
+        body = b""
+        for name, value, content_type in parts:
+            body += b"--test-boundary\r\n"
+            if content_type:
+                body += (
+                    f'Content-Disposition: form-data; name="{name}"; filename="{name}.jpg"\r\n'
+                    f"Content-Type: {content_type}\r\n\r\n"
+                ).encode()
+            else:
+                body += f'Content-Disposition: form-data; name="{name}"\r\n\r\n'.encode()
+            body += value + b"\r\n"
+        self.body = body + b"--test-boundary--\r\n"
+
+    async def stream(self):
+        for start in range(0, len(self.body), 7):
+            yield self.body[start : start + 7]
+
+
+def _images(front: bytes = b"front") -> list[tuple[str, bytes, str | None]]:
+    return [
+        ("email", b"user@example.com", None),
+        ("front_image", front, "image/jpeg"),
+        ("side_image", b"side", "image/png"),
+        ("back_image", b"front", "image/jpeg"),
+    ]
+
+
+def test_upload_stores_images_by_content(tmp_path: Path, monkeypatch) -> None:
+    """Test images are stored under their hash, identical ones once."""
+    storage, refs = _local_storage(tmp_path, monkeypatch)
+
+    upload = asyncio.run(receive_upload(FakeRequest(_images()), storage, FIELDS))
+
+    assert upload.fields == {"email": "user@example.com"}
+    assert upload.files["front_image"].key == upload.files["back_image"].key
+    assert not upload.files["back_image"].created
+    assert refs[upload.files["front_image"].key] == 2
+    with storage.open(upload.files["side_image"].key) as data:
+        assert bytes(data) == b"side"
+    assert len([path for path in storage.objects_dir.rglob("*") if path.is_file()]) == 2
+
+
+def test_oversized_upload_leaves_nothing_behind(tmp_path: Path, monkeypatch) -> None:
+    """Test a rejected upload releases what it already stored."""
+    monkeypatch.setattr(uploads.settings, "UPLOAD_MAX_IMAGE_BYTES", 10)
+    storage, refs = _local_storage(tmp_path, monkeypatch)
+    parts = _images()
+    parts[2] = ("side_image", b"x" * 11, "image/png")
+
+    with pytest.raises(UploadError) as exc_info:
+        asyncio.run(receive_upload(FakeRequest(parts), storage, FIELDS))
+
+    assert exc_info.value.status_code == 413
+    assert all(count == 0 for count in refs.values())
+    assert list(storage.tmp_dir.iterdir()) == []
+
+
+def test_truncated_upload_is_rejected(tmp_path: Path, monkeypatch) -> None:
+    """Test a body cut off inside a file part is not accepted."""
+    monkeypatch.setattr(uploads.settings, "UPLOAD_CHUNK_SIZE", 4)
+    storage, refs = _local_storage(tmp_path, monkeypatch)
+    request = FakeRequest(_images(front=b"x" * 64))
+    request.body = request.body[: request.body.index(b"x" * 64) + 32]
+
+    with pytest.raises(UploadError) as exc_info:
+        asyncio.run(receive_upload(request, storage, FIELDS))
+
+    assert exc_info.value.status_code == 400
+    assert all(count == 0 for count in refs.values())
+    assert list(storage.tmp_dir.iterdir()) == []
+
+
+def test_non_utf8_field_is_rejected(tmp_path: Path, monkeypatch) -> None:
+    """Test undecodable form fields are a client error."""
+    storage, refs = _local_storage(tmp_path, monkeypatch)
+    parts = _images()
+    parts.append(("age", b"\xff", None))
+
+    with pytest.raises(UploadError) as exc_info:
+        asyncio.run(receive_upload(FakeRequest(parts), storage, FIELDS))
+
+    assert exc_info.value.status_code == 422
+    assert all(count == 0 for count in refs.values())
+
+
+def test_released_objects_are_deleted_and_stored_again(tmp_path: Path, monkeypatch) -> None:
+    """Test the reference counts in the database drive object deletion."""
+    storage, engine = _database_storage(tmp_path, monkeypatch)
+    record = storage_module.StoredObjectRecord
+
+    async def refcounts() -> dict[str, int]:
+        async with storage_module.AsyncSessionLocal() as db:
+            result = await db.execute(select(record.key, record.refcount))
+            return dict(result.tuples().all())
+
+    async def scenario() -> None:
+        upload = await receive_upload(FakeRequest(_images()), storage, FIELDS)
+        front = upload.files["front_image"].key
+        side = upload.files["side_image"].key
+        assert await refcounts() == {front: 2, side: 1}
+
+        response = storage.response(side, "image/png")
+        assert response.path == storage.path(side)
+        assert response.media_type == "image/png"
+
+        assert await storage.release([front, side]) == [side]
+        assert await refcounts() == {front: 1}
+        assert not storage.path(side).exists()
+        with storage.open(front) as data:
+            assert bytes(data) == b"front"
+
+        assert await storage.release([front]) == [front]
+        assert await refcounts() == {}
+        assert not storage.path(front).exists()
+
+        again = await receive_upload(FakeRequest(_images()), storage, FIELDS)
+        assert again.files["front_image"].created
+        assert await refcounts() == {front: 2, side: 1}
+        with storage.open(front) as data:
+            assert bytes(data) == b"front"
+        await again.discard()
+        assert await refcounts() == {}
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_stored_objects_are_fetched_from_the_api(tmp_path: Path, monkeypatch) -> None:
+    """Test storage references are turned into object endpoint paths."""
+    storage = storage_module.LocalStorage(tmp_path)
+    monkeypatch.setattr(storage_module, "get_storage", lambda: storage)
+    key = "ab" * 32
+
+    assert storage_module.fetchable_url(storage.url(key)) == f"/api/objects/{key}"
+    assert storage_module.fetchable_url("https://cdn.example.com/a.jpg") == (
+        "https://cdn.example.com/a.jpg"
+    )
+
+
+def test_failed_deletion_leaves_an_unreferenced_row(tmp_path: Path, monkeypatch) -> None:
+    """Test a failure while deleting never leaves a reference to a missing object."""
+    storage, engine = _database_storage(tmp_path, monkeypatch)
+    record = storage_module.StoredObjectRecord
+
+    def fail(key: str) -> None:
+        raise OSError("disk gone")
+
+    async def refcounts() -> dict[str, int]:
+        async with storage_module.AsyncSessionLocal() as db:
+            result = await db.execute(select(record.key, record.refcount))
+            return dict(result.tuples().all())
+
+    async def scenario() -> None:
+        upload = await receive_upload(FakeRequest(_images()), storage, FIELDS)
+        side = upload.files["side_image"].key
+
+        storage.delete_object = fail
+        with pytest.raises(OSError):
+            await storage.release([side])
+        assert (await refcounts())[side] == 0
+        del storage.delete_object
+
+        await storage.acquire(side, 4, "image/png")
+        assert (await refcounts())[side] == 1
+        assert await storage.release([side]) == [side]
+        assert side not in await refcounts()
+        assert not storage.path(side).exists()
+        await engine.dispose()
+
+    asyncio.run(scenario())
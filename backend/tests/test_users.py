@@ -0,0 +1,37 @@
+"""Test the user ID cache."""
+
+import time
+
+from backend.app.services.users import UserIdCache
+
+
+def test_user_id_cache_evicts_least_recently_used() -> None:
+    """Test the oldest unused entry is evicted once the cache is full."""
+    cache = UserIdCache(max_size=2, ttl_seconds=60)
+    cache.set("a@example.com", 1)
+    cache.set("b@example.com", 2)
+    assert cache.get("a@example.com") == 1
+
+    cache.set("c@example.com", 3)
+
+    assert cache.get("a@example.com") == 1
+    assert cache.get("b@example.com") is None
+    assert cache.get("c@example.com") == 3
+
+
+def test_user_id_cache_expires_entries() -> None:
+    """Test entries older than the TTL are ignored."""
+    cache = UserIdCache(max_size=10, ttl_seconds=0.01)
+    cache.set("a@example.com", 1)
+    time.sleep(0.02)
+
+    assert cache.get("a@example.com") is None
+
+
+def test_user_id_cache_discard() -> None:
+    """Test discarding an entry forgets it."""
+    cache = UserIdCache(max_size=10, ttl_seconds=60)
+    cache.set("a@example.com", 1)
+    cache.discard("a@example.com")
+
+    assert cache.get("a@example.com") is None
@@ -0,0 +1,232 @@
+"""Dramatiq middleware for body analysis workers."""
+
+import asyncio
+import os
+import resource
+import signal
+import sys
+import threading
+import tracemalloc
+from datetime import datetime, timezone
+
+from dramatiq import Broker, Message, Middleware, Worker
+from dramatiq.common import current_millis
+from dramatiq.middleware import SkipMessage
+from loguru import logger
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models import AnalysisSession, AnalysisStatus
+from app.services.job_control import is_cancelled
+from app.services.job_events import publish_job_event, session_event
+from app.services.job_queue import BODY_ANALYSIS_TASK
+from app.services.status_cache import cache_job_status_sync, job_status
+
+
+async def _finalize_unstarted_session(session_id: int, status: AnalysisStatus, reason: str) -> None:
+    """Move a session that never started to a terminal status."""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            update(AnalysisSession)
+            .where(
+                AnalysisSession.id == session_id,
+                AnalysisSession.status == AnalysisStatus.QUEUED,
+            )
+            .values(
+                status=status,
+                error_message=reason,
+                completed_at=datetime.now(timezone.utc),
+            )
+            .returning(AnalysisSession)
+        )
+        session = result.scalar_one_or_none()
+        await db.commit()
+
+    if session is not None:
+        cache_job_status_sync(job_status(session))
+        publish_job_event(session_event(session))
+
+
+class JobDeadlineMiddleware(Middleware):
+    """
+    Drop body analysis messages whose deadline has passed.
+
+    The deadline is read from the ``deadline`` message option (UNIX
+    milliseconds) set by the API. Expired messages are skipped before the
+    actor fetches anything, and their session is marked ``EXPIRED``.
+    """
+
+    def before_process_message(self, broker: Broker, message: Message) -> None:
+        if message.actor_name != BODY_ANALYSIS_TASK:
+            return
+
+        deadline = message.options.get("deadline")
+        if deadline is None or current_millis() < deadline:
+            return
+
+        session_id = message.args[0]
+        logger.warning(
+            f"Dropping expired job {message.options.get('job_id')} "
+            f"(session_id={session_id}, message_id={message.message_id})"
+        )
+        asyncio.run(
+            _finalize_unstarted_session(
+                session_id,
+                AnalysisStatus.EXPIRED,
+                "Job deadline exceeded before processing started",
+            )
+        )
+        message.fail()
+        raise SkipMessage("Job deadline exceeded")
+
+
+class JobCancellationMiddleware(Middleware):
+    """
+    Skip body analysis messages whose job was cancelled while queued.
+
+    The API sets a Redis flag when a job is cancelled, so queued messages
+    are dropped without loading the session from the database.
+    """
+
+    def before_process_message(self, broker: Broker, message: Message) -> None:
+        if message.actor_name != BODY_ANALYSIS_TASK:
+            return
+
+        job_id = message.options.get("job_id")
+        if job_id is None or not is_cancelled(job_id):
+            return
+
+        logger.info(f"Skipping cancelled job {job_id} (message_id={message.message_id})")
+        raise SkipMessage("Job cancelled")
+
+
+def current_rss_bytes() -> int:
+    """
+    Get the resident set size of the current process.
+
+    Reads ``/proc/self/statm`` where available and falls back to the peak
+    RSS reported by ``getrusage`` on other platforms.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+class MemoryProfilerMiddleware(Middleware):
+    """
+    Track worker memory usage and recycle bloated worker processes.
+
+    When profiling is enabled, RSS is logged after every job and a
+    ``tracemalloc`` snapshot is diffed against the previous one every
+    ``interval_jobs`` jobs, logging the top growing allocation sites.
+
+    When RSS crosses ``max_rss_bytes``, the Dramatiq main process is sent
+    ``SIGHUP``, which makes it gracefully stop and restart its worker
+    processes.
+    """
+
+    def __init__(
+        self,
+        *,
+        profiling: bool = False,
+        interval_jobs: int = 50,
+        top_n: int = 10,
+        max_rss_bytes: int = 0,
+    ) -> None:
+        self.profiling = profiling
+        self.interval_jobs = interval_jobs
+        self.top_n = top_n
+        self.max_rss_bytes = max_rss_bytes
+        self._lock = threading.Lock()
+        self._jobs = 0
+        self._snapshot: tracemalloc.Snapshot | None = None
+        self._recycle_requested = False
+
+    def before_worker_boot(self, broker: Broker, worker: Worker) -> None:
+        if self.profiling and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._snapshot = self._take_snapshot()
+
+    def after_process_message(
+        self,
+        broker: Broker,
+        message: Message,
+        *,
+        result: object = None,
+        exception: BaseException | None = None,
+    ) -> None:
+        self._after_job(message)
+
+    def after_skip_message(self, broker: Broker, message: Message) -> None:
+        self._after_job(message)
+
+    def _after_job(self, message: Message) -> None:
+        rss = current_rss_bytes()
+        with self._lock:
+            self._jobs += 1
+            jobs = self._jobs
+
+        if self.profiling:
+            logger.info(
+                f"Worker pid={os.getpid()} rss={rss / 1024**2:.1f}MB after job "
+                f"{message.options.get('job_id', message.message_id)} (jobs={jobs})"
+            )
+            if jobs % self.interval_jobs == 0:
+                self._log_allocation_diff(jobs)
+
+        if self.max_rss_bytes and rss > self.max_rss_bytes:
+            self._request_recycle(rss)
+
+    def _take_snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            )
+        )
+
+    def _log_allocation_diff(self, jobs: int) -> None:
+        snapshot = self._take_snapshot()
+        with self._lock:
+            previous, self._snapshot = self._snapshot, snapshot
+
+        if previous is None:
+            return
+
+        logger.info(
+            f"Top {self.top_n} allocation sites growing over the last {self.interval_jobs} jobs:"
+        )
+        for stat in snapshot.compare_to(previous, "lineno")[: self.top_n]:
+            logger.info(f"  {stat}")
+
+    def _request_recycle(self, rss: int) -> None:
+        with self._lock:
+            if self._recycle_requested:
+                return
+            self._recycle_requested = True
+
+        logger.warning(
+            f"Worker pid={os.getpid()} rss={rss / 1024**2:.1f}MB exceeds ceiling of "
+            f"{self.max_rss_bytes / 1024**2:.0f}MB, requesting worker restart"
+        )
+        os.kill(os.getppid(), signal.SIGHUP)
+
+
+def memory_profiler_from_settings() -> MemoryProfilerMiddleware | None:
+    """Build the memory profiler middleware if enabled in settings."""
+    if not settings.WORKER_MEMORY_PROFILING and not settings.WORKER_MAX_RSS_MB:
+        return None
+
+    return MemoryProfilerMiddleware(
+        profiling=settings.WORKER_MEMORY_PROFILING,
+        interval_jobs=settings.WORKER_TRACEMALLOC_INTERVAL_JOBS,
+        top_n=settings.WORKER_TRACEMALLOC_TOP_N,
+        max_rss_bytes=settings.WORKER_MAX_RSS_MB * 1024**2,
+    )
@@ -15,8 +15,34 @@ from sqlalchemy import select
 backend_dir = Path(__file__).resolve().parent.parent.parent.parent / "backend"
 sys.path.insert(0, str(backend_dir))
 
+from app.core.broker import redis_broker
 from app.core.database import AsyncSessionLocal
 from app.models import AnalysisSession, AnalysisStatus, Measurement
+from app.services.admission import record_processed_job
+from app.services.job_control import JobCancelledError, raise_if_cancelled
+from app.services.job_events import publish_job_event, session_event
+from app.services.leases import (
+    LeaseHeartbeat,
+    LeaseLostError,
+    claim_lease,
+    finish_leased_job,
+    lease_owner_id,
+)
+from app.services.status_cache import cache_job_status_sync, job_status
+from inference.app.middleware import (
+    JobCancellationMiddleware,
+    JobDeadlineMiddleware,
+    memory_profiler_from_settings,
+)
+
+# Drop expired and cancelled jobs before the actor runs
+redis_broker.add_middleware(JobDeadlineMiddleware())
+redis_broker.add_middleware(JobCancellationMiddleware())
+
+# Optional memory profiling and RSS-based worker recycling
+memory_profiler = memory_profiler_from_settings()
+if memory_profiler:
+    redis_broker.add_middleware(memory_profiler)
 
 
 def calculate_mock_body_composition(
@@ -75,8 +101,8 @@ def calculate_mock_body_composition(
     }
 
 
-@dramatiq.actor(store_results=True, max_retries=3)
-def process_body_analysis(session_id: int) -> dict[str, str]:
+@dramatiq.actor(max_retries=3)
+def process_body_analysis(session_id: int) -> str:
     """
     Process body composition analysis for a given session.
 
@@ -92,38 +118,44 @@ def process_body_analysis(session_id: int) -> dict[str, str]:
         session_id: ID of the analysis session to process
 
     Returns:
-        Dictionary with status and message
+        Compact status code; the full result is stored in the database and
+        the code is only kept in Redis when RESULT_STORAGE is "status"
     """
     logger.info(f"Starting body analysis for session_id={session_id}")
 
-    # Simulate processing time (in production this would be ML inference)
     processing_start = time.time()
-    time.sleep(random.uniform(2, 5))  # Simulate 2-5 seconds of processing
 
     # Run async database operations in sync context
     result = asyncio.run(_process_analysis_async(session_id, processing_start))
+    # Feeds the throughput estimate used by admission control
+    record_processed_job()
+    logger.info(f"Body analysis for session_id={session_id} finished: {result['message']}")
 
-    return result
+    return result["status"]
 
 
 async def _process_analysis_async(session_id: int, processing_start: float) -> dict[str, str]:
     """Async helper to process analysis and save to database."""
+    session = None
     async with AsyncSessionLocal() as db:
         try:
-            # Fetch the analysis session
-            result = await db.execute(
-                select(AnalysisSession).where(AnalysisSession.id == session_id)
-            )
-            session = result.scalar_one_or_none()
+            # Claim the session: move it to processing under a renewable lease
+            owner = lease_owner_id()
+            session = await claim_lease(db, session_id, owner)
 
             if not session:
-                logger.error(f"Session {session_id} not found")
-                return {"status": "error", "message": "Session not found"}
+                result = await db.execute(
+                    select(AnalysisSession.status).where(AnalysisSession.id == session_id)
+                )
+                current_status = result.scalar_one_or_none()
+                if current_status is None:
+                    logger.error(f"Session {session_id} not found")
+                    return {"status": "error", "message": "Session not found"}
+
+                logger.warning(f"Skipping session {session_id}: status is {current_status.value}")
+                return {"status": "skipped", "message": f"Session is {current_status.value}"}
 
-            # Update session status to processing
-            session.status = AnalysisStatus.PROCESSING
-            session.started_at = datetime.now(timezone.utc)
-            await db.commit()
+            _announce(session)
 
             logger.info(
                 f"Processing session {session_id}: "
@@ -131,40 +163,57 @@ async def _process_analysis_async(session_id: int, processing_start: float) -> d
                 f"age={session.age}, gender={session.gender}"
             )
 
-            # Calculate mock body composition
-            metrics = calculate_mock_body_composition(
-                height_cm=session.height_cm,
-                weight_kg=session.weight_kg,
-                age=session.age,
-                gender=session.gender.value,
-            )
+            async with LeaseHeartbeat(session_id, owner) as lease:
+                # Simulate processing time (in production this would be ML inference)
+                _checkpoint(session, lease)
+                await asyncio.sleep(random.uniform(2, 5))  # Simulate 2-5 seconds of processing
+
+                # Calculate mock body composition
+                _checkpoint(session, lease)
+                metrics = calculate_mock_body_composition(
+                    height_cm=session.height_cm,
+                    weight_kg=session.weight_kg,
+                    age=session.age,
+                    gender=session.gender.value,
+                )
+
+                logger.info(f"Calculated metrics for session {session_id}: {metrics}")
+                _checkpoint(session, lease)
+
+                # Complete the session and release the lease, unless the
+                # job was re-queued, finalized or cancelled meanwhile
+                processing_time = time.time() - processing_start
+                completed = await finish_leased_job(
+                    db,
+                    session_id,
+                    owner,
+                    status=AnalysisStatus.COMPLETED,
+                    completed_at=datetime.now(timezone.utc),
+                    processing_time_seconds=processing_time,
+                    model_used="mock_v1",  # In production: smplx, star, ghum
+                )
+                if completed is None:
+                    raise LeaseLostError(f"Lease lost for session {session_id}")
+                session = completed
+
+                # Create measurement record
+                measurement = Measurement(
+                    session_id=session_id,
+                    body_fat_percentage=metrics["body_fat_percentage"],
+                    body_volume_liters=metrics["body_volume_liters"],
+                    body_density_kg_per_liter=metrics["body_density_kg_per_liter"],
+                    lean_mass_kg=metrics["lean_mass_kg"],
+                    fat_mass_kg=metrics["fat_mass_kg"],
+                    confidence_score=metrics["confidence_score"],
+                    # In production, this would be the URL to the generated mesh file
+                    mesh_url=None,
+                    mesh_vertices_count=None,
+                    mesh_faces_count=None,
+                )
+                db.add(measurement)
 
-            logger.info(f"Calculated metrics for session {session_id}: {metrics}")
-
-            # Create measurement record
-            measurement = Measurement(
-                session_id=session_id,
-                body_fat_percentage=metrics["body_fat_percentage"],
-                body_volume_liters=metrics["body_volume_liters"],
-                body_density_kg_per_liter=metrics["body_density_kg_per_liter"],
-                lean_mass_kg=metrics["lean_mass_kg"],
-                fat_mass_kg=metrics["fat_mass_kg"],
-                confidence_score=metrics["confidence_score"],
-                # In production, this would be the URL to the generated mesh file
-                mesh_url=None,
-                mesh_vertices_count=None,
-                mesh_faces_count=None,
-            )
-            db.add(measurement)
-
-            # Update session with completion info
-            processing_time = time.time() - processing_start
-            session.status = AnalysisStatus.COMPLETED
-            session.completed_at = datetime.now(timezone.utc)
-            session.processing_time_seconds = processing_time
-            session.model_used = "mock_v1"  # In production: smplx, star, ghum
-
-            await db.commit()
+                await db.commit()
+                _announce(session, measurement)
 
             logger.info(
                 f"Successfully completed analysis for session {session_id} "
@@ -177,14 +226,50 @@ async def _process_analysis_async(session_id: int, processing_start: float) -> d
                 "session_id": str(session_id),
             }
 
+        except JobCancelledError:
+            # The API already marked the session as cancelled
+            logger.info(f"Aborted cancelled analysis for session {session_id}")
+            await db.rollback()
+            return {"status": "cancelled", "message": "Job cancelled"}
+
+        except LeaseLostError:
+            # The reaper re-queued or finalized the session; leave it alone
+            logger.warning(f"Aborted analysis for session {session_id} after losing its lease")
+            await db.rollback()
+            return {"status": "lease_lost", "message": "Lease lost"}
+
         except Exception as e:
             logger.error(f"Error processing session {session_id}: {e}")
 
-            # Update session with error status
+            # Update session with error status, unless another owner or
+            # the API already moved it on
             if session:
-                session.status = AnalysisStatus.FAILED
-                session.error_message = str(e)
-                session.completed_at = datetime.now(timezone.utc)
+                await db.rollback()
+                failed = await finish_leased_job(
+                    db,
+                    session_id,
+                    owner,
+                    status=AnalysisStatus.FAILED,
+                    error_message=str(e),
+                    completed_at=datetime.now(timezone.utc),
+                )
+                if failed is None:
+                    await db.rollback()
+                    logger.warning(f"Not failing session {session_id}: its lease was lost")
+                    return {"status": "lease_lost", "message": "Lease lost"}
                 await db.commit()
+                _announce(failed)
 
             return {"status": "error", "message": str(e)}
+
+
+def _announce(session: AnalysisSession, measurement: Measurement | None = None) -> None:
+    """Write a status transition through to the status cache and publish it."""
+    cache_job_status_sync(job_status(session, measurement))
+    publish_job_event(session_event(session))
+
+
+def _checkpoint(session: AnalysisSession, lease: LeaseHeartbeat) -> None:
+    """Stop the pipeline between stages if the job was cancelled or taken over."""
+    raise_if_cancelled(session.job_id)
+    lease.raise_if_lost()
@@ -0,0 +1,160 @@
+"""Test body analysis worker middleware."""
+
+import asyncio
+import importlib
+import os
+import signal
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from dramatiq.broker import MessageProxy
+from dramatiq.middleware import SkipMessage
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from backend.app.services.job_queue import build_analysis_message
+from inference.app import middleware
+from inference.app.middleware import (
+    JobCancellationMiddleware,
+    JobDeadlineMiddleware,
+    MemoryProfilerMiddleware,
+    current_rss_bytes,
+    memory_profiler_from_settings,
+)
+
+# The models as imported by the middleware
+models = importlib.import_module(middleware.AnalysisSession.__module__)
+
+
+def _database(root: Path, monkeypatch) -> async_sessionmaker:
+    """SQLite database standing in for the worker's, with the session tables."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{root / 'jobs.db'}", poolclass=NullPool)
+
+    async def create_tables() -> None:
+        async with engine.begin() as conn:
+            await conn.run_sync(models.Base.metadata.create_all)
+
+    asyncio.run(create_tables())
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    monkeypatch.setattr(middleware, "AsyncSessionLocal", sessions)
+    return sessions
+
+
+def _add_session(sessions: async_sessionmaker, status) -> int:
+    """Store an analysis session and return its ID."""
+
+    async def add() -> int:
+        async with sessions() as db:
+            session = models.AnalysisSession(
+                user_id=1,
+                job_id="job-1",
+                status=status,
+                front_image_url="front",
+                side_image_url="side",
+                back_image_url="back",
+                height_cm=180.0,
+                weight_kg=80.0,
+                age=30,
+                gender=models.Gender.MALE,
+            )
+            db.add(session)
+            await db.commit()
+            return session.id
+
+    return asyncio.run(add())
+
+
+def _status(sessions: async_sessionmaker, session_id: int):
+    """Read the status of a session."""
+
+    async def read():
+        async with sessions() as db:
+            return (await db.get(models.AnalysisSession, session_id)).status
+
+    return asyncio.run(read())
+
+
+def test_expired_message_is_dropped_and_session_expired(tmp_path: Path, monkeypatch) -> None:
+    """Test a message past its deadline never runs and expires its session."""
+    sessions = _database(tmp_path, monkeypatch)
+    announced = []
+    monkeypatch.setattr(middleware, "cache_job_status_sync", announced.append)
+    monkeypatch.setattr(middleware, "publish_job_event", announced.append)
+    session_id = _add_session(sessions, models.AnalysisStatus.QUEUED)
+    past = datetime.now(timezone.utc) - timedelta(seconds=1)
+    message = MessageProxy(build_analysis_message(session_id, "job-1", past))
+
+    with pytest.raises(SkipMessage):
+        JobDeadlineMiddleware().before_process_message(None, message)
+
+    assert message.failed
+    assert _status(sessions, session_id) == models.AnalysisStatus.EXPIRED
+    assert [event["status"] for event in announced] == ["expired", "expired"]
+
+
+def test_deadline_only_expires_queued_sessions(tmp_path: Path, monkeypatch) -> None:
+    """Test only queued sessions expire, and messages within their deadline run."""
+    sessions = _database(tmp_path, monkeypatch)
+    monkeypatch.setattr(middleware, "cache_job_status_sync", lambda status: None)
+    monkeypatch.setattr(middleware, "publish_job_event", lambda event: None)
+    session_id = _add_session(sessions, models.AnalysisStatus.PROCESSING)
+    deadline_middleware = JobDeadlineMiddleware()
+
+    future = datetime.now(timezone.utc) + timedelta(minutes=5)
+    deadline_middleware.before_process_message(
+        None, MessageProxy(build_analysis_message(session_id, "job-1", future))
+    )
+    past = datetime.now(timezone.utc) - timedelta(seconds=1)
+    with pytest.raises(SkipMessage):
+        deadline_middleware.before_process_message(
+            None, MessageProxy(build_analysis_message(session_id, "job-1", past))
+        )
+
+    assert _status(sessions, session_id) == models.AnalysisStatus.PROCESSING
+
+
+def test_cancelled_message_is_skipped(monkeypatch) -> None:
+    """Test messages of cancelled jobs are dropped before running."""
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis()
+    job_control = importlib.import_module(middleware.is_cancelled.__module__)
+    monkeypatch.setattr(job_control, "get_sync_redis", lambda: client)
+    deadline = datetime.now(timezone.utc) + timedelta(minutes=5)
+    cancellation = JobCancellationMiddleware()
+
+    cancellation.before_process_message(
+        None, MessageProxy(build_analysis_message(1, "job-1", deadline))
+    )
+    client.set(job_control.cancel_key("job-1"), "1")
+    with pytest.raises(SkipMessage):
+        cancellation.before_process_message(
+            None, MessageProxy(build_analysis_message(1, "job-1", deadline))
+        )
+
+
+def test_worker_recycles_once_over_rss_ceiling(monkeypatch) -> None:
+    """Test crossing the RSS ceiling asks the main process to restart workers once."""
+    signals = []
+    rss = iter([100, 300, 400])
+    monkeypatch.setattr(middleware, "current_rss_bytes", lambda: next(rss))
+    monkeypatch.setattr(middleware.os, "kill", lambda pid, signum: signals.append((pid, signum)))
+    profiler = MemoryProfilerMiddleware(max_rss_bytes=200)
+    message = build_analysis_message(1, "job-1", datetime.now(timezone.utc))
+
+    for _ in range(3):
+        profiler.after_process_message(None, message)
+
+    assert signals == [(os.getppid(), signal.SIGHUP)]
+
+
+def test_memory_profiler_from_settings(monkeypatch) -> None:
+    """Test the middleware is only installed when profiling or a ceiling is set."""
+    monkeypatch.setattr(middleware.settings, "WORKER_MEMORY_PROFILING", False)
+    monkeypatch.setattr(middleware.settings, "WORKER_MAX_RSS_MB", 0)
+    assert memory_profiler_from_settings() is None
+
+    monkeypatch.setattr(middleware.settings, "WORKER_MAX_RSS_MB", 512)
+    profiler = memory_profiler_from_settings()
+    assert profiler.max_rss_bytes == 512 * 1024**2
+    assert current_rss_bytes() > 0
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """End-to-end test script for BodyVision API."""
 
-import time
+import json
 
 import httpx
 
@@ -51,56 +51,60 @@ def test_create_prediction() -> str:
     return job_id
 
 
-def test_get_status(job_id: str, wait_for_completion: bool = False) -> dict:
+def test_get_status(job_id: str) -> dict:
     """Test getting job status."""
     print(f"📊 Checking status for job {job_id}...")
 
-    max_attempts = 15 if wait_for_completion else 1
-    attempt = 0
+    response = httpx.get(f"{BASE_URL}/api/predict/{job_id}", timeout=10.0)
+    assert response.status_code == 200, f"Status check failed: {response.text}"
 
-    while attempt < max_attempts:
-        response = httpx.get(f"{BASE_URL}/api/predict/{job_id}", timeout=10.0)
-        assert response.status_code == 200, f"Status check failed: {response.text}"
+    data = response.json()
+    status = data["status"]
 
-        data = response.json()
-        status = data["status"]
+    print(f"   Status: {status}")
 
-        print(f"   Status: {status}")
+    if status == "completed":
+        print("✅ Job completed!")
+        print(f"   Processing time: {data['processing_time_seconds']:.2f}s")
+        print(f"   Model used: {data['model_used']}")
 
-        if status == "completed":
-            print("✅ Job completed!")
-            print(f"   Processing time: {data['processing_time_seconds']:.2f}s")
-            print(f"   Model used: {data['model_used']}")
+        if data.get("measurements"):
+            meas = data["measurements"]
+            print("\n📊 Measurements:")
+            print(f"   Body Fat: {meas['body_fat_percentage']:.1f}%")
+            print(f"   Volume: {meas['body_volume_liters']:.2f}L")
+            print(f"   Density: {meas['body_density_kg_per_liter']:.3f} kg/L")
+            print(f"   Lean Mass: {meas['lean_mass_kg']:.1f}kg")
+            print(f"   Fat Mass: {meas['fat_mass_kg']:.1f}kg")
+            print(f"   Confidence: {meas['confidence_score']:.1%}")
 
-            if data.get("measurements"):
-                meas = data["measurements"]
-                print("\n📊 Measurements:")
-                print(f"   Body Fat: {meas['body_fat_percentage']:.1f}%")
-                print(f"   Volume: {meas['body_volume_liters']:.2f}L")
-                print(f"   Density: {meas['body_density_kg_per_liter']:.3f} kg/L")
-                print(f"   Lean Mass: {meas['lean_mass_kg']:.1f}kg")
-                print(f"   Fat Mass: {meas['fat_mass_kg']:.1f}kg")
-                print(f"   Confidence: {meas['confidence_score']:.1%}")
+        print()
 
-            print()
-            return data
+    elif status == "failed":
+        print(f"❌ Job failed: {data.get('error_message')}")
+        print()
 
-        elif status == "failed":
-            print(f"❌ Job failed: {data.get('error_message')}")
-            print()
-            return data
+    return data
 
-        elif wait_for_completion:
-            print(f"   ⏳ Waiting... (attempt {attempt + 1}/{max_attempts})")
-            time.sleep(2)
-            attempt += 1
-        else:
-            return data
 
-    if wait_for_completion and status != "completed":
-        print(f"⚠️  Job did not complete within {max_attempts * 2}s")
+def test_stream_status(job_id: str, timeout: float = 30.0) -> str:
+    """Test following job status transitions over Server-Sent Events."""
+    print(f"📡 Streaming status events for job {job_id}...")
 
-    return data
+    status = None
+    with httpx.stream(
+        "GET", f"{BASE_URL}/api/predict/{job_id}/events", timeout=timeout
+    ) as response:
+        assert response.status_code == 200, f"Status stream failed: {response.text}"
+
+        # The server closes the stream once the job reaches a terminal status
+        for line in response.iter_lines():
+            if line.startswith("data: "):
+                status = json.loads(line.removeprefix("data: "))["status"]
+                print(f"   Status: {status}")
+
+    print()
+    return status
 
 
 def main() -> None:
@@ -117,11 +121,12 @@ def main() -> None:
         job_id = test_create_prediction()
 
         # 3. Check status immediately
-        test_get_status(job_id, wait_for_completion=False)
+        test_get_status(job_id)
 
         # 4. Wait for completion
         print("⏳ Waiting for job to complete (this may take 2-5 seconds)...\n")
-        test_get_status(job_id, wait_for_completion=True)
+        test_stream_status(job_id)
+        test_get_status(job_id)
 
         print("=" * 60)
         print("✅ All tests passed!")